@@ -0,0 +1,168 @@
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Optional
+
+# 요청 우선순위 레인
+INTERACTIVE = "interactive"  # 사용자가 화면에서 결과를 기다리는 요청 (편지 교정 / 주제 추천)
+BATCH = "batch"              # 키워드 추출 (동기/비동기 작업/일괄 처리)
+LANES = (INTERACTIVE, BATCH)
+
+INTERACTIVE_ENDPOINTS = {"letter", "ajenda"}
+
+
+def lane_for(endpoint: str) -> str:
+    """LLM 호출 endpoint 이름으로 레인을 정한다. (형식 복구 호출 '<endpoint>_repair'는 원래 레인을 따름)"""
+    return INTERACTIVE if endpoint.removesuffix("_repair") in INTERACTIVE_ENDPOINTS else BATCH
+
+
+class AdmissionRejected(Exception):
+    """허용량 안에서 마감 시간까지 호출할 수 없어 거절함"""
+
+    def __init__(self, message: str, retry_after: float, reason: str):
+        super().__init__(message)
+        self.retry_after = max(1, math.ceil(retry_after))
+        self.reason = reason
+
+
+class TokenBucket:
+    """
+    초당 rate만큼 채워지고 최대 capacity까지 쌓이는 토큰 버킷
+    capacity보다 큰 요청도 버킷이 가득 찼을 때 한 번은 통과시키고, 모자란 만큼은 빚(음수)으로 남긴다.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self.tokens = capacity
+        self._updated = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, floor: float = 0.0) -> float:
+        """amount를 꺼낸 뒤에도 floor개 이상 남을 때까지 기다려야 하는 시간(초)"""
+        self._refill()
+        amount = min(amount, self.capacity - floor)
+        deficit = amount + floor - self.tokens
+        return deficit / self.rate if deficit > 0 else 0.0
+
+    def take(self, amount: float):
+        self._refill()
+        self.tokens -= amount
+
+    def drain(self):
+        """남은 토큰을 비운다. (Gemini가 한도 초과(429)를 알려온 경우 다른 호출도 잠시 멈추도록)"""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0)
+
+
+class _Ticket:
+    __slots__ = ("tokens",)
+
+    def __init__(self, tokens: int):
+        self.tokens = tokens
+
+
+class AdmissionController:
+    """
+    Gemini 호출 허용량 제어
+    - 분당 요청 수(rpm) / 분당 토큰 수(tpm) 토큰 버킷 (0이면 해당 한도 없음)
+    - 레인별 대기열: 대화형(interactive) 요청이 배치(batch) 요청보다 먼저 통과하고,
+      배치 요청은 버킷의 interactive_reserve 비율만큼을 대화형 요청 몫으로 남겨 둔다.
+    - 예상 대기 시간이 호출의 남은 시간(timeout)을 넘거나 대기열이 가득 차면 기다리지 않고 바로 거절한다.
+    clock / sleep을 주입할 수 있어 가짜 시계로 시간을 흘려보내며 동작을 확인할 수 있다.
+    """
+
+    def __init__(self, rpm: float, tpm: float, burst_seconds: float, interactive_reserve: float,
+                 max_queue: int, clock=time.monotonic, sleep=asyncio.sleep, poll_seconds: float = 0.05):
+        self.request_bucket = TokenBucket(rpm / 60, max(1.0, rpm / 60 * burst_seconds), clock) if rpm > 0 else None
+        self.token_bucket = TokenBucket(tpm / 60, max(1.0, tpm / 60 * burst_seconds), clock) if tpm > 0 else None
+        self.interactive_reserve = interactive_reserve
+        self.max_queue = max_queue
+        self.poll_seconds = poll_seconds
+        self._clock = clock
+        self._sleep = sleep
+        self._lanes = {lane: deque() for lane in LANES}
+        self.admitted = {lane: 0 for lane in LANES}
+        self.rejected = {lane: 0 for lane in LANES}
+
+    @property
+    def enabled(self) -> bool:
+        return self.request_bucket is not None or self.token_bucket is not None
+
+    def queued(self, lane: str) -> int:
+        return len(self._lanes[lane])
+
+    def throttle(self):
+        """Gemini가 한도 초과를 알려오면 버킷을 비워 새 호출이 잠시 기다리도록 한다."""
+        for bucket in (self.request_bucket, self.token_bucket):
+            if bucket is not None:
+                bucket.drain()
+
+    def _bucket_wait(self, lane: str, requests: int, tokens: int) -> float:
+        reserve = self.interactive_reserve if lane == BATCH else 0.0
+        wait = 0.0
+        for bucket, amount in ((self.request_bucket, requests), (self.token_bucket, tokens)):
+            if bucket is not None:
+                wait = max(wait, bucket.wait_time(amount, floor=bucket.capacity * reserve))
+        return wait
+
+    def _ahead(self, lane: str, ticket: Optional[_Ticket]):
+        """ticket보다 먼저 통과해야 하는 대기 요청들"""
+        ahead = []
+        if lane == BATCH:
+            ahead.extend(self._lanes[INTERACTIVE])
+        for queued in self._lanes[lane]:
+            if queued is ticket:
+                break
+            ahead.append(queued)
+        return ahead
+
+    def estimate_wait(self, lane: str, tokens: int, ticket: Optional[_Ticket] = None) -> float:
+        """앞선 대기 요청이 모두 통과한 뒤 이 요청이 통과하기까지의 예상 시간(초). 0이면 지금 통과 가능."""
+        ahead = self._ahead(lane, ticket)
+        wait = self._bucket_wait(lane, len(ahead) + 1, sum(t.tokens for t in ahead) + tokens)
+        if ahead:
+            # 앞선 요청이 먼저 통과해야 하므로 바로 통과할 수는 없다.
+            wait = max(wait, self.poll_seconds)
+        return wait
+
+    async def acquire(self, endpoint: str, tokens: int, timeout: float) -> float:
+        """
+        호출 허용을 기다린다. 기다린 시간(초)을 반환하고, timeout 안에 통과할 수 없으면 AdmissionRejected.
+        """
+        lane = lane_for(endpoint)
+        queue = self._lanes[lane]
+        start = self._clock()
+        deadline = start + timeout
+
+        if len(queue) >= self.max_queue:
+            self.rejected[lane] += 1
+            raise AdmissionRejected("Gemini 호출 대기열이 가득 찼습니다.",
+                                    retry_after=self.estimate_wait(lane, tokens), reason="queue_full")
+
+        ticket = _Ticket(tokens)
+        queue.append(ticket)
+        try:
+            while True:
+                now = self._clock()
+                wait = self.estimate_wait(lane, tokens, ticket)
+                if wait <= 0:
+                    if self.request_bucket is not None:
+                        self.request_bucket.take(1)
+                    if self.token_bucket is not None:
+                        self.token_bucket.take(tokens)
+                    self.admitted[lane] += 1
+                    return now - start
+                if now + wait > deadline:
+                    self.rejected[lane] += 1
+                    raise AdmissionRejected("Gemini 호출 한도를 초과하여 제한 시간 안에 처리할 수 없습니다.",
+                                            retry_after=wait, reason="deadline")
+                await self._sleep(min(wait, deadline - now))
+        finally:
+            queue.remove(ticket)
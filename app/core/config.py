@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 
@@ -11,6 +12,91 @@ class Settings(BaseSettings):
     DEBUG: bool = False
     APP_HOST: str = "0.0.0.0"
     APP_PORT: int = 8000
+    APP_WORKERS: int = 1                  # python -m app.serve로 띄울 워커 프로세스 수
+    SHUTDOWN_GRACE_SECONDS: int = 30      # 종료 신호(SIGTERM) 후 처리 중인 요청을 기다리는 최대 시간
+
+    # DB 연결 설정
+    DB_URL: Optional[str] = None   # 비동기 드라이버 URL (예: sqlite+aiosqlite:///./gamo.db). 비워두면 DB_* 값으로 MySQL(aiomysql) URL 생성
+    DB_POOL_SIZE: int = 5          # 커넥션 풀에 유지할 연결 수
+    DB_MAX_OVERFLOW: int = 10      # 풀이 가득 찼을 때 추가로 허용할 연결 수
+    DB_POOL_TIMEOUT: int = 30      # 풀에서 연결을 기다리는 최대 시간(초)
+    DB_AUTO_CREATE_SCHEMA: bool = False   # True면 시작 시 테이블 생성 (로컬 개발용, 운영은 python -m scripts.create_schema)
+    DB_READY_CHECK_TIMEOUT_SECONDS: float = 3.0   # 연결 확인(SELECT 1) 한 번의 최대 시간
+    DB_READY_RETRY_MAX_SECONDS: float = 30.0      # 시작 시 DB 연결 재시도 간격 최댓값 (지수 증가)
+
+    # 읽기 전용 복제본 (/ajenda 키워드 조회용). 비워두면 모든 조회를 주 DB에서 처리
+    READ_DB_URL: Optional[str] = None     # 복제본 비동기 드라이버 URL (예: mysql+aiomysql://user:pw@replica:3306/gamo)
+    READ_DB_STICKY_SECONDS: float = 10.0  # 통화에 키워드를 저장한 뒤 이 시간 동안은 그 통화 조회를 주 DB에서 (복제 지연 대비)
+    READ_DB_RETRY_SECONDS: float = 30.0   # 복제본 조회가 실패하면 이 시간 동안 주 DB만 사용
+
+    # keywords 보관 정책 (python -m scripts.archive_keywords가 범위를 넘는 행을 keywords_archive로 옮김)
+    KEYWORD_RETENTION_DAYS: int = 730     # 이보다 오래된 키워드는 보관 (0이면 기간 제한 없음)
+    KEYWORD_RETENTION_PER_CALL: int = 0   # 통화별로 남길 키워드 수 (가중치 순, 0이면 제한 없음). 사용하면 /ajenda 순위 결과가 바뀔 수 있음
+    KEYWORD_ARCHIVE_BATCH_CALLS: int = 500  # 한 트랜잭션에서 처리할 통화 수
+
+    # /ajenda 유사 키워드 중복 제거 (문자 bigram 해시 벡터의 코사인 유사도)
+    # 이미 고른 키워드와 유사도가 이 값 이상이면 건너뜀 (0이면 사용 안 함). 문자 bigram 유사도는 표현만 다른 같은 주제보다
+    # 한 단어만 다른 별개 주제("축구"/"야구")를 더 높게 보므로, 실제 데이터로 기준값을 정하기 전까지 끈다.
+    # (python -m benchmarks.bench_keyword_dedup으로 별개 주제 쌍이 남는지 확인)
+    # 0보다 크면 키워드 저장 시 문장 벡터(keyword_vectors)도 저장한다. 켜기 전에 python -m scripts.rebuild_keyword_vectors로 백필
+    KEYWORD_DEDUP_THRESHOLD: float = 0.0
+    KEYWORD_DEDUP_WINDOW: int = 5          # 순위 순서대로 벡터를 불러와 비교할 후보 수 (limit의 배수)
+
+    # /ajenda 응답 시간 목표: 이 시간(초) 안에 Gemini 응답이 없으면 키워드로 만든 문장으로 응답 (0이면 끝까지 기다림)
+    AJENDA_LLM_DEADLINE_SECONDS: float = 3.0
+
+    # STT 텍스트 전처리 (프롬프트 작성 전 추임새/반복/공백 제거)
+    STT_NORMALIZE_ENABLED: bool = True
+
+    # 긴 통화 내용 나누어 추출(map-reduce) 설정
+    KEYWORD_CHUNK_THRESHOLD_CHARS: int = 6000  # 통화 내용이 이 길이(글자)를 넘으면 나누어 추출 (0이면 사용 안 함)
+    KEYWORD_CHUNK_SIZE_CHARS: int = 3000       # 청크 하나의 목표 길이(글자)
+    KEYWORD_CHUNK_OVERLAP_SENTENCES: int = 2   # 앞 청크와 겹칠 문장 수
+    KEYWORD_CHUNK_CONCURRENCY: int = 4         # 동시에 추출할 청크 수 (/keyword/batch에서는 KEYWORD_BATCH_CONCURRENCY 한도를 함께 씀)
+    KEYWORD_MERGE_SIMILARITY: float = 0.6      # 이 유사도(문자 bigram 자카드) 이상인 주제는 하나로 합침
+
+    # 비동기 키워드 추출 작업 큐 설정
+    KEYWORD_JOB_WORKERS: int = 2         # 동시에 처리할 작업 수 (워커 프로세스마다)
+    KEYWORD_JOB_QUEUE_SIZE: int = 100    # 대기열 최대 길이 (가득 차면 429 응답)
+    KEYWORD_JOB_MAX_ATTEMPTS: int = 3    # 워커 중단 등으로 재시도할 최대 횟수
+    KEYWORD_JOB_LEASE_SECONDS: int = 600 # 처리 중 작업의 점유 시간 (이 시간이 지나도록 끝나지 않으면 중단된 것으로 간주)
+    KEYWORD_JOB_POLL_SECONDS: int = 30   # DB에 남은 대기/중단 작업을 다시 불러오는 주기
+    KEYWORD_JOB_DRAIN_SECONDS: int = 20  # 종료 시 처리 중인 작업이 끝나기를 기다리는 최대 시간 (넘으면 대기 상태로 되돌림)
+    KEYWORD_JOB_RETENTION_HOURS: int = 24  # 끝난 작업(통화 내용 포함)을 상태 조회용으로 남겨둘 시간 (python -m scripts.archive_keywords가 삭제)
+
+    # 키워드 일괄 처리(/keyword/batch) 설정
+    KEYWORD_BATCH_CONCURRENCY: int = 4   # 동시에 진행할 Gemini 추출 수
+    KEYWORD_BATCH_MAX_ITEMS: int = 100   # 한 요청에 담을 수 있는 최대 통화 수
+
+    # LLM(Gemini) 호출 설정
+    LLM_BACKEND: str = "gemini"                 # gemini | fake (fake: 오프라인 부하 테스트용 가짜 응답)
+    LLM_MODEL_NAME: str = "models/gemini-flash-latest"
+    LLM_TIMEOUT_SECONDS: float = 30.0           # 호출당 마감 시간 (재시도 포함)
+    LLM_MAX_RETRIES: int = 2                    # 일시적인 오류(429/5xx/타임아웃) 재시도 횟수
+    LLM_BACKOFF_BASE_SECONDS: float = 0.5       # 재시도 대기 시간 기본값 (지수 증가 + 지터)
+    LLM_BACKOFF_MAX_SECONDS: float = 8.0        # 재시도 대기 시간 최댓값
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5      # 연속 실패 몇 번이면 호출을 차단할지
+    LLM_BREAKER_RESET_SECONDS: float = 30.0     # 차단 후 다시 시험 호출하기까지의 시간
+    # Gemini 호출 허용량 제어 (전체 한도를 APP_WORKERS로 나누어 워커 프로세스마다 적용, 0이면 제한 없음)
+    LLM_RPM_LIMIT: int = 0                      # 분당 요청 수
+    LLM_TPM_LIMIT: int = 0                      # 분당 토큰 수 (프롬프트 토큰 추정치 기준)
+    LLM_ADMISSION_BURST_SECONDS: float = 10.0   # 한 번에 몰아서 쓸 수 있는 허용량 (몇 초 분량)
+    LLM_ADMISSION_INTERACTIVE_RESERVE: float = 0.2  # 배치(키워드 추출)가 쓰지 않고 대화형(편지/주제 추천) 몫으로 남길 비율
+    LLM_ADMISSION_MAX_QUEUE: int = 200          # 레인별 최대 대기 요청 수 (넘으면 429)
+    FAKE_LLM_LATENCY_MS: int = 0                # fake 백엔드 응답 지연 시간
+    FAKE_LLM_JITTER_MS: int = 0                 # fake 백엔드 지연 시간에 더할 임의 지터 최댓값
+    FAKE_LLM_LATENCY_PER_KCHAR_MS: int = 0      # fake 백엔드 프롬프트 1,000자당 추가 지연 시간
+
+    # Gemini 응답 캐시 설정
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_ENTRIES: int = 1024              # 메모리(LRU) 캐시 최대 항목 수
+    LLM_CACHE_TTL_SECONDS: int = 600               # 메모리 캐시 유효 시간(초)
+    LLM_CACHE_PERSISTENT: bool = False             # True면 DB(llm_cache 테이블)에도 저장
+    LLM_CACHE_PERSISTENT_TTL_SECONDS: int = 86400  # DB 캐시 유효 시간(초)
+
+    # 모니터링 (/metrics, Prometheus 텍스트 형식)
+    METRICS_ENABLED: bool = True
+    METRICS_EVENT_LOOP_INTERVAL_SECONDS: float = 0.5  # 이벤트 루프 지연 측정 주기
 
     class Config:
         env_file = ".env"
@@ -19,4 +105,4 @@ class Settings(BaseSettings):
 def get_settings():
     return Settings()
 
-settings = get_settings()
\ No newline at end of file
+settings = get_settings()
@@ -0,0 +1,211 @@
+import asyncio
+import hashlib
+import logging
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Optional
+
+from fastapi import Header
+from sqlalchemy import delete, func, select
+
+from app.core.config import settings
+from app.core.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """공백/유니코드 표현 차이만 있는 프롬프트가 같은 캐시 키를 갖도록 정규화"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", prompt)).strip()
+
+
+def make_cache_key(model_name: str, prompt: str) -> str:
+    return hashlib.sha256(f"{model_name}\n{normalize_prompt(prompt)}".encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Gemini 응답 캐시
+    - 1차: 프로세스 메모리 LRU (TTL 적용)
+    - 2차(선택): DB의 llm_cache 테이블 (워커/재시작 간 공유)
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int, persistent: bool = False,
+                 persistent_ttl_seconds: int = 86400, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.persistent = persistent
+        self.persistent_ttl_seconds = persistent_ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (만료 시각, 응답 텍스트)
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self.bypasses = 0
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, text = entry
+            if expires_at > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return text
+            del self._entries[key]
+
+        if self.persistent:
+            text = await self._load_persistent(key)
+            if text is not None:
+                self._store_memory(key, text)
+                self.persistent_hits += 1
+                return text
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, model_name: str, text: str):
+        self._store_memory(key, text)
+        if self.persistent:
+            await self._save_persistent(key, model_name, text)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.persistent_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "hit_ratio": (self.hits + self.persistent_hits) / lookups if lookups else 0.0,
+        }
+
+    def _store_memory(self, key: str, text: str):
+        self._entries[key] = (self._clock() + self.ttl_seconds, text)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    # --- DB 계층: 실패해도 요청 처리는 계속되도록 예외를 삼킨다 ---
+    async def _load_persistent(self, key: str) -> Optional[str]:
+        from app.database import AsyncSessionLocal
+        from app.database.models import LLMCacheEntry
+        try:
+            async with AsyncSessionLocal() as db:
+                entry = await db.get(LLMCacheEntry, key)
+                if entry is None:
+                    return None
+                expires_at = entry.expiresAt
+                if expires_at.tzinfo is None:
+                    expires_at = expires_at.replace(tzinfo=timezone.utc)
+                if expires_at <= datetime.now(timezone.utc):
+                    return None
+                return entry.response
+        except Exception as e:
+            logger.warning("LLM 캐시 DB 조회 실패: %s", e)
+            return None
+
+    async def _save_persistent(self, key: str, model_name: str, text: str):
+        from app.database import AsyncSessionLocal
+        from app.database.models import LLMCacheEntry
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.merge(LLMCacheEntry(
+                    cacheKey=key,
+                    modelName=model_name,
+                    response=text,
+                    expiresAt=datetime.now(timezone.utc) + timedelta(seconds=self.persistent_ttl_seconds),
+                ))
+                await db.commit()
+        except Exception as e:
+            logger.warning("LLM 캐시 DB 저장 실패: %s", e)
+
+    async def purge_expired(self, batch_size: int = 1000, pause_seconds: float = 0.0, dry_run: bool = False) -> int:
+        """
+        DB 캐시(llm_cache)에서 만료된 행을 batch_size개씩 나누어 지운다. 지운 행 수를 반환한다.
+        조회 시 만료된 행은 무시할 뿐 지우지 않으므로 유지보수 스크립트에서 주기적으로 실행한다.
+        (LLM_CACHE_PERSISTENT를 끈 뒤에도 남아 있는 행을 지우도록 persistent 설정과 관계없이 동작)
+        dry_run: 지울 행 수만 센다.
+        """
+        from app.database import AsyncSessionLocal
+        from app.database.models import LLMCacheEntry
+
+        now = datetime.now(timezone.utc)
+        expired = LLMCacheEntry.expiresAt <= now
+        if dry_run:
+            async with AsyncSessionLocal() as db:
+                return (await db.execute(select(func.count()).select_from(LLMCacheEntry).where(expired))).scalar()
+
+        purged = 0
+        while True:
+            async with AsyncSessionLocal() as db:
+                keys = (await db.execute(select(LLMCacheEntry.cacheKey).where(expired).limit(batch_size))).scalars().all()
+                if not keys:
+                    return purged
+                await db.execute(delete(LLMCacheEntry).where(LLMCacheEntry.cacheKey.in_(keys)))
+                await db.commit()
+            purged += len(keys)
+            if pause_seconds:
+                await asyncio.sleep(pause_seconds)
+
+
+llm_cache = LLMResponseCache(
+    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+    persistent=settings.LLM_CACHE_PERSISTENT,
+    persistent_ttl_seconds=settings.LLM_CACHE_PERSISTENT_TTL_SECONDS,
+)
+
+
+def cache_bypass(
+    x_cache_bypass: bool = Header(False, description="true면 캐시를 읽지 않고 Gemini를 새로 호출"),
+    cache_control: Optional[str] = Header(None),
+) -> bool:
+    """요청 단위 캐시 우회 여부 (X-Cache-Bypass: true 또는 Cache-Control: no-cache)"""
+    return x_cache_bypass or (cache_control is not None and "no-cache" in cache_control.lower())
+
+
+# 같은 모델 + 프롬프트로 동시에 들어온 Gemini 호출을 하나로 합친다.
+llm_singleflight = SingleFlight()
+
+
+async def generate_cached(prompt: str, *, endpoint: str, parse: Callable = None,
+                          validate: Callable[[str], Awaitable[str]] = None, bypass: bool = False, **kwargs):
+    """
+    캐시를 거쳐 공용 LLM 클라이언트로 호출한다. (kwargs는 generation_config 등 모델 호출 옵션)
+    parse가 주어지면 응답 텍스트를 parse한 결과를 반환하며, parse에 성공한 응답만 캐시에 저장한다.
+    validate가 주어지면 parse 대신 응답 텍스트를 검증(필요하면 복구)하여 캐시에 저장할 텍스트를 반환한다.
+    캐시에 없는 같은 프롬프트가 동시에 요청되면 Gemini 호출 한 번의 결과를 함께 사용한다. (validate도 한 번만 실행)
+    """
+    from app.core.llm_client import llm_client
+
+    enabled = settings.LLM_CACHE_ENABLED
+    key = make_cache_key(llm_client.model_name, prompt)
+
+    if enabled and bypass:
+        llm_cache.bypasses += 1
+    elif enabled:
+        text = await llm_cache.get(key)
+        if text is not None:
+            return parse(text) if parse else text
+
+    async def fetch() -> str:
+        text = await llm_client.generate(prompt, endpoint=endpoint, **kwargs)
+        # 형식 검증: 실패하면 캐시에 저장하지 않고 모든 대기 요청에 예외 전달
+        if validate:
+            text = await validate(text)
+        elif parse:
+            parse(text)
+        if enabled:
+            await llm_cache.set(key, llm_client.model_name, text)
+        return text
+
+    text = await llm_singleflight.do(key, fetch)
+    return parse(text) if parse else text
@@ -0,0 +1,350 @@
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+from typing import AsyncIterator, Optional
+
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+
+from app.core.admission import AdmissionController, AdmissionRejected, lane_for
+from app.core.config import settings
+from app.core.metrics import llm_admission_rejected, llm_admission_wait, observe_llm_call, record_llm_tokens
+from app.utils.text_normalizer import estimate_tokens
+
+# 재시도할 Gemini 오류 (일시적인 과부하 / 타임아웃 / 서버 오류)
+RETRYABLE_ERRORS = (
+    asyncio.TimeoutError,
+    google_exceptions.TooManyRequests,       # 429 (ResourceExhausted)
+    google_exceptions.InternalServerError,   # 500
+    google_exceptions.ServiceUnavailable,    # 503
+    google_exceptions.GatewayTimeout,        # 504 (DeadlineExceeded)
+)
+
+
+class LLMRejected(Exception):
+    """Gemini를 호출하지 않고 요청을 거절함 (라우터에서 잡지 않고 전역 예외 처리기로 전달)"""
+    status_code = 503
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LLMUnavailable(LLMRejected):
+    """서킷 브레이커가 열려 있어 즉시 실패"""
+    status_code = 503
+
+
+class LLMOverloaded(LLMRejected):
+    """호출 허용량(분당 요청/토큰 수) 초과로 마감 시간 안에 처리할 수 없음"""
+    status_code = 429
+
+
+class CircuitBreaker:
+    """
+    연속 실패가 failure_threshold번 쌓이면 reset_seconds 동안 호출을 막는다(open).
+    시간이 지나면 한 건만 시험 호출을 허용하고(half-open), 성공하면 다시 닫는다(closed).
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_seconds: float, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    def before_call(self):
+        if self.state == self.OPEN:
+            remaining = self.opened_at + self.reset_seconds - self._clock()
+            if remaining > 0:
+                raise LLMUnavailable("Gemini 호출이 일시적으로 중단되었습니다. (연속 오류)", retry_after=max(1, int(remaining)))
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+        if self.state == self.HALF_OPEN:
+            if self._trial_in_flight:
+                raise LLMUnavailable("Gemini 호출 상태를 확인하는 중입니다.", retry_after=1)
+            self._trial_in_flight = True
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def release_trial(self):
+        """half-open 시험 호출이 성공/실패 판정 없이 끝났을 때 다음 요청이 다시 시험할 수 있도록 한다."""
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = self._clock()
+
+
+# --- 백엔드 ---
+class GeminiBackend:
+    """실제 Gemini 호출. GenerativeModel 인스턴스를 프로세스 안에서 재사용한다."""
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self.model = genai.GenerativeModel(model_name)
+
+    async def generate(self, prompt: str, endpoint: str, **kwargs) -> str:
+        response = await self.model.generate_content_async(prompt, **kwargs)
+        self._record_usage(endpoint, response)
+        return response.text
+
+    async def stream(self, prompt: str, endpoint: str, **kwargs) -> AsyncIterator[str]:
+        response = await self.model.generate_content_async(prompt, stream=True, **kwargs)
+        finished = False
+        last_chunk = None
+        try:
+            async for chunk in response:
+                last_chunk = chunk
+                yield chunk.text
+            finished = True
+            self._record_usage(endpoint, last_chunk)  # 스트리밍은 마지막 청크에 전체 사용량이 담김
+        finally:
+            if not finished:
+                # SDK에 공개된 취소 API가 없어, 내부 gRPC 스트림이 cancel()을 지원하는 경우에만 취소
+                cancel = getattr(getattr(response, "_iterator", None), "cancel", None)
+                if callable(cancel):
+                    cancel()
+
+    @staticmethod
+    def _record_usage(endpoint: str, response):
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            record_llm_tokens(endpoint, usage.prompt_token_count, usage.candidates_token_count)
+
+
+class FakeBackend:
+    """
+    오프라인 부하 테스트용 가짜 백엔드 (LLM_BACKEND=fake)
+    같은 프롬프트에는 항상 같은 응답을 만들고, 설정된 지연 시간(+지터)만큼 기다린 뒤 응답한다.
+    latency_per_kchar_ms를 주면 프롬프트 1,000자당 지연 시간이 더해진다. (긴 입력일수록 느린 실제 모델 흉내)
+    """
+
+    _SENTENCE_SPLIT = re.compile(r"(?<=[.?!。])\s+|\n+")
+
+    def __init__(self, model_name: str, latency_ms: int = 0, jitter_ms: int = 0, latency_per_kchar_ms: int = 0):
+        self.model_name = f"fake/{model_name}"
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.latency_per_kchar_ms = latency_per_kchar_ms
+
+    async def _sleep(self, prompt: str, fraction: float = 1.0):
+        delay_ms = self.latency_ms + self.latency_per_kchar_ms * len(prompt) / 1000
+        delay_ms += random.uniform(0, self.jitter_ms) if self.jitter_ms else 0
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms * fraction / 1000)
+
+    @staticmethod
+    def _section(prompt: str, marker: str) -> str:
+        """프롬프트에서 marker 이후의 내용 (예: [대화 내용] 이후의 통화 텍스트)"""
+        index = prompt.rfind(marker)
+        return prompt[index + len(marker):].strip() if index != -1 else prompt.strip()
+
+    def respond(self, prompt: str, endpoint: str) -> str:
+        digest = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest(), 16)
+        if endpoint == "keyword":
+            sentences = [s.strip() for s in self._SENTENCE_SPLIT.split(self._section(prompt, "[대화 내용]")) if s.strip()]
+            count = 2 + digest % 4
+            topics = [
+                {"keyword": (sentences[i % len(sentences)] if sentences else "일상 대화")[:100], "weight": 1 + (digest >> (i * 3)) % 5}
+                for i in range(count)
+            ]
+            return json.dumps(topics, ensure_ascii=False)
+        if endpoint == "ajenda":
+            topics = [line.strip()[2:] for line in self._section(prompt, "[실제 작업]").splitlines() if line.strip().startswith("- ")]
+            return json.dumps({"recommended_topic": f"{', '.join(topics)}에 대해 이야기해 보세요."}, ensure_ascii=False)
+        if endpoint.endswith("_repair"):
+            # 형식 복구 요청: 받은 응답을 그대로 돌려준다.
+            return self._section(prompt, "[응답]")
+        if endpoint == "letter":
+            return re.sub(r"\s+", " ", self._section(prompt, "[원본 텍스트]"))
+        return self._section(prompt, "\n")
+
+    async def generate(self, prompt: str, endpoint: str, **kwargs) -> str:
+        await self._sleep(prompt)
+        text = self.respond(prompt, endpoint)
+        record_llm_tokens(endpoint, estimate_tokens(prompt), estimate_tokens(text))  # 실제 토큰 수 대신 추정치
+        return text
+
+    async def stream(self, prompt: str, endpoint: str, **kwargs) -> AsyncIterator[str]:
+        text = self.respond(prompt, endpoint)
+        record_llm_tokens(endpoint, estimate_tokens(prompt), estimate_tokens(text))
+        chunks = [text[i:i + 20] for i in range(0, len(text), 20)] or [""]
+        for chunk in chunks:
+            await self._sleep(prompt, 1 / len(chunks))
+            yield chunk
+
+
+# --- 클라이언트 ---
+class LLMClient:
+    """
+    모든 라우터가 공유하는 LLM 호출 클라이언트
+    - 호출당 마감 시간(timeout): 재시도와 대기 시간을 모두 포함한 전체 시간
+    - 일시적인 오류는 지터를 더한 지수 백오프로 재시도
+    - 연속 실패 시 서킷 브레이커로 즉시 실패 처리
+    - 호출 전에 허용량(admission)을 확인하여 대화형 요청을 배치 요청보다 먼저 통과시킴
+    """
+
+    def __init__(self, backend, timeout: float, max_retries: int, backoff_base: float,
+                 backoff_max: float, breaker: CircuitBreaker, admission: Optional[AdmissionController] = None):
+        self.backend = backend
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker
+        self.admission = admission
+
+    @property
+    def model_name(self) -> str:
+        return self.backend.model_name
+
+    async def _admit(self, prompt: str, endpoint: str, timeout: float):
+        """허용량 안에서 호출할 수 있을 때까지 기다린다. timeout 안에 안 되면 LLMOverloaded(429)."""
+        if self.admission is None or not self.admission.enabled:
+            return
+        lane = lane_for(endpoint)
+        try:
+            waited = await self.admission.acquire(endpoint, estimate_tokens(prompt), timeout)
+        except AdmissionRejected as e:
+            llm_admission_rejected.inc(lane=lane, reason=e.reason)
+            raise LLMOverloaded(str(e), retry_after=e.retry_after) from e
+        llm_admission_wait.observe(waited, lane=lane)
+
+    def _quota_exceeded(self, error: Exception):
+        """Gemini가 한도 초과(429)를 알려오면 허용량 버킷을 비워 다른 호출도 잠시 기다리게 한다."""
+        if isinstance(error, google_exceptions.TooManyRequests) and self.admission is not None:
+            self.admission.throttle()
+
+    def backoff(self, attempt: int) -> float:
+        """full jitter 지수 백오프: 0 ~ min(최대, 기본 * 2^attempt) 사이의 임의 시간"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    @observe_llm_call
+    async def generate(self, prompt: str, *, endpoint: str, timeout: Optional[float] = None, **kwargs) -> str:
+        deadline = time.monotonic() + (timeout or self.timeout)
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                await self._admit(prompt, endpoint, remaining)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                text = await asyncio.wait_for(self.backend.generate(prompt, endpoint, **kwargs), remaining)
+            except RETRYABLE_ERRORS as e:
+                self.breaker.record_failure()
+                self._quota_exceeded(e)
+                delay = self.backoff(attempt)
+                if attempt >= self.max_retries or time.monotonic() + delay >= deadline:
+                    if isinstance(e, google_exceptions.TooManyRequests):
+                        # 재시도해도 한도 초과면 일반 500이 아닌 429로 응답
+                        raise LLMOverloaded("Gemini 호출 한도를 초과했습니다.", retry_after=max(1, int(self.backoff_max))) from e
+                    raise
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            except (asyncio.CancelledError, Exception):
+                # 취소되었거나 요청 자체의 문제(잘못된 인자 / 안전 필터 등)는 Gemini 장애가 아니므로 서킷에 반영하지 않는다.
+                self.breaker.release_trial()
+                raise
+            self.breaker.record_success()
+            return text
+
+    @observe_llm_call
+    async def stream(self, prompt: str, *, endpoint: str, timeout: Optional[float] = None, **kwargs) -> AsyncIterator[str]:
+        """
+        스트리밍 생성. 첫 청크 전까지의 오류만 서킷에 반영하며, 스트리밍 중에는 재시도하지 않는다.
+        timeout은 각 청크를 기다리는 최대 시간이다.
+        """
+        self.breaker.before_call()
+        chunk_timeout = timeout or self.timeout
+        try:
+            await self._admit(prompt, endpoint, chunk_timeout)
+        except BaseException:
+            self.breaker.release_trial()
+            raise
+        iterator = self.backend.stream(prompt, endpoint, **kwargs).__aiter__()
+        received = False
+        try:
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(iterator.__anext__(), chunk_timeout)
+                except StopAsyncIteration:
+                    break
+                except RETRYABLE_ERRORS as e:
+                    self._quota_exceeded(e)
+                    if not received:
+                        self.breaker.record_failure()
+                    raise
+                if not received:
+                    received = True
+                    self.breaker.record_success()
+                yield chunk
+        finally:
+            self.breaker.release_trial()
+            await iterator.aclose()
+
+
+def configure_llm():
+    """Gemini API 키 설정 (앱 시작 시 lifespan에서 한 번 호출)"""
+    if settings.LLM_BACKEND == "gemini":
+        genai.configure(api_key=settings.GEMINI_API_KEY)
+
+
+def per_worker_limit(limit: int, workers: int) -> float:
+    """
+    전체 허용량을 워커 프로세스 수로 나눈 워커별 허용량 (0이면 제한 없음)
+    정수 나눗셈은 한도가 워커 수보다 작을 때 0(제한 없음)이 되므로 실수로 나눈다. (예: 분당 2회 / 워커 4개 -> 워커마다 분당 0.5회)
+    """
+    return limit / max(1, workers) if limit > 0 else 0.0
+
+
+def create_llm_client() -> LLMClient:
+    if settings.LLM_BACKEND == "fake":
+        backend = FakeBackend(
+            settings.LLM_MODEL_NAME,
+            latency_ms=settings.FAKE_LLM_LATENCY_MS,
+            jitter_ms=settings.FAKE_LLM_JITTER_MS,
+            latency_per_kchar_ms=settings.FAKE_LLM_LATENCY_PER_KCHAR_MS,
+        )
+    elif settings.LLM_BACKEND == "gemini":
+        backend = GeminiBackend(settings.LLM_MODEL_NAME)
+    else:
+        raise ValueError(f"지원하지 않는 LLM_BACKEND: {settings.LLM_BACKEND}")
+
+    return LLMClient(
+        backend=backend,
+        timeout=settings.LLM_TIMEOUT_SECONDS,
+        max_retries=settings.LLM_MAX_RETRIES,
+        backoff_base=settings.LLM_BACKOFF_BASE_SECONDS,
+        backoff_max=settings.LLM_BACKOFF_MAX_SECONDS,
+        breaker=CircuitBreaker(settings.LLM_BREAKER_FAILURE_THRESHOLD, settings.LLM_BREAKER_RESET_SECONDS),
+        admission=AdmissionController(
+            rpm=per_worker_limit(settings.LLM_RPM_LIMIT, settings.APP_WORKERS),
+            tpm=per_worker_limit(settings.LLM_TPM_LIMIT, settings.APP_WORKERS),
+            burst_seconds=settings.LLM_ADMISSION_BURST_SECONDS,
+            interactive_reserve=settings.LLM_ADMISSION_INTERACTIVE_RESERVE,
+            max_queue=settings.LLM_ADMISSION_MAX_QUEUE,
+        ),
+    )
+
+
+llm_client = create_llm_client()
@@ -0,0 +1,213 @@
+import json
+import logging
+import re
+from collections import defaultdict
+from typing import Annotated, Any, Callable, List, Optional
+
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+
+from app.core.llm_cache import generate_cached
+from app.core.llm_client import llm_client
+
+logger = logging.getLogger(__name__)
+
+
+_CODE_FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+# 키워드 추출 응답의 주제 개수 (프롬프트의 "2개에서 5개 사이"와 동일)
+MIN_TOPICS = 2
+MAX_TOPICS = 5
+
+
+# --- 응답 스키마 ---
+class KeywordTopic(BaseModel):
+    keyword: str = Field(..., min_length=1, max_length=255, description="문맥을 포함한 주제 문장")
+    weight: int = Field(..., ge=1, le=5, description="중요도 1(낮음) ~ 5(매우 높음)")
+
+
+class AgendaTopic(BaseModel):
+    recommended_topic: str = Field(..., min_length=1)
+
+
+class LLMOutputError(ValueError):
+    """Gemini 응답이 요구한 JSON 형식/스키마와 맞지 않음"""
+
+    def __init__(self, message: str, raw: str):
+        super().__init__(message)
+        self.raw = raw
+
+
+class OutputSpec:
+    """
+    엔드포인트별 구조화 출력 정의
+    - schema: Gemini JSON 모드(response_schema)에 넘길 스키마
+    - adapter: 응답 검증용 pydantic TypeAdapter
+    - convert: 검증된 값을 라우터가 쓰는 형태로 변환
+    - fallback: 복구 재시도까지 실패했을 때 원본 텍스트로 만들 값 (없으면 LLMOutputError)
+    """
+
+    def __init__(self, endpoint: str, schema: dict, adapter: TypeAdapter,
+                 convert: Callable[[Any], Any], fallback: Optional[Callable[[str], Any]] = None):
+        self.endpoint = endpoint
+        self.schema = schema
+        self.adapter = adapter
+        self.convert = convert
+        self.fallback = fallback
+
+    @property
+    def generation_config(self) -> dict:
+        return {"response_mime_type": "application/json", "response_schema": self.schema}
+
+
+KEYWORD_OUTPUT = OutputSpec(
+    endpoint="keyword",
+    # 개수 제한도 스키마에 넣어 Gemini가 범위 안에서 생성하도록 한다. (SDK 필드명은 snake_case)
+    schema={
+        "type": "array",
+        "min_items": MIN_TOPICS,
+        "max_items": MAX_TOPICS,
+        "items": {
+            "type": "object",
+            "properties": {
+                "keyword": {"type": "string"},
+                "weight": {"type": "integer"},
+            },
+            "required": ["keyword", "weight"],
+        },
+    },
+    # 주제 개수가 범위를 벗어나면 검증 실패 -> 복구 재시도
+    adapter=TypeAdapter(Annotated[List[KeywordTopic], Field(min_length=MIN_TOPICS, max_length=MAX_TOPICS)]),
+    convert=lambda topics: [topic.model_dump() for topic in topics],
+)
+
+def clean_topic_text(text: str) -> str:
+    """JSON 구조가 완전히 깨진 추천 주제 응답: 전체 텍스트를 깔끔하게 정리해서 사용"""
+    content = _CODE_FENCE.sub(lambda m: m.group(1), text).strip()
+    return content.replace('"', '').replace('{', '').replace('}', '').replace('recommended_topic:', '').strip()
+
+
+AGENDA_OUTPUT = OutputSpec(
+    endpoint="ajenda",
+    schema={
+        "type": "object",
+        "properties": {"recommended_topic": {"type": "string"}},
+        "required": ["recommended_topic"],
+    },
+    adapter=TypeAdapter(AgendaTopic),
+    convert=lambda topic: topic.recommended_topic,
+    fallback=clean_topic_text,
+)
+
+
+# --- 파싱 ---
+def extract_json(text: str) -> Any:
+    """응답 텍스트에서 JSON 값을 꺼낸다. (마크다운 코드 블록 / 앞뒤 설명 문장 허용)"""
+    content = text.strip()
+    fenced = _CODE_FENCE.search(content)
+    if fenced:
+        content = fenced.group(1).strip()
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        # 서론/결론 문장이 붙은 경우: 첫 번째 {또는 [ 부터 마지막 }또는 ] 까지
+        starts = [i for i in (content.find("{"), content.find("[")) if i != -1]
+        end = max(content.rfind("}"), content.rfind("]"))
+        if not starts or end < min(starts):
+            raise
+        return json.loads(content[min(starts):end + 1])
+
+
+def parse_output(text: str, spec: OutputSpec) -> Any:
+    try:
+        return spec.convert(spec.adapter.validate_python(extract_json(text)))
+    except (ValueError, ValidationError) as e:
+        raise LLMOutputError(f"Gemini 응답 형식 오류({spec.endpoint}): {e}", raw=text) from e
+
+
+# --- 엔드포인트별 파싱 실패 통계 ---
+class ParseStats:
+    """Gemini 응답 단위로 센다. (캐시 적중 / 진행 중인 같은 호출에 합류한 요청은 세지 않음)"""
+
+    def __init__(self):
+        self._counts = defaultdict(lambda: {"parsed": 0, "repaired": 0, "fallback": 0, "failed": 0})
+
+    def record(self, endpoint: str, outcome: str):
+        self._counts[endpoint][outcome] += 1
+
+    def stats(self) -> dict:
+        result = {}
+        for endpoint, counts in self._counts.items():
+            total = sum(counts.values())
+            first_pass_failures = total - counts["parsed"]
+            result[endpoint] = {**counts, "failure_rate": first_pass_failures / total if total else 0.0}
+        return result
+
+
+parse_stats = ParseStats()
+
+
+def build_repair_prompt(raw: str, spec: OutputSpec, error: str) -> str:
+    """형식이 깨진 응답만 고치도록 요청하는 짧은 프롬프트 (원본 대화 내용은 다시 보내지 않음)"""
+    bounds = ""
+    if "max_items" in spec.schema:
+        bounds = (f"배열 항목은 {spec.schema['min_items']}개 이상 {spec.schema['max_items']}개 이하여야 합니다. "
+                  "너무 많으면 weight가 낮은 항목부터 빼세요.")
+    return f"""
+    아래 [응답]은 [JSON 스키마]를 따라야 하지만 형식이 잘못되었습니다.
+    내용은 바꾸지 말고 스키마에 맞는 유효한 JSON만 반환하세요. 설명은 절대 추가하지 마세요.
+    {bounds}
+
+    [오류]
+    {error}
+
+    [JSON 스키마]
+    {json.dumps(spec.schema, ensure_ascii=False)}
+
+    [응답]
+    {raw}
+    """
+
+
+async def generate_structured(prompt: str, spec: OutputSpec, *, bypass: bool = False) -> Any:
+    """
+    JSON 모드로 Gemini를 호출하고 pydantic 스키마로 검증한 값을 반환한다.
+    검증에 실패하면 깨진 응답만 보내 한 번 복구를 요청하고, 그래도 실패하면
+    spec.fallback이 있으면 그 값을, 없으면 LLMOutputError를 낸다.
+    복구는 같은 프롬프트로 동시에 들어온 요청이 공유하는 호출 안에서 한 번만 실행하고, 복구된 응답을 원래 프롬프트의 캐시에 저장한다.
+    """
+    def parse(text: str):
+        return parse_output(text, spec)
+
+    async def validate(text: str) -> str:
+        try:
+            parse(text)
+        except LLMOutputError as e:
+            first_error = e
+        else:
+            parse_stats.record(spec.endpoint, "parsed")
+            return text
+
+        logger.warning("%s - 복구 재시도", first_error)
+        try:
+            repaired = await llm_client.generate(
+                build_repair_prompt(first_error.raw, spec, str(first_error.__cause__ or first_error)),
+                endpoint=f"{spec.endpoint}_repair",
+                generation_config={**spec.generation_config, "temperature": 0},
+            )
+            parse(repaired)
+        except LLMOutputError:
+            usable = spec.fallback is not None and first_error.raw.strip()
+            parse_stats.record(spec.endpoint, "fallback" if usable else "failed")
+            raise first_error
+        parse_stats.record(spec.endpoint, "repaired")
+        return repaired
+
+    try:
+        return await generate_cached(
+            prompt, endpoint=spec.endpoint, parse=parse, validate=validate, bypass=bypass,
+            generation_config=spec.generation_config,
+        )
+    except LLMOutputError as e:
+        if spec.fallback is not None and e.raw.strip():
+            return spec.fallback(e.raw)
+        raise
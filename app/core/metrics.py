@@ -0,0 +1,350 @@
+import asyncio
+import functools
+import inspect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# 지연 시간 히스토그램 기본 구간(초): 짧은 DB 쿼리부터 긴 Gemini 호출까지
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+# --- Prometheus 텍스트 형식(0.0.4) 지표 ---
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """지표 목록을 보관하고 /metrics 응답(텍스트 형식)을 만든다."""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for suffix, labels, value in metric.samples():
+                lines.append(f"{metric.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()  # 동기 엔진 이벤트는 다른 스레드에서 올 수 있음
+        registry.register(self)
+
+    def _key(self, labels: dict) -> Tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        return [("", self._labels(key), value) for key, value in list(self._values.items())]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._values: Dict[Tuple[str, ...], list] = {}  # key -> [구간별 개수, 합계, 개수]
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        result = []
+        with self._lock:
+            items = [(key, list(entry[0]), entry[1], entry[2]) for key, entry in self._values.items()]
+        for key, counts, total, count in items:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                result.append(("_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            result.append(("_sum", labels, total))
+            result.append(("_count", labels, count))
+        return result
+
+
+class CallbackMetric(_Metric):
+    """
+    다른 모듈이 이미 세고 있는 값(캐시/서킷 브레이커 통계 등)을 /metrics 요청 시점에 읽어서 내보낸다.
+    fn은 (라벨 dict, 값) 목록을 반환한다.
+    """
+
+    def __init__(self, name: str, documentation: str, fn: Callable[[], Iterable[Tuple[dict, float]]],
+                 type: str = "gauge"):
+        super().__init__(name, documentation)
+        self.type = type
+        self.fn = fn
+
+    def samples(self):
+        return [("", labels, value) for labels, value in self.fn()]
+
+
+# --- 공용 지표 ---
+http_request_duration = Histogram(
+    "gamo_http_request_duration_seconds", "HTTP 요청 처리 시간 (라우트 경로 템플릿 기준)",
+    ["method", "route", "status"],
+)
+llm_request_duration = Histogram(
+    "gamo_llm_request_duration_seconds", "LLM 호출 시간 (재시도 포함)", ["endpoint", "outcome"],
+)
+llm_errors = Counter("gamo_llm_errors_total", "LLM 호출 실패 수 (오류 종류별)", ["endpoint", "error"])
+llm_admission_wait = Histogram(
+    "gamo_llm_admission_wait_seconds", "LLM 호출 허용량 대기 시간", ["lane"],
+)
+llm_admission_rejected = Counter(
+    "gamo_llm_admission_rejected_total", "허용량 초과로 거절한 LLM 호출 수", ["lane", "reason"],
+)
+llm_tokens = Counter("gamo_llm_tokens_total", "LLM 토큰 사용량", ["endpoint", "kind"])
+db_query_duration = Histogram(
+    "gamo_db_query_duration_seconds", "SQL 실행 시간", ["engine", "operation"],
+)
+db_query_errors = Counter("gamo_db_query_errors_total", "SQL 실행 오류 수", ["engine"])
+db_pool_checkout_wait = Histogram(
+    "gamo_db_pool_checkout_wait_seconds", "커넥션 풀에서 연결을 얻기까지 기다린 시간", ["engine"],
+)
+db_read_routes = Counter(
+    "gamo_db_read_routes_total", "읽기 조회를 실행한 DB (replica / primary)와 그 이유", ["target", "reason"],
+)
+event_loop_lag = Histogram(
+    "gamo_event_loop_lag_seconds", "이벤트 루프 지연 (예약한 시각보다 늦게 깨어난 시간)",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+
+# --- HTTP 미들웨어 ---
+def _route_template(scope) -> str:
+    """
+    요청이 매칭된 라우트의 경로 템플릿
+    include_router(prefix=...)로 등록된 라우트는 FastAPI 버전에 따라 route.path에 prefix가 빠져 있을 수 있어,
+    실제 요청 경로에서 라우트가 매칭되는 위치를 찾아 앞부분을 prefix로 붙인다.
+    """
+    route = scope.get("route")
+    if route is None or not hasattr(route, "path_regex"):
+        return "unmatched"
+    path = scope["path"]
+    for i, char in enumerate(path):
+        if char == "/" and route.path_regex.match(path[i:]):
+            return path[:i] + route.path
+    return route.path
+
+
+class MetricsMiddleware:
+    """
+    라우트별 응답 시간 측정 (ASGI 미들웨어)
+    스트리밍 응답(SSE)은 마지막 청크를 보낼 때까지를 측정한다.
+    라벨은 실제 URL이 아닌 라우트 경로 템플릿(/api/keyword/jobs/{job_id})을 사용하여 라벨 수가 늘어나지 않도록 한다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # 라우터가 요청을 처리하면서 scope에 매칭된 route를 기록해 둔다.
+            http_request_duration.observe(
+                time.perf_counter() - start, method=scope["method"], route=_route_template(scope), status=status_code,
+            )
+
+
+# --- LLM 호출 ---
+def _outcome(exc: BaseException) -> str:
+    if isinstance(exc, (asyncio.CancelledError, GeneratorExit)):
+        return "cancelled"
+    return type(exc).__name__
+
+
+def observe_llm_call(func):
+    """
+    LLM 호출 메서드(endpoint 키워드 인자 필요)의 소요 시간/실패를 기록하는 데코레이터
+    코루틴 함수와 비동기 제너레이터(스트리밍) 모두 지원한다.
+    """
+    def record(endpoint: str, start: float, outcome: str):
+        llm_request_duration.observe(time.perf_counter() - start, endpoint=endpoint, outcome=outcome)
+        if outcome != "ok":
+            llm_errors.inc(endpoint=endpoint, error=outcome)
+
+    if inspect.isasyncgenfunction(func):
+        @functools.wraps(func)
+        async def stream_wrapper(self, prompt, *, endpoint: str, **kwargs):
+            start = time.perf_counter()
+            outcome = "ok"
+            try:
+                async for chunk in func(self, prompt, endpoint=endpoint, **kwargs):
+                    yield chunk
+            except BaseException as e:
+                outcome = _outcome(e)
+                raise
+            finally:
+                record(endpoint, start, outcome)
+        return stream_wrapper
+
+    @functools.wraps(func)
+    async def wrapper(self, prompt, *, endpoint: str, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = await func(self, prompt, endpoint=endpoint, **kwargs)
+        except BaseException as e:
+            record(endpoint, start, _outcome(e))
+            raise
+        record(endpoint, start, "ok")
+        return result
+    return wrapper
+
+
+def record_llm_tokens(endpoint: str, prompt_tokens: int, output_tokens: int):
+    llm_tokens.inc(prompt_tokens or 0, endpoint=endpoint, kind="prompt")
+    llm_tokens.inc(output_tokens or 0, endpoint=endpoint, kind="output")
+
+
+# --- DB ---
+_SQL_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "CREATE", "DROP", "ALTER", "PRAGMA", "SHOW"}
+
+
+def _sql_operation(statement: str) -> str:
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return operation if operation in _SQL_OPERATIONS else "OTHER"
+
+
+# instrument_engine으로 등록한 엔진 -> 지표의 engine 이름 (세션 커넥션 대기 시간 기록용)
+_engine_names: Dict[object, str] = {}
+
+
+def _mark_checkout_start(session, transaction):
+    # 세션의 최상위 트랜잭션이 시작된 시각 (커넥션은 아직 꺼내지 않음)
+    if transaction.parent is None:
+        session.info["checkout_start"] = time.perf_counter()
+
+
+def _record_checkout_wait(session, transaction, connection):
+    start = session.info.pop("checkout_start", None)
+    name = _engine_names.get(connection.engine)
+    if start is not None and name is not None:
+        db_pool_checkout_wait.observe(time.perf_counter() - start, engine=name)
+
+
+def instrument_engine(engine, name: str):
+    """
+    엔진 이벤트(before/after_cursor_execute)로 SQL 실행 시간을 기록한다. (AsyncEngine도 가능)
+    세션이 이 엔진의 커넥션을 얻기까지 기다린 시간도 세션 이벤트로 기록한다.
+    풀에는 대기 시작 이벤트가 없으므로 트랜잭션 시작(after_transaction_create)부터 커넥션을 얻은 시점(after_begin)까지를 잰다.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+    _engine_names[sync_engine] = name
+    if not event.contains(Session, "after_begin", _record_checkout_wait):
+        event.listen(Session, "after_transaction_create", _mark_checkout_start)
+        event.listen(Session, "after_begin", _record_checkout_wait)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = conn.info["query_start"].pop()
+        db_query_duration.observe(time.perf_counter() - start, engine=name, operation=_sql_operation(statement))
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(context):
+        starts = context.connection.info.get("query_start") if context.connection is not None else None
+        if starts:
+            starts.pop()
+        db_query_errors.inc(engine=name)
+
+
+# --- 이벤트 루프 ---
+async def monitor_event_loop(interval: float):
+    """interval마다 잠들었다가 늦게 깨어난 만큼을 이벤트 루프 지연으로 기록 (lifespan에서 실행)"""
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        event_loop_lag.observe(max(0.0, time.perf_counter() - start - interval))
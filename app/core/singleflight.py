@@ -0,0 +1,53 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    같은 키로 동시에 들어온 요청이 하나의 진행 중인 작업(Task)을 공유하도록 한다.
+    - 결과와 예외는 기다리는 모든 요청에 똑같이 전달된다.
+    - 한 요청이 취소되어도 공유 작업은 계속되며, 기다리는 요청이 모두 취소되면 공유 작업도 취소한다.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executed = 0   # 실제로 실행된 작업 수
+        self.coalesced = 0  # 진행 중인 작업에 합류하여 호출을 절약한 요청 수
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable]):
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self.executed += 1
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            # shield: 이 요청이 취소되어도 다른 요청이 기다리는 공유 작업은 취소되지 않도록 보호
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # 아무도 기다리지 않는 작업은 취소하고, 새 요청은 새 작업을 시작하도록 즉시 제거
+                self._forget(key, call)
+                call.task.cancel()
+
+    def _forget(self, key: Hashable, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._calls),
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+        }
@@ -1 +1 @@
-from .database import Base, engine, get_db, SessionLocal
\ No newline at end of file
+from .database import Base, async_engine, get_async_db, AsyncSessionLocal, create_schema, db_readiness, read_async_engine, get_read_db, ReadSession, replica_router, pool_stats, database_now
@@ -0,0 +1,189 @@
+import math
+from datetime import datetime
+from typing import Awaitable, Callable, List, NamedTuple, Optional
+import numpy as np
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.database.database import replica_router
+from app.database.models import Keyword, KeywordVector
+from app.utils.id_utils import generate_keyword_id, keyword_id_generator
+from app.utils.ngram_vectors import decode_vector, encode_vector, greedy_dedup, ngram_vector, normalize_rows
+from app.utils.ranking import rank_order
+
+# keywordId 충돌(IntegrityError) 시 ID를 새로 발급하여 재시도할 횟수
+KEYWORD_INSERT_MAX_RETRIES = 3
+
+
+async def store_keywords(
+    db: AsyncSession,
+    rows: List[dict],
+    before_commit: Optional[Callable[[AsyncSession], Awaitable]] = None,
+) -> List[dict]:
+    """
+    키워드 목록을 한 번의 multi-row INSERT로 저장하고 커밋한다.
+    rows: [{"keyword": str, "weight": int, "videocallId": int}, ...]
+    ID 중복 확인 조회 없이 저장하며, 드물게 ID가 충돌하면 ID를 다시 발급하여 재시도한다.
+    KEYWORD_DEDUP_THRESHOLD가 0보다 크면 키워드 문장 벡터(keyword_vectors)도 같은 트랜잭션에서 저장한다.
+    before_commit: 같은 트랜잭션에 함께 반영할 추가 작업 (예: 작업 상태 갱신). 재시도 시 다시 호출된다.
+    """
+    if not rows:
+        if before_commit is not None:
+            await before_commit(db)
+            await db.commit()
+        return []
+
+    # 중복 제거를 끈 동안은 벡터를 저장하지 않는다. (켠 뒤 저장되지 않은 벡터는 load_keyword_vectors가 문장으로 계산)
+    vectors = ([encode_vector(ngram_vector(row["keyword"])) for row in rows]
+               if settings.KEYWORD_DEDUP_THRESHOLD > 0 else None)
+    videocall_ids = sorted({row["videocallId"] for row in rows})
+    for attempt in range(1, KEYWORD_INSERT_MAX_RETRIES + 1):
+        values = [{**row, "keywordId": generate_keyword_id()} for row in rows]
+        try:
+            await db.execute(insert(Keyword).values(values))
+            if vectors is not None:
+                await db.execute(insert(KeywordVector).values([
+                    {"keywordId": value["keywordId"], "videocallId": value["videocallId"], "vector": vector}
+                    for value, vector in zip(values, vectors)
+                ]))
+            if before_commit is not None:
+                await before_commit(db)
+            await db.commit()
+            replica_router.mark_written(videocall_ids)
+            return values
+        except IntegrityError:
+            await db.rollback()
+            if attempt == KEYWORD_INSERT_MAX_RETRIES:
+                raise
+            # 다른 워커와 노드 번호가 겹쳤을 가능성이 있으므로 노드 번호를 다시 뽑는다.
+            keyword_id_generator.reseed()
+
+
+async def select_top_keywords(db: AsyncSession, videocall_ids: List[int], limit: int = 3):
+    """
+    키워드 우선순위 로직을 DB 안에서 계산하여 최종 키워드 limit개만 조회한다.
+    (가중치 상위 절반 -> 최신순 limit개, app.utils.ranking.rank_keywords와 동일한 결과)
+    동점은 keywordId 오름차순으로 정렬된 입력에 rank_keywords를 적용한 것과 같게 처리한다.
+    """
+    ranked = (
+        select(
+            Keyword.keywordId,
+            Keyword.keyword,
+            Keyword.weight,
+            Keyword.date,
+            func.row_number().over(
+                order_by=(Keyword.weight.desc(), Keyword.keywordId)
+            ).label("weight_rank"),
+            func.count().over().label("total"),
+        )
+        .where(Keyword.videocallId.in_(videocall_ids))
+        .subquery()
+    )
+    stmt = (
+        select(ranked.c.keywordId, ranked.c.keyword, ranked.c.weight, ranked.c.date)
+        # weight_rank <= ceil(total / 2)
+        .where(ranked.c.weight_rank * 2 <= ranked.c.total + 1)
+        .order_by(ranked.c.date.desc(), ranked.c.weight_rank)
+        .limit(limit)
+    )
+    result = await db.execute(stmt)
+    return result.all()
+
+
+class RankedKeyword(NamedTuple):
+    """중복 제거 순위 계산용 키워드 (조회한 행을 rank_order에 넘기는 형태)"""
+    keywordId: str
+    keyword: str
+    weight: int
+    date: datetime
+
+
+async def load_keyword_vectors(db: AsyncSession, keywords) -> np.ndarray:
+    """
+    키워드 목록의 정규화된 문장 벡터 행렬 (행 순서는 keywords와 같음)
+    keyword_vectors에 없는 키워드(백필 전)는 문장으로 바로 계산한다.
+    """
+    result = await db.execute(
+        select(KeywordVector.keywordId, KeywordVector.vector)
+        .where(KeywordVector.keywordId.in_([kw.keywordId for kw in keywords]))
+    )
+    stored = {row.keywordId: decode_vector(row.vector) for row in result.all()}
+    return normalize_rows([
+        stored[kw.keywordId] if kw.keywordId in stored else ngram_vector(kw.keyword) for kw in keywords
+    ])
+
+
+async def suppress_near_duplicates(db: AsyncSession, ranked: list, limit: int, threshold: float) -> list:
+    """
+    rank_order 순서의 키워드 목록에서 앞서 고른 키워드와 문장이 거의 같은(코사인 유사도 threshold 이상) 키워드를 건너뛰고 고른다.
+    고르는 개수는 rank_keywords와 같은 min(limit, 상위 절반 개수)이며, 건너뛴 자리만 뒤쪽 후보로 채운다.
+    벡터는 limit * KEYWORD_DEDUP_WINDOW개씩 순서대로 불러오므로, 앞쪽에서 limit개가 채워지면 나머지는 읽지 않는다.
+    """
+    limit = min(limit, math.ceil(len(ranked) / 2))
+    window = max(1, limit * settings.KEYWORD_DEDUP_WINDOW)
+    selected, selected_vectors = [], []
+    for start in range(0, len(ranked), window):
+        chunk = ranked[start:start + window]
+        matrix = await load_keyword_vectors(db, chunk)
+        previous = np.vstack(selected_vectors) if selected_vectors else None
+        for index in greedy_dedup(matrix, threshold, limit - len(selected), selected=previous):
+            selected.append(chunk[index])
+            selected_vectors.append(matrix[index:index + 1])
+        if len(selected) >= limit:
+            break
+    return selected
+
+
+async def get_ranked_keywords(db: AsyncSession, videocall_ids: List[int], limit: int = 3,
+                              dedup_threshold: Optional[float] = None):
+    """
+    /ajenda용 최종 키워드 조회.
+    기본은 select_top_keywords의 DB 윈도우 함수 쿼리로 계산한다.
+    dedup_threshold(기본: KEYWORD_DEDUP_THRESHOLD)가 0보다 크면 순위 순서대로 고르면서 거의 같은 문장은 건너뛰고,
+    비게 된 자리는 다음 순위(상위 절반 -> 나머지) 키워드로 채운다.
+    """
+    if dedup_threshold is None:
+        dedup_threshold = settings.KEYWORD_DEDUP_THRESHOLD
+    dedup = dedup_threshold > 0
+
+    if not dedup:
+        return await select_top_keywords(db, videocall_ids, limit)
+    # select_top_keywords와 같은 동점 처리를 위해 keywordId 순으로 정렬한 뒤 적용
+    result = await db.execute(
+        select(Keyword.keywordId, Keyword.keyword, Keyword.weight, Keyword.date)
+        .where(Keyword.videocallId.in_(videocall_ids))
+        .order_by(Keyword.keywordId)
+    )
+    ranked = rank_order([RankedKeyword(*row) for row in result.all()])
+    return await suppress_near_duplicates(db, ranked, limit, dedup_threshold)
+
+
+async def backfill_keyword_vectors(db: AsyncSession, batch_size: int = 1000) -> int:
+    """keyword_vectors에 없는 키워드의 문장 벡터를 keywordId 순서로 batch_size개씩 만든다. 만든 벡터 수를 반환."""
+    created = 0
+    last_id = None
+    while True:
+        stmt = (
+            select(Keyword.keywordId, Keyword.keyword, Keyword.videocallId, KeywordVector.keywordId.label("vectorId"))
+            .outerjoin(KeywordVector, KeywordVector.keywordId == Keyword.keywordId)
+            .order_by(Keyword.keywordId)
+            .limit(batch_size)
+        )
+        if last_id is not None:
+            stmt = stmt.where(Keyword.keywordId > last_id)
+        rows = (await db.execute(stmt)).all()
+        if not rows:
+            return created
+
+        values = [
+            {"keywordId": row.keywordId, "videocallId": row.videocallId,
+             "vector": encode_vector(ngram_vector(row.keyword))}
+            for row in rows if row.vectorId is None
+        ]
+        if values:
+            await db.execute(insert(KeywordVector).values(values))
+        await db.commit()
+        created += len(values)
+        last_id = rows[-1].keywordId
@@ -1,25 +1,300 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func, inspect, select, text
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
 from app.core.config import settings
+from app.core.metrics import db_read_routes, instrument_engine
+
+logger = logging.getLogger(__name__)
 
 # DB URL 생성
-DB_URL = f"mysql+pymysql://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
+if settings.DB_URL:
+    ASYNC_DB_URL = make_url(settings.DB_URL)
+else:
+    ASYNC_DB_URL = URL.create(
+        "mysql+aiomysql",
+        username=settings.DB_USER,
+        password=settings.DB_PASSWORD,
+        host=settings.DB_HOST,
+        port=settings.DB_PORT,
+        database=settings.DB_NAME,
+    )
+
+
+def engine_options(url: URL) -> dict:
+    """URL 종류에 맞는 엔진 옵션을 반환한다. (SQLite는 커넥션 풀 크기 옵션을 사용하지 않음)"""
+    options = {"echo": settings.DEBUG}
+    if url.get_backend_name() != "sqlite":
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            # 연결 끊김 방지 옵션
+            pool_pre_ping=True,   # 쿼리 실행 직전에 연결 상태를 확인하고, 끊어졌으면 자동으로 재연결한다.
+            pool_recycle=3600,    # => 1시간(3600초)마다 연결을 강제로 갱신하여 MySQL 타임아웃을 방지
+        )
+    return options
+
 
 # 엔진 생성
-engine = create_engine(
-    DB_URL,
-    echo=settings.DEBUG,
-    # 연결 끊김 방지 옵션
-    pool_pre_ping=True,   # 쿼리 실행 직전에 연결 상태를 확인하고, 끊어졌으면 자동으로 재연결한다.
-    pool_recycle=3600     # => 1시간(3600초)마다 연결을 강제로 갱신하여 MySQL 타임아웃을 방지
+async_engine = create_async_engine(ASYNC_DB_URL, **engine_options(ASYNC_DB_URL))
+# 읽기 전용 복제본 (READ_DB_URL을 지정한 경우만, 주 DB와 별도의 커넥션 풀)
+READ_DB_URL = make_url(settings.READ_DB_URL) if settings.READ_DB_URL else None
+read_async_engine = (
+    create_async_engine(READ_DB_URL, **engine_options(READ_DB_URL))
+    if READ_DB_URL is not None else None
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# SQL 실행 시간 / 커넥션 대기 시간 기록
+if settings.METRICS_ENABLED:
+    instrument_engine(async_engine, "async")
+    if read_async_engine is not None:
+        instrument_engine(read_async_engine, "read")
+
+
+def pool_stats() -> Dict[str, dict]:
+    """엔진별 커넥션 풀 상태 (풀 크기 / 사용 중 / 대기 중 / 초과 연결 수)"""
+    engines = {"async": async_engine, "read": read_async_engine}
+    stats = {}
+    for name, target in engines.items():
+        if target is None:
+            continue
+        pool = target.pool
+        if not hasattr(pool, "checkedout"):
+            continue  # NullPool 등 상태를 세지 않는 풀
+        stats[name] = {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+        }
+    return stats
+
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,  # commit 이후에도 ORM 객체 속성을 다시 조회하지 않도록 함
+)
+ReadSessionLocal = (
+    async_sessionmaker(bind=read_async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    if read_async_engine is not None else None
+)
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_async_db():
+    """이벤트 루프를 막지 않는 비동기 DB 세션 의존성"""
+    async with AsyncSessionLocal() as db:
         yield db
+
+
+async def database_now(db: AsyncSession) -> datetime:
+    """
+    DB 서버의 현재 시각. server_default=func.now()로 채운 컬럼(date, updatedAt)과 비교하는 기준 시각은 이 값으로 계산한다.
+    (MySQL NOW()는 세션 시간대 기준이라 Python의 UTC 시각과 어긋날 수 있음)
+    """
+    return (await db.execute(select(func.now()))).scalar()
+
+
+class ReplicaRouter:
+    """
+    읽기 조회를 복제본(replica)과 주 DB(primary) 중 어디서 실행할지 정한다.
+    - 복제본이 없거나, 복제본 조회가 실패한 뒤 retry_seconds가 지나지 않았으면 주 DB
+    - 조회하려는 통화에 sticky_seconds 안에 쓰기가 있었으면 주 DB (복제 지연으로 방금 저장한 키워드가 안 보이는 것 방지)
+    쓰기 기록은 워커 프로세스마다 따로 보관하므로, 다른 워커에서 저장한 통화는 ReadSession이 복제본에 통화가 있는지 확인하여 보완한다.
+    """
+
+    def __init__(self, replica_sessionmaker, primary_sessionmaker, sticky_seconds: float,
+                 retry_seconds: float, clock=time.monotonic):
+        self.replica_sessionmaker = replica_sessionmaker
+        self.primary_sessionmaker = primary_sessionmaker
+        self.sticky_seconds = sticky_seconds
+        self.retry_seconds = retry_seconds
+        self._clock = clock
+        self._written: Dict[int, float] = {}  # videocallId -> 주 DB에 쓴 시각
+        self._replica_down_until = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.replica_sessionmaker is not None
+
+    def mark_written(self, videocall_ids: Iterable[int]):
+        """주 DB에 커밋한 통화를 기록한다. (sticky_seconds 동안 해당 통화 조회는 주 DB로)"""
+        if not self.enabled:
+            return
+        now = self._clock()
+        for videocall_id in videocall_ids:
+            self._written[videocall_id] = now
+        if len(self._written) > 10000:
+            self._prune(now)
+
+    def _prune(self, now: float):
+        expired = now - self.sticky_seconds
+        self._written = {call_id: at for call_id, at in self._written.items() if at > expired}
+
+    def replica_failed(self):
+        self._replica_down_until = self._clock() + self.retry_seconds
+
+    def primary_reason(self, videocall_ids: Iterable[int]) -> Optional[str]:
+        """주 DB에서 조회해야 하는 이유. None이면 복제본에서 조회한다."""
+        if not self.enabled:
+            return "no_replica"
+        now = self._clock()
+        if now < self._replica_down_until:
+            return "replica_down"
+        expired = now - self.sticky_seconds
+        if any(self._written.get(videocall_id, expired) > expired for videocall_id in videocall_ids):
+            return "recent_write"
+        return None
+
+
+class ReadSession:
+    """
+    get_read_db 의존성이 주는 읽기 세션 (복제본 / 주 DB 세션은 처음 쓸 때 연다)
+    run(query, videocall_ids, ...)은 요청한 통화의 키워드가 모두 복제본에 있으면 query(db, videocall_ids, ...)를 복제본에서 실행한다.
+    한 통화라도 복제본에 없거나(다른 워커에서 방금 저장하여 아직 복제되지 않았을 수 있음) 복제본 조회가 실패하면 주 DB에서 실행한다.
+    (키워드가 아직 없는 통화가 섞인 조회도 주 DB에서 실행된다)
+    """
+
+    def __init__(self, router: ReplicaRouter):
+        self.router = router
+        self._sessions: Dict[str, AsyncSession] = {}
+
+    def _session(self, target: str) -> AsyncSession:
+        if target not in self._sessions:
+            factory = self.router.replica_sessionmaker if target == "replica" else self.router.primary_sessionmaker
+            self._sessions[target] = factory()
+        return self._sessions[target]
+
+    async def _missing_on_replica(self, videocall_ids) -> bool:
+        """요청한 통화 중 복제본에 키워드가 하나도 없는 통화가 있는지"""
+        from app.database.models import Keyword
+
+        result = await self._session("replica").execute(
+            select(Keyword.videocallId).where(Keyword.videocallId.in_(videocall_ids)).distinct()
+        )
+        return bool(set(videocall_ids) - set(result.scalars().all()))
+
+    async def run(self, query, videocall_ids, *args, **kwargs):
+        reason = self.router.primary_reason(videocall_ids)
+        if reason is None:
+            try:
+                if await self._missing_on_replica(videocall_ids):
+                    reason = "replica_missing"
+                else:
+                    result = await query(self._session("replica"), videocall_ids, *args, **kwargs)
+                    db_read_routes.inc(target="replica", reason="replica")
+                    return result
+            except (SQLAlchemyError, OSError) as e:
+                logger.warning("복제본 조회 실패, 주 DB로 다시 조회 (%.0f초 동안 주 DB만 사용): %s",
+                               self.router.retry_seconds, getattr(e, "orig", None) or e)
+                self.router.replica_failed()
+                await self._sessions.pop("replica").close()
+                reason = "replica_error"
+        db_read_routes.inc(target="primary", reason=reason)
+        return await query(self._session("primary"), videocall_ids, *args, **kwargs)
+
+    async def close(self):
+        for session in self._sessions.values():
+            await session.close()
+        self._sessions.clear()
+
+
+replica_router = ReplicaRouter(
+    ReadSessionLocal,
+    AsyncSessionLocal,
+    sticky_seconds=settings.READ_DB_STICKY_SECONDS,
+    retry_seconds=settings.READ_DB_RETRY_SECONDS,
+)
+
+
+async def get_read_db():
+    """조회 전용 DB 세션 의존성 (READ_DB_URL이 있으면 복제본 우선, 복제 지연이 의심되면 주 DB)"""
+    read_db = ReadSession(replica_router)
+    try:
+        yield read_db
     finally:
-        db.close()
\ No newline at end of file
+        await read_db.close()
+
+
+def _create_missing_indexes(conn) -> List[str]:
+    """
+    이미 있는 테이블에 모델에 정의된 인덱스가 없으면 만든다. 만든 인덱스 이름 목록을 반환한다.
+    create_all은 테이블이 이미 있으면 인덱스도 건너뛰므로, 나중에 추가한 인덱스는 기존 DB에 생기지 않는다.
+    """
+    inspector = inspect(conn)
+    created = []
+    for table in Base.metadata.sorted_tables:
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            if index.name not in existing:
+                index.create(conn)
+                created.append(index.name)
+    return created
+
+
+async def create_schema() -> List[str]:
+    """
+    모든 테이블을 생성하고(이미 있는 테이블은 건너뜀), 기존 테이블에 빠진 인덱스를 만든다.
+    새로 만든 인덱스 이름 목록을 반환한다.
+    """
+    from app.database import models  # noqa: F401  (테이블 정의를 Base.metadata에 등록)
+
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        created = await conn.run_sync(_create_missing_indexes)
+    for name in created:
+        logger.info("인덱스를 만들었습니다: %s", name)
+    return created
+
+
+class DatabaseReadiness:
+    """
+    DB 연결 가능 여부
+    시작 시 DB가 잠시 내려가 있어도 앱은 뜨고, 연결될 때까지 백그라운드에서 재시도한다. (/health/ready로 확인)
+    """
+
+    def __init__(self, engine, check_timeout: float, retry_max_seconds: float):
+        self.engine = engine
+        self.check_timeout = check_timeout
+        self.retry_max_seconds = retry_max_seconds
+        self.ready = False
+        self.last_error: Optional[str] = None
+
+    async def check(self) -> bool:
+        try:
+            await asyncio.wait_for(self._ping(), self.check_timeout)
+        except Exception as e:
+            self.ready = False
+            self.last_error = str(e) or type(e).__name__
+            return False
+        self.ready = True
+        self.last_error = None
+        return True
+
+    async def _ping(self):
+        async with self.engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def wait_until_ready(self):
+        delay = 0.5
+        while not await self.check():
+            logger.warning("DB 연결 대기 중 (%.1f초 후 재시도): %s", delay, self.last_error)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.retry_max_seconds)
+        logger.info("DB 연결 확인 완료")
+
+
+db_readiness = DatabaseReadiness(
+    async_engine,
+    check_timeout=settings.DB_READY_CHECK_TIMEOUT_SECONDS,
+    retry_max_seconds=settings.DB_READY_RETRY_MAX_SECONDS,
+)
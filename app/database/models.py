@@ -1,12 +1,77 @@
-from sqlalchemy import Column, String, Integer, DateTime
+from sqlalchemy import Column, String, Integer, DateTime, Index, Text, LargeBinary
 from sqlalchemy.sql import func
 from app.database.database import Base
 
 class Keyword(Base):
     __tablename__ = "keywords"
+    __table_args__ = (
+        # 주제 추천 쿼리(videocallId 필터 + weight/date 정렬)용 복합 인덱스
+        Index("ix_keywords_videocall_weight_date", "videocallId", "weight", "date"),
+    )
 
     keywordId = Column(String(11), primary_key=True, index=True)
     keyword = Column(String(255), nullable=False)
     videocallId = Column(Integer, nullable=False)
     date = Column(DateTime(timezone=True), server_default=func.now())  # DB 자동 시간
     weight = Column(Integer, nullable=False, default=0)
+
+
+class KeywordArchive(Base):
+    """보관 기간이 지났거나 통화별 보관 개수를 넘어 keywords에서 옮긴 키워드 (python -m scripts.archive_keywords)"""
+    __tablename__ = "keywords_archive"
+
+    keywordId = Column(String(11), primary_key=True)
+    keyword = Column(String(255), nullable=False)
+    videocallId = Column(Integer, nullable=False, index=True)
+    date = Column(DateTime(timezone=True))
+    weight = Column(Integer, nullable=False, default=0)
+    reason = Column(String(16), nullable=False)  # age: 보관 기간 초과 / cap: 통화별 보관 개수 초과
+    archivedAt = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class MaintenanceCheckpoint(Base):
+    """나누어 실행하는 유지보수 작업의 진행 위치 (중단되면 다음 실행 때 이어서 처리)"""
+    __tablename__ = "maintenance_checkpoints"
+
+    jobName = Column(String(64), primary_key=True)
+    lastVideocallId = Column(Integer, nullable=True)  # 마지막으로 처리를 마친 통화 ID (None이면 처음부터)
+    processedCalls = Column(Integer, nullable=False, default=0)
+    archivedRows = Column(Integer, nullable=False, default=0)
+    startedAt = Column(DateTime, nullable=True)   # 이번 회차 시작 시각(UTC)
+    finishedAt = Column(DateTime, nullable=True)  # 마지막으로 끝까지 처리한 시각(UTC). None이면 진행 중(또는 중단됨)
+    updatedAt = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class KeywordVector(Base):
+    """키워드 문장의 문자 bigram 해시 벡터 (키워드 저장 시 같은 트랜잭션에서 계산, /ajenda 중복 제거용)"""
+    __tablename__ = "keyword_vectors"
+
+    keywordId = Column(String(11), primary_key=True)
+    videocallId = Column(Integer, nullable=False, index=True)
+    vector = Column(LargeBinary, nullable=False)  # 버킷별 bigram 개수 (uint8 x VECTOR_DIM 바이트)
+
+
+class LLMCacheEntry(Base):
+    """Gemini 응답 캐시 (영구 저장 계층)"""
+    __tablename__ = "llm_cache"
+
+    cacheKey = Column(String(64), primary_key=True)  # sha256(모델명 + 정규화된 프롬프트)
+    modelName = Column(String(100), nullable=False)
+    response = Column(Text, nullable=False)
+    createdAt = Column(DateTime(timezone=True), server_default=func.now())
+    expiresAt = Column(DateTime(timezone=True), nullable=False, index=True)
+
+
+class KeywordJob(Base):
+    """비동기 키워드 추출 작업 (워커가 죽어도 재시작 시 이어서 처리할 수 있도록 DB에 보관)"""
+    __tablename__ = "keyword_jobs"
+
+    jobId = Column(String(32), primary_key=True)
+    videocallId = Column(Integer, nullable=False)
+    text = Column(Text, nullable=False)
+    state = Column(String(16), nullable=False, default="queued", index=True)  # queued / running / succeeded / failed
+    attempts = Column(Integer, nullable=False, default=0)
+    leaseUntil = Column(DateTime, nullable=True)  # 처리 중인 워커의 점유 만료 시각(UTC). 지나면 다른 워커가 다시 가져감
+    error = Column(Text, nullable=True)
+    createdAt = Column(DateTime(timezone=True), server_default=func.now())
+    updatedAt = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,25 +1,71 @@
-from fastapi import FastAPI
-import google.generativeai as genai
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 
 # 내부 모듈
 from app.core.config import settings
-from app.database import Base, engine
-from app.routers import ajenda_p_api, keyword_api, letter_api, ajenda_api
+from app.core.llm_client import LLMRejected, configure_llm
+from app.core.metrics import MetricsMiddleware, monitor_event_loop
+from app.database import async_engine, create_schema, db_readiness, read_async_engine
+from app.routers import ajenda_p_api, keyword_api, letter_api, ajenda_api, health_api, metrics_api
+from app.services.keyword_jobs import keyword_job_queue
 
-# Gemini API 키 설정
-genai.configure(api_key=settings.GEMINI_API_KEY)
-
-# DB 테이블 생성
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Gemini API 키 설정
+    configure_llm()
+    if settings.DB_AUTO_CREATE_SCHEMA:
+        # 로컬 개발용: 테이블을 만든 뒤에 요청을 받는다. (운영은 python -m scripts.create_schema)
+        await db_readiness.wait_until_ready()
+        await create_schema()
+        db_waiter = None
+    else:
+        # DB가 잠시 내려가 있어도 서버는 시작하고, 연결은 백그라운드에서 재시도 (/health/ready로 확인)
+        db_waiter = asyncio.create_task(db_readiness.wait_until_ready())
+    # 비동기 키워드 추출 워커 시작 (DB에 남아 있던 작업도 이어서 처리)
+    await keyword_job_queue.start()
+    # 이벤트 루프 지연 측정
+    loop_monitor = asyncio.create_task(monitor_event_loop(settings.METRICS_EVENT_LOOP_INTERVAL_SECONDS)) if settings.METRICS_ENABLED else None
+    yield
+    # 종료: 처리 중인 요청은 uvicorn이 먼저 기다린 뒤 여기로 들어온다.
+    for task in (loop_monitor, db_waiter):
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+    await keyword_job_queue.stop(drain_seconds=settings.KEYWORD_JOB_DRAIN_SECONDS)
+    await async_engine.dispose()
+    if read_async_engine is not None:
+        await read_async_engine.dispose()
 
 # FastAPI 인스턴스
-app = FastAPI(title="GAMO AI Keyword API")
+app = FastAPI(title="GAMO AI Keyword API", lifespan=lifespan)
+
+# 라우트별 응답 시간 측정
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Gemini 호출 차단(서킷 브레이커 등) 시 공통 응답
+@app.exception_handler(LLMRejected)
+async def llm_rejected_handler(request: Request, exc: LLMRejected):
+    return JSONResponse(
+        status_code=exc.status_code,
+        headers={"Retry-After": str(exc.retry_after)},
+        content={
+            "status": exc.status_code,
+            "detail": str(exc)
+        }
+    )
 
 # 라우터 등록
 app.include_router(keyword_api.router, prefix="/api", tags=["Keywords"])
 app.include_router(letter_api.router, prefix="/api", tags=["Letters"])
 app.include_router(ajenda_api.router, prefix="/api", tags=["Agendas"])
 app.include_router(ajenda_p_api.router, prefix="/api", tags=["AgendasP"])
+app.include_router(health_api.router, tags=["Health"])
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_api.router, tags=["Metrics"])
 
 @app.get("/")
 def root():
@@ -1,26 +1,73 @@
 # --- 라이브러리 임포트 ---
-import math
-import json
+import asyncio
+import logging
 from typing import List
 from fastapi import APIRouter, HTTPException, Depends, status
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
-import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
 
 # --- 내부 모듈 임포트 ---
-from app.database import get_db
-from app.database.models import Keyword
+from app.database import ReadSession, get_read_db
+from app.database.crud import get_ranked_keywords
+from app.core.config import settings
+from app.core.llm_cache import cache_bypass
+from app.core.llm_client import RETRYABLE_ERRORS, LLMRejected
+from app.core.llm_output import AGENDA_OUTPUT, LLMOutputError, generate_structured
+from app.core.metrics import Counter
+from app.utils.topic_template import compose_topic_sentence
 from pydantic import BaseModel, Field
 
+logger = logging.getLogger(__name__)
+
 # --- 라우터 및 데이터 모델 정의 ---
 router = APIRouter()
 
+# 추천 문장을 만든 경로별 응답 수 (llm / fallback)
+topic_source_total = Counter("gamo_ajenda_topic_source_total", "/ajenda 추천 문장 생성 경로별 응답 수", ["source"])
+
+# 마감 시간을 넘겨 백그라운드에서 계속 진행 중인 Gemini 호출 (응답은 캐시에 저장됨)
+_background_calls = set()
+
 class RecommendRequest(BaseModel):
     videocall_ids: List[int] = Field(..., description="주제 추천의 기반이 될 과거 통화 ID 목록", example=[15352, 92737])
 
 class RecommendResponse(BaseModel):
     status: int
     recommended_topic: str
+    source: str = Field(..., description="llm: Gemini가 만든 문장 / fallback: 마감 시간 초과 또는 Gemini 호출 실패로 키워드를 문장 틀에 넣어 만든 문장")
+
+
+def _finish_background_call(task: asyncio.Task):
+    _background_calls.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("백그라운드 주제 추천 Gemini 호출 실패: %r", task.exception())
+
+
+async def generate_topic(prompt: str, topic_sentences: List[str], bypass: bool):
+    """
+    Gemini로 추천 문장을 만든다. AJENDA_LLM_DEADLINE_SECONDS 안에 응답이 없으면
+    선택된 키워드로 만든 문장을 대신 반환하고, Gemini 호출은 백그라운드에서 끝까지 진행하여 캐시를 채운다.
+    Gemini 호출이 차단(서킷 브레이커 / 허용량 초과)되거나 오류로 실패해도 키워드로 만든 문장을 반환한다. (DB 오류만 500)
+    (추천 문장, 생성 경로) 반환
+    """
+    deadline = settings.AJENDA_LLM_DEADLINE_SECONDS
+    try:
+        if deadline <= 0:
+            return await generate_structured(prompt, AGENDA_OUTPUT, bypass=bypass), "llm"
+
+        task = asyncio.ensure_future(generate_structured(prompt, AGENDA_OUTPUT, bypass=bypass))
+        try:
+            # shield: 마감 시간이 지나도 Gemini 호출 자체는 취소하지 않음
+            return await asyncio.wait_for(asyncio.shield(task), deadline), "llm"
+        except asyncio.TimeoutError:
+            if task.done():
+                raise  # Gemini 호출 자체의 타임아웃 (재시도 후에도 실패)
+            _background_calls.add(task)
+            task.add_done_callback(_finish_background_call)
+            return compose_topic_sentence(topic_sentences), "fallback"
+    except (LLMRejected, LLMOutputError, google_exceptions.GoogleAPIError, *RETRYABLE_ERRORS) as e:
+        logger.warning("주제 추천 Gemini 호출 실패, 키워드로 문장 생성: %r", e)
+        return compose_topic_sentence(topic_sentences), "fallback"
 
 # --- API 엔드포인트 구현 ---
 @router.post("/ajenda",
@@ -29,7 +76,8 @@ class RecommendResponse(BaseModel):
              status_code=status.HTTP_200_OK)
 async def recommend_topic(
     request: RecommendRequest,
-    db: Session = Depends(get_db)
+    db: ReadSession = Depends(get_read_db),
+    bypass: bool = Depends(cache_bypass)
 ):
     """
     과거 통화 ID 목록을 받아, 저장된 키워드에 우선순위를 적용하여
@@ -39,33 +87,17 @@ async def recommend_topic(
     if not request.videocall_ids:
         raise HTTPException(status_code=400, detail="videocall_ids 목록이 비어있습니다.")
 
-    # 2. DB에서 키워드 조회
-    all_keywords = db.query(Keyword).filter(
-        Keyword.videocallId.in_(request.videocall_ids)
-    ).all()
+    # 2. DB에서 우선순위 로직(가중치 상위 절반 -> 최신순)을 적용하여 최종 키워드 3개만 조회
+    #    (복제본이 있으면 복제본에서 조회하고, 방금 저장한 통화이거나 결과가 없으면 주 DB에서 조회)
+    final_keywords = await db.run(get_ranked_keywords, request.videocall_ids, limit=3)
 
-    if not all_keywords:
+    if not final_keywords:
         raise HTTPException(status_code=404, detail="제공된 ID에 해당하는 키워드를 찾을 수 없습니다.")
 
-    # 3. 우선순위 로직 적용
-    # 가중치(weight) 내림차순 정렬
-    sorted_by_weight = sorted(all_keywords, key=lambda kw: kw.weight, reverse=True)
-    
-    # 상위 절반 필터링 (소수점 올림)
-    n = len(sorted_by_weight)
-    top_half_count = math.ceil(n / 2)
-    top_half_keywords = sorted_by_weight[:top_half_count]
-
-    # 생성일시(date) 최신순 정렬 후 상위 3개 선택
-    sorted_by_date = sorted(top_half_keywords, key=lambda kw: kw.date, reverse=True)
-    final_keywords = sorted_by_date[:3]
-    
     # 최종 키워드 문장 리스트
     topic_sentences = [kw.keyword for kw in final_keywords]
 
-    # 4. Gemini 호출 설정
-    model = genai.GenerativeModel('models/gemini-flash-latest')
-    
+    # 3. Gemini 프롬프트 작성
     prompt = f"""
     [임무]
     당신은 입력된 [핵심 주제 목록]에 있는 각각의 사실들을 문맥 왜곡 없이 연결하여, **대화 주제를 제안하는 하나의 문장**을 만드는 '문장 결합기'입니다.
@@ -99,47 +131,15 @@ async def recommend_topic(
     """
     
     try:
-        response = await model.generate_content_async(prompt)
-        
-        # --- 응답 처리 로직 (JSON 파싱 및 서론 제거) ---
-        content = response.text.strip()
-        
-        # 마크다운 코드 블록 제거
-        if '```' in content:
-            parts = content.split('```')
-            for part in parts:
-                if part.strip().startswith('json'):
-                    content = part.strip()[4:]
-                    break
-                elif part.strip().startswith('{'):
-                    content = part.strip()
-                    break
-
-        # JSON 추출
-        start_index = content.find('{')
-        end_index = content.rfind('}')
-        
-        if start_index != -1 and end_index != -1:
-            json_str = content[start_index : end_index + 1]
-            data = json.loads(json_str)
-            final_topic = data.get('recommended_topic', '')
-        else:
-            # JSON 구조가 깨졌을 경우, 전체 텍스트를 반환하되 깔끔하게 정리
-            final_topic = content.replace('"', '').replace('{', '').replace('}', '').replace('recommended_topic:', '').strip()
+        final_topic, source = await generate_topic(prompt, topic_sentences, bypass)
+        topic_source_total.inc(source=source)
 
         return {
             "status": 200,
-            "recommended_topic": final_topic
+            "recommended_topic": final_topic,
+            "source": source
         }
 
-    except (json.JSONDecodeError, KeyError) as e:
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content={
-                "status": 500,
-                "detail": f"Gemini 응답 파싱 중 오류: {str(e)} - 원본: {response.text}"
-            }
-        )
     except Exception as e:
         return JSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
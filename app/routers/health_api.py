@@ -0,0 +1,41 @@
+# --- 라이브러리 임포트 ---
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+
+# --- 내부 모듈 임포트 ---
+from app.database import db_readiness
+
+# --- 라우터 정의 ---
+router = APIRouter()
+
+
+# --- API 엔드포인트 ---
+@router.get("/health/live",
+            summary="프로세스 생존 확인 (liveness)",
+            status_code=status.HTTP_200_OK)
+async def liveness():
+    """이벤트 루프가 요청을 처리할 수 있으면 200. DB 등 외부 의존성은 확인하지 않는다."""
+    return {
+        "status": 200,
+        "detail": "alive"
+    }
+
+
+@router.get("/health/ready",
+            summary="요청 처리 가능 여부 확인 (readiness)",
+            status_code=status.HTTP_200_OK,
+            responses={status.HTTP_503_SERVICE_UNAVAILABLE: {"description": "DB에 연결할 수 없음"}})
+async def readiness():
+    """DB에 연결할 수 있으면 200, 아니면 503. (로드밸런서/배포 스크립트가 트래픽을 보내기 전에 확인)"""
+    if not await db_readiness.check():
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={
+                "status": 503,
+                "detail": f"DB 연결 불가: {db_readiness.last_error}"
+            }
+        )
+    return {
+        "status": 200,
+        "detail": "ready"
+    }
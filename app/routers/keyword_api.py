@@ -1,94 +1,113 @@
-import json
-from fastapi import APIRouter, HTTPException, Depends, status
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, status
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
-import google.generativeai as genai
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # --- 내부 모듈 임포트 ---
-from app.database import get_db
-from app.database.models import Keyword
-from app.utils.id_utils import generate_keyword_id
+from app.database import get_async_db
+from app.core.config import settings
+from app.database.crud import store_keywords
+from app.core.llm_cache import cache_bypass
+from app.core.llm_client import LLMRejected
+from app.core.llm_output import LLMOutputError
+from app.services.keyword_jobs import JobQueueFull, keyword_job_queue
+from app.services.keyword_service import extract_keywords, extract_keywords_batch, keyword_rows
 from pydantic import BaseModel, Field
 
 # --- 라우터 및 요청 모델 정의 ---
 router = APIRouter()
 
+# keywords.videocallId 컬럼(MySQL INT)에 저장할 수 있는 최댓값
+MAX_CALL_ID = 2**31 - 1
+
 class ProcessCallRequest(BaseModel):
-    call_id: int = Field(..., description="고유한 통화 ID")
+    call_id: int = Field(..., ge=0, le=MAX_CALL_ID, description="고유한 통화 ID")
     text: str = Field(..., description="STT 변환된 통화 내용 전체")
     
 class KeywordProcessResponse(BaseModel):
     status: int
     videocallId: int
 
+class KeywordJobAcceptedResponse(BaseModel):
+    status: int
+    jobId: str
+    videocallId: int
+
+class KeywordBatchItemResult(BaseModel):
+    call_id: int
+    status: int = Field(..., description="200: 저장 성공 / 429, 503: Gemini 호출 차단(잠시 후 재시도) / 500: 추출 또는 저장 실패")
+    keywordCount: int = 0
+    detail: Optional[str] = None
+    retryAfter: Optional[int] = Field(None, description="429/503일 때 다시 시도하기까지 기다릴 시간(초)")
+
+class KeywordBatchResponse(BaseModel):
+    status: int
+    succeeded: int
+    failed: int
+    results: List[KeywordBatchItemResult]
+
+class KeywordJobResponse(BaseModel):
+    status: int
+    jobId: str
+    videocallId: int
+    state: str = Field(..., description="queued / running / succeeded / failed")
+    attempts: int
+    error: Optional[str] = None
+
 
 # --- API 엔드포인트 ---
 @router.post("/keyword",
              summary="통화 내용에서 키워드 추출 및 저장",
              response_model=KeywordProcessResponse,
-             status_code=status.HTTP_200_OK) # 성공 시 기본 상태 코드를 200으로 명시)
+             status_code=status.HTTP_200_OK, # 성공 시 기본 상태 코드를 200으로 명시)
+             responses={
+                 status.HTTP_202_ACCEPTED: {"model": KeywordJobAcceptedResponse, "description": "async_mode=true: 작업 등록됨"},
+                 status.HTTP_429_TOO_MANY_REQUESTS: {"description": "async_mode=true: 작업 대기열이 가득 참"},
+             })
 async def process_call_and_store_keywords(
     request: ProcessCallRequest,
-    db: Session = Depends(get_db)
+    async_mode: bool = Query(False, description="true면 작업만 등록하고 202와 jobId를 즉시 반환 (GET /keyword/jobs/{jobId}로 상태 조회)"),
+    db: AsyncSession = Depends(get_async_db),
+    bypass: bool = Depends(cache_bypass)
 ):
-    model = genai.GenerativeModel('models/gemini-flash-latest')
-    prompt = f"""
-    당신은 대화의 문맥을 완벽하게 이해하고 핵심 요점을 정리하는 AI 분석가입니다.
-    아래 [대화 내용]은 **STT(음성 인식)를 통해 텍스트로 변환된 결과물**입니다.
-    따라서 발음이 비슷하지만 문맥상 어색한 오타(예: '저렴하다' -> '절연하다', '방학' -> '반학')가 포함되어 있을 수 있습니다.
-
-    [규칙]
-    1.  **[중요] STT 오류 보정:** 텍스트를 있는 그대로 해석하지 말고, **전체 대화 흐름과 문맥을 파악하여 오타를 원래 의도된 단어로 내부적으로 교정한 뒤** 주제를 추출하세요.
-        - (예시: "갤럭시가 절연하잖아" -> "갤럭시가 저렴하잖아"로 해석하여 "갤럭시의 저렴한 가격"이라는 주제 추출)
-    
-    2.  **문맥 포함 요약:** 단일 키워드가 아닌, 문맥을 포함한 핵심 주제를 요약된 문장 형태로 추출하세요.
-        - (좋은 예시): "할머니가 된장국을 끓여준다고 약속함"
-        - (나쁜 예시): "된장국"
-
-    3.  대화의 길이에 따라 주제의 개수를 2개에서 5개 사이로 조절하세요.
-    4.  각 주제의 중요도를 대화의 핵심과 얼마나 관련이 깊은지에 따라 1(낮음)부터 5(매우 높음) 사이의 숫자로 평가하세요.
-    5.  결과는 반드시 아래 [출력 형식]과 동일한 JSON 형식으로만 반환해야 합니다.
-
-    [출력 형식]
-    [
-      {{"keyword": "보정된 내용을 바탕으로 추출된 주제 문장 1", "weight": 중요도_숫자}},
-      {{"keyword": "보정된 내용을 바탕으로 추출된 주제 문장 2", "weight": 중요도_숫자}}
-    ]
-
-    [대화 내용]
-    {request.text}
-    """
+    # 비동기 모드: 작업을 등록하고 바로 응답
+    if async_mode:
+        try:
+            job_id = await keyword_job_queue.submit(request.call_id, request.text)
+        except JobQueueFull as e:
+            return JSONResponse(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers={"Retry-After": str(e.retry_after)},
+                content={
+                    "status": 429,
+                    "detail": str(e)
+                }
+            )
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={
+                "status": 202,
+                "jobId": job_id,
+                "videocallId": request.call_id
+            }
+        )
+
     try:
-        response = await model.generate_content_async(prompt)
-        cleaned = response.text.strip().replace("```json", "").replace("```", "")
         # keywords_data =[{'keyword': '시장 축제', 'weight': 5}, ...] 형태의 리스트
-        keywords_data = json.loads(cleaned)
-
-        stored_items = []
-        for item in keywords_data:
-            # keywordId 중복 방지
-            while True:
-                new_id = generate_keyword_id()
-                if not db.query(Keyword).filter(Keyword.keywordId == new_id).first():
-                    break
-            
-            entry = Keyword(
-                keywordId=new_id,
-                keyword=item["keyword"],
-                weight=item["weight"],
-                videocallId=request.call_id
-            )
-            db.add(entry)
-            stored_items.append({"keyword": item["keyword"], "weight": item["weight"]})
+        keywords_data = await extract_keywords(request.text, bypass=bypass)
 
-        db.commit() # 모든 키워드를 한 번에 DB에 최종 저장
+        # 모든 키워드를 한 번의 INSERT로 DB에 최종 저장
+        await store_keywords(db, keyword_rows(request.call_id, keywords_data))
         # 성공 시, status가 포함된 JSON 본문 반환
         return {
             "status": 200,
             "videocallId": request.call_id
         }
-    except (json.JSONDecodeError, KeyError) as e:
-        db.rollback()
+    except LLMRejected:
+        # Gemini 호출 차단(서킷 브레이커 등)은 전역 예외 처리기가 503/429로 응답
+        raise
+    except LLMOutputError as e:
+        await db.rollback()
         # 실패 시, status가 포함된 JSONResponse 반환
         return JSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -98,7 +117,7 @@ async def process_call_and_store_keywords(
             }
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         # 실패 시, status가 포함된 JSONResponse 반환
         return JSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -108,3 +127,83 @@ async def process_call_and_store_keywords(
             }
         )
 
+
+@router.post("/keyword/batch",
+             summary="여러 통화의 키워드를 한 번에 추출 및 저장",
+             response_model=KeywordBatchResponse,
+             status_code=status.HTTP_200_OK)
+async def process_calls_batch(
+    requests: List[ProcessCallRequest],
+    db: AsyncSession = Depends(get_async_db),
+    bypass: bool = Depends(cache_bypass)
+):
+    """
+    통화 목록을 받아 Gemini 추출은 KEYWORD_BATCH_CONCURRENCY개씩 동시에 진행하고,
+    성공한 통화의 키워드는 한 번의 트랜잭션으로 저장하고, 저장이 실패하면 통화별로 나누어 다시 저장합니다.
+    일부 통화가 실패해도 전체 요청은 200이며, 통화별 결과(results)에 성공/실패가 표시됩니다.
+    """
+    if not requests:
+        raise HTTPException(status_code=400, detail="처리할 통화 목록이 비어있습니다.")
+    if len(requests) > settings.KEYWORD_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {settings.KEYWORD_BATCH_MAX_ITEMS}개의 통화만 처리할 수 있습니다.")
+
+    # 1. Gemini 추출 (동시 처리 수 제한)
+    extracted = await extract_keywords_batch(
+        [item.text for item in requests],
+        concurrency=settings.KEYWORD_BATCH_CONCURRENCY,
+        bypass=bypass,
+    )
+
+    results = []
+    rows_by_result = {}  # 성공한 통화 결과의 위치 -> 저장할 키워드 행
+    for item, (keywords_data, error) in zip(requests, extracted):
+        if isinstance(error, LLMRejected):
+            # Gemini 호출 차단(서킷 브레이커 / 허용량 초과)은 단건 API와 같은 상태 코드로, 다시 시도할 시간과 함께 알린다.
+            results.append({"call_id": item.call_id, "status": error.status_code,
+                            "detail": str(error), "retryAfter": error.retry_after})
+            continue
+        if error is not None:
+            results.append({"call_id": item.call_id, "status": 500, "detail": f"키워드 추출 중 오류 발생: {str(error)}"})
+            continue
+        rows_by_result[len(results)] = keyword_rows(item.call_id, keywords_data)
+        results.append({"call_id": item.call_id, "status": 200, "keywordCount": len(keywords_data)})
+
+    # 2. 성공한 통화의 키워드를 한 번에 저장
+    try:
+        await store_keywords(db, [row for rows in rows_by_result.values() for row in rows])
+    except Exception:
+        await db.rollback()
+        # 한 통화의 잘못된 값 때문에 전체가 실패하지 않도록, 통화별로 다시 저장하여 실패한 통화만 500으로 표시
+        for index, rows in rows_by_result.items():
+            try:
+                await store_keywords(db, rows)
+            except Exception as e:
+                await db.rollback()
+                results[index].update(status=500, keywordCount=0, detail=f"키워드 저장 중 오류 발생: {str(e)}")
+
+    succeeded = sum(1 for result in results if result["status"] == 200)
+    return {
+        "status": 200,
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "results": results
+    }
+
+
+@router.get("/keyword/jobs/{job_id}",
+            summary="비동기 키워드 추출 작업 상태 조회",
+            response_model=KeywordJobResponse,
+            status_code=status.HTTP_200_OK)
+async def get_keyword_job(job_id: str):
+    job = await keyword_job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="해당 작업을 찾을 수 없습니다.")
+
+    return {
+        "status": 200,
+        "jobId": job.jobId,
+        "videocallId": job.videocallId,
+        "state": job.state,
+        "attempts": job.attempts,
+        "error": job.error
+    }
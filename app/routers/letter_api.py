@@ -1,9 +1,15 @@
 # --- 라이브러리 임포트 ---
-# import time
-from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import JSONResponse
+import json
+from contextlib import aclosing
+from fastapi import APIRouter, HTTPException, Depends, Request, status
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
-import google.generativeai as genai
+
+# --- 내부 모듈 임포트 ---
+from app.core.config import settings
+from app.core.llm_cache import cache_bypass, generate_cached, llm_cache, make_cache_key
+from app.core.llm_client import LLMRejected, llm_client
+from app.utils.text_normalizer import prepare_stt_text
 
 # --- 라우터 및 데이터 모델 정의 ---
 router = APIRouter()
@@ -17,24 +23,9 @@ class LetterResponse(BaseModel):
     status: int
     corrected_text: str
 
-# --- API 엔드포인트 구현 ---
-# POST 방식으로 /correct-letter 주소로 요청이 들어왔을 때 아래 함수를 실행합니다.
-@router.post("/letter",
-             summary="음성 변환 텍스트를 자연스러운 편지글로 교정",
-             response_model=LetterResponse,
-             status_code=status.HTTP_200_OK)
-async def correct_letter_text(request: LetterRequest):
-    # 1. [전체 타이머 시작] 함수가 호출되자마자 시간 체크
-    # func_start_time = time.time()
-    """
-    STT로 변환된 원본 텍스트를 받아, Gemini를 이용해 자연스러운 편지글로 교정한 후,
-    원본 letter_id와 함께 교정된 텍스트를 반환합니다.
-    """
-    # Gemini 모델을 선택합니다.
-    model = genai.GenerativeModel('models/gemini-flash-latest')
-
-    # Gemini에게 작업을 지시하는 프롬프트를 작성합니다. (가장 중요한 부분)
-    prompt = f"""
+def build_letter_prompt(text: str) -> str:
+    """STT 원본 텍스트를 편지글로 교정하도록 지시하는 프롬프트 생성"""
+    return f"""
     당신은 문장을 자연스럽게 다듬는 전문 교정가입니다.
     아래 [원본 텍스트]는 음성을 텍스트로 변환한 초안입니다. 이 텍스트를 자연스러운 편지글로 다듬어 주세요.
 
@@ -48,57 +39,33 @@ async def correct_letter_text(request: LetterRequest):
     7.  교정된 최종 편지글 텍스트만 반환하고, 다른 설명은 절대 추가하지 마세요.
 
     [원본 텍스트]
-    {request.text}
+    {text}
     """
-    # try:
-    #     # 2. [Gemini 타이머 시작]
-    #     print("Gemini API 호출 시작...")
-    #     gemini_start = time.time() 
-
-    #     # 실제 Gemini에게 요청을 보내고 응답을 기다리는 부분
-    #     response = await model.generate_content_async(prompt)
-
-    #     # 3. [Gemini 타이머 종료]
-    #     gemini_end = time.time()
-    #     gemini_duration = gemini_end - gemini_start
-    #     print(f"Gemini API 응답 완료 소요 시간: {gemini_duration:.2f}초") 
-        
-    #     corrected_text = response.text.strip()
-
-    #     # 4. [전체 타이머 종료 및 결과 출력]
-    #     func_end_time = time.time()
-    #     total_duration = func_end_time - func_start_time
-    #     logic_duration = total_duration - gemini_duration # 전체 시간 - Gemini 시간 = 내 로직 시간
-
-    #     print(f"────────────────────────────────────────")
-    #     print(f"전체 수행 시간: {total_duration:.2f}초")
-    #     print(f"Gemini 처리 시간: {gemini_duration:.2f}초")
-    #     print(f"내 로직(순수 서버) 처리 시간: {logic_duration:.2f}초")
-    #     print(f"────────────────────────────────────────")
-
-    #     # 성공 시, status가 포함된 JSON 본문을 반환합니다.
-    #     return {
-    #         "status": 200,
-    #         "corrected_text": corrected_text
-    #     }
-    # except Exception as e:
-    #     # 실패 시, status가 포함된 JSON 본문을 직접 만들어 반환합니다.
-    #     return JSONResponse(
-    #         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-    #         content={
-    #             "status": 500,
-    #             "detail": f"편지 교정 중 오류 발생: {str(e)}"
-    #         }
-    #     )
+
+# --- API 엔드포인트 구현 ---
+# POST 방식으로 /correct-letter 주소로 요청이 들어왔을 때 아래 함수를 실행합니다.
+@router.post("/letter",
+             summary="음성 변환 텍스트를 자연스러운 편지글로 교정",
+             response_model=LetterResponse,
+             status_code=status.HTTP_200_OK)
+async def correct_letter_text(request: LetterRequest, bypass: bool = Depends(cache_bypass)):
+    """
+    STT로 변환된 원본 텍스트를 받아, Gemini를 이용해 자연스러운 편지글로 교정한 후,
+    원본 letter_id와 함께 교정된 텍스트를 반환합니다.
+    """
+    # Gemini에게 작업을 지시하는 프롬프트를 작성합니다. (가장 중요한 부분)
+    prompt = build_letter_prompt(prepare_stt_text(request.text, endpoint="letter"))
     try:
-        response = await model.generate_content_async(prompt)
-        corrected_text = response.text.strip()
+        corrected_text = await generate_cached(prompt, endpoint="letter", parse=str.strip, bypass=bypass)
 
         # 성공 시, status가 포함된 JSON 본문을 반환합니다.
         return {
             "status": 200,
             "corrected_text": corrected_text
         }
+    except LLMRejected:
+        # Gemini 호출 차단(서킷 브레이커 등)은 전역 예외 처리기가 503/429로 응답
+        raise
     except Exception as e:
         # 실패 시, status가 포함된 JSON 본문을 직접 만들어 반환합니다.
         return JSONResponse(
@@ -109,4 +76,68 @@ async def correct_letter_text(request: LetterRequest):
             }
         )
 
-    
+
+# --- 스트리밍(SSE) 교정 ---
+def sse_event(event: str, data: dict) -> str:
+    """Server-Sent Events 형식의 메시지 한 건"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def letter_event_stream(http_request: Request, prompt: str, bypass: bool):
+    """
+    교정 결과를 생성되는 대로 'chunk' 이벤트로 전달하고, 마지막에 'done' 이벤트로 전체 텍스트를 보낸다.
+    클라이언트 연결이 끊기면 Gemini 스트림을 취소하여 더 이상 토큰을 생성하지 않도록 한다.
+    """
+    key = make_cache_key(llm_client.model_name, prompt)
+    if settings.LLM_CACHE_ENABLED and not bypass:
+        cached = await llm_cache.get(key)
+        if cached is not None:
+            corrected_text = cached.strip()
+            yield sse_event("chunk", {"text": corrected_text})
+            yield sse_event("done", {"status": 200, "corrected_text": corrected_text})
+            return
+
+    chunks = []
+    try:
+        # 연결이 끊기면 스트림을 바로 닫아 Gemini 스트림을 취소한다.
+        async with aclosing(llm_client.stream(prompt, endpoint="letter")) as stream:
+            async for text in stream:
+                if await http_request.is_disconnected():
+                    return
+                chunks.append(text)
+                yield sse_event("chunk", {"text": text})
+
+        full_text = "".join(chunks)
+        if settings.LLM_CACHE_ENABLED:
+            await llm_cache.set(key, llm_client.model_name, full_text)
+        yield sse_event("done", {"status": 200, "corrected_text": full_text.strip()})
+    except LLMRejected as e:
+        yield sse_event("error", {"status": e.status_code, "detail": str(e)})
+    except Exception as e:
+        yield sse_event("error", {"status": 500, "detail": f"편지 교정 중 오류 발생: {str(e)}"})
+
+
+@router.post("/letter/stream",
+             summary="편지 교정 결과를 SSE(text/event-stream)로 스트리밍",
+             response_class=StreamingResponse,
+             status_code=status.HTTP_200_OK)
+async def correct_letter_text_stream(
+    request: LetterRequest,
+    http_request: Request,
+    bypass: bool = Depends(cache_bypass)
+):
+    """
+    /letter와 같은 교정을 수행하되, Gemini가 생성하는 대로 부분 결과를 전송합니다.
+    - event: chunk  -> {"text": 부분 텍스트}
+    - event: done   -> {"status": 200, "corrected_text": 전체 교정 텍스트}
+    - event: error  -> {"status": 500, "detail": 오류 내용}
+    """
+    prompt = build_letter_prompt(prepare_stt_text(request.text, endpoint="letter"))
+    return StreamingResponse(
+        letter_event_stream(http_request, prompt, bypass),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Nginx 프록시 버퍼링 비활성화 (청크를 바로 전달)
+        },
+    )
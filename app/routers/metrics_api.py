@@ -0,0 +1,69 @@
+# --- 라이브러리 임포트 ---
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+# --- 내부 모듈 임포트 ---
+from app.core.admission import LANES
+from app.core.llm_cache import llm_cache, llm_singleflight
+from app.core.llm_client import CircuitBreaker, llm_client
+from app.core.llm_output import parse_stats
+from app.core.metrics import CallbackMetric, registry
+from app.database import pool_stats
+
+# --- 라우터 정의 ---
+router = APIRouter()
+
+# --- 다른 모듈이 세고 있는 통계를 지표로 등록 ---
+CallbackMetric(
+    "gamo_llm_cache_entries", "메모리 캐시에 들어 있는 응답 수",
+    lambda: [({}, llm_cache.stats()["entries"])],
+)
+CallbackMetric(
+    "gamo_llm_cache_lookups_total", "LLM 응답 캐시 조회 결과별 횟수",
+    lambda: [({"result": result}, llm_cache.stats()[result]) for result in ("hits", "persistent_hits", "misses", "bypasses")],
+    type="counter",
+)
+CallbackMetric(
+    "gamo_llm_singleflight_in_flight", "진행 중인 (합류 가능한) LLM 호출 수",
+    lambda: [({}, llm_singleflight.stats()["in_flight"])],
+)
+CallbackMetric(
+    "gamo_llm_singleflight_calls_total", "singleflight 실행/합류 횟수",
+    lambda: [({"kind": kind}, llm_singleflight.stats()[kind]) for kind in ("executed", "coalesced")],
+    type="counter",
+)
+CallbackMetric(
+    "gamo_llm_circuit_breaker_state", "서킷 브레이커 상태 (현재 상태만 1)",
+    lambda: [({"state": state}, int(llm_client.breaker.state == state))
+             for state in (CircuitBreaker.CLOSED, CircuitBreaker.OPEN, CircuitBreaker.HALF_OPEN)],
+)
+CallbackMetric(
+    "gamo_llm_circuit_breaker_failures", "서킷 브레이커가 센 연속 실패 수",
+    lambda: [({}, llm_client.breaker.failures)],
+)
+CallbackMetric(
+    "gamo_llm_admission_queued", "호출 허용을 기다리는 LLM 요청 수 (레인별)",
+    lambda: [({"lane": lane}, llm_client.admission.queued(lane)) for lane in LANES] if llm_client.admission else [],
+)
+CallbackMetric(
+    "gamo_db_pool_connections", "엔진별 커넥션 풀 상태 (size: 유지 연결 수, checked_out: 사용 중, checked_in: 대기 중, overflow: 초과 연결)",
+    lambda: [({"engine": engine, "state": state}, value)
+             for engine, stats in pool_stats().items()
+             for state, value in stats.items()],
+)
+CallbackMetric(
+    "gamo_llm_output_parse_total", "구조화 응답 파싱 결과별 횟수 (parsed / repaired / fallback / failed)",
+    lambda: [({"endpoint": endpoint, "outcome": outcome}, count)
+             for endpoint, counts in parse_stats.stats().items()
+             for outcome, count in counts.items() if outcome != "failure_rate"],
+    type="counter",
+)
+
+
+# --- API 엔드포인트 ---
+@router.get("/metrics",
+            summary="Prometheus 수집용 지표",
+            response_class=PlainTextResponse,
+            include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
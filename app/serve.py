@@ -0,0 +1,47 @@
+"""
+운영 서버 실행 (멀티 워커)
+
+실행: python -m app.serve
+- 워커 수: APP_WORKERS (각 워커는 별도 프로세스이므로 LLM 응답 캐시 / 지표(/metrics)는 워커마다 따로 집계됨)
+- 종료: SIGTERM을 받으면 새 연결을 받지 않고, 처리 중인 요청을 SHUTDOWN_GRACE_SECONDS까지 기다린 뒤
+  lifespan 종료 단계(비동기 작업 정리, DB 연결 해제)를 실행한다.
+- python -m app.serve --stop-timeout: 정상 종료에 필요한 최대 시간(초)을 출력한다. (배포 스크립트가 강제 종료 전에 기다릴 시간)
+- python -m app.serve --port: 서버가 받을 포트(APP_PORT)를 출력한다. (배포 스크립트의 상태 확인용)
+"""
+import argparse
+
+import uvicorn
+
+from app.core.config import settings
+
+# 종료 단계의 DB 연결 해제 / 프로세스 정리 여유 시간(초)
+STOP_MARGIN_SECONDS = 15
+
+
+def stop_timeout_seconds() -> int:
+    """SIGTERM 후 프로세스가 끝날 때까지의 최대 시간: 요청 처리 대기 + 비동기 작업 대기 + 여유 시간"""
+    return settings.SHUTDOWN_GRACE_SECONDS + settings.KEYWORD_JOB_DRAIN_SECONDS + STOP_MARGIN_SECONDS
+
+
+def main():
+    uvicorn.run(
+        "app.main:app",
+        host=settings.APP_HOST,
+        port=settings.APP_PORT,
+        workers=settings.APP_WORKERS,
+        timeout_graceful_shutdown=settings.SHUTDOWN_GRACE_SECONDS,
+        proxy_headers=True,  # Nginx 뒤에서 X-Forwarded-* 헤더 사용
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stop-timeout", action="store_true", help="정상 종료에 필요한 최대 시간(초)만 출력")
+    parser.add_argument("--port", action="store_true", help="서버 포트(APP_PORT)만 출력")
+    args = parser.parse_args()
+    if args.stop_timeout:
+        print(stop_timeout_seconds())
+    elif args.port:
+        print(settings.APP_PORT)
+    else:
+        main()
@@ -0,0 +1,274 @@
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import and_, delete, func, or_, select, update
+
+# --- 내부 모듈 임포트 ---
+from app.core.config import settings
+from app.core.llm_client import LLMRejected
+from app.database import AsyncSessionLocal, database_now
+from app.database.crud import store_keywords
+from app.database.models import KeywordJob
+from app.services.keyword_service import extract_keywords, keyword_rows
+
+logger = logging.getLogger(__name__)
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class JobQueueFull(Exception):
+    """대기열이 가득 차서 작업을 받을 수 없음 (429 응답)"""
+
+    def __init__(self, retry_after: int):
+        super().__init__("키워드 추출 대기열이 가득 찼습니다.")
+        self.retry_after = retry_after
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class KeywordJobQueue:
+    """
+    비동기 키워드 추출 작업 큐
+    - 작업은 keyword_jobs 테이블에 먼저 저장한 뒤 메모리 대기열(asyncio.Queue)에 넣는다.
+    - 워커는 조건부 UPDATE로 작업을 점유(lease)한 뒤 처리하므로 여러 프로세스가 같은 작업을 중복 처리하지 않는다.
+    - 점유 시간이 지난 작업(워커 중단)과 대기열에 들어가지 못한 작업은 주기적으로 DB에서 다시 불러온다.
+    """
+
+    def __init__(self, workers: int, max_size: int, max_attempts: int,
+                 lease_seconds: int, poll_seconds: int):
+        self.workers = workers
+        self.max_size = max_size
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+        self._busy = set()      # 작업을 처리 중인 워커 Task
+        self._closing = False
+        self._enqueued = set()  # 이 프로세스의 대기열에 들어 있는 jobId
+        self._reserved = 0      # DB 저장 중이라 아직 대기열에 들어가지 않은 자리
+
+    # --- 수명 주기 ---
+    async def start(self):
+        self._closing = False
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._sweeper()))
+
+    async def stop(self, drain_seconds: float = 0):
+        """
+        새 작업을 받지 않고, 처리 중인 작업은 drain_seconds까지 끝나기를 기다린다.
+        시간 안에 끝나지 않은 작업은 취소되어 대기 상태로 돌아가고, 대기열에 남은 작업은 DB에 있으므로
+        다음에 시작하는 프로세스가 이어서 처리한다.
+        """
+        self._closing = True
+        busy = [task for task in self._tasks if task in self._busy]
+        for task in self._tasks:
+            if task not in self._busy:
+                task.cancel()
+        if busy and drain_seconds > 0:
+            await asyncio.wait(busy, timeout=drain_seconds)
+        for task in busy:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._busy.clear()
+        self._enqueued.clear()
+
+    # --- 작업 등록 / 조회 ---
+    def free_slots(self) -> int:
+        return self.max_size - self._queue.qsize() - self._reserved
+
+    async def submit(self, videocall_id: int, text: str) -> str:
+        if self._queue is None or self._closing or self.free_slots() <= 0:
+            raise JobQueueFull(retry_after=self._retry_after())
+
+        self._reserved += 1
+        try:
+            job_id = uuid.uuid4().hex
+            async with AsyncSessionLocal() as db:
+                db.add(KeywordJob(jobId=job_id, videocallId=videocall_id, text=text, state=QUEUED))
+                await db.commit()
+            self._enqueue(job_id)
+            return job_id
+        finally:
+            self._reserved -= 1
+
+    async def get(self, job_id: str) -> Optional[KeywordJob]:
+        async with AsyncSessionLocal() as db:
+            return await db.get(KeywordJob, job_id)
+
+    def _retry_after(self) -> int:
+        # 대기 중인 작업이 워커 수만큼씩 처리된다고 보고 대략적인 대기 시간(초)을 안내
+        pending = self._queue.qsize() if self._queue is not None else self.max_size
+        return max(1, pending // max(1, self.workers))
+
+    def _enqueue(self, job_id: str):
+        self._queue.put_nowait(job_id)
+        self._enqueued.add(job_id)
+
+    # --- 워커 ---
+    async def _worker(self):
+        task = asyncio.current_task()
+        while not self._closing:
+            job_id = await self._queue.get()
+            self._enqueued.discard(job_id)
+            self._busy.add(task)
+            try:
+                await self._process(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("키워드 추출 작업 처리 중 예기치 않은 오류: %s", job_id)
+            finally:
+                self._busy.discard(task)
+                self._queue.task_done()
+
+    def _claimable(self, now: datetime):
+        return or_(
+            KeywordJob.state == QUEUED,
+            and_(KeywordJob.state == RUNNING, KeywordJob.leaseUntil < now),
+        )
+
+    async def _claim(self, job_id: str) -> Optional[KeywordJob]:
+        """작업을 점유한다. 다른 워커가 이미 점유했거나 끝난 작업이면 None"""
+        now = _utcnow()
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(KeywordJob)
+                .where(KeywordJob.jobId == job_id, self._claimable(now))
+                .values(
+                    state=RUNNING,
+                    attempts=KeywordJob.attempts + 1,
+                    leaseUntil=now + timedelta(seconds=self.lease_seconds),
+                )
+            )
+            await db.commit()
+            if result.rowcount != 1:
+                return None
+            return await db.get(KeywordJob, job_id)
+
+    async def _process(self, job_id: str):
+        job = await self._claim(job_id)
+        if job is None:
+            return
+        if job.attempts > self.max_attempts:
+            await self._finish(job_id, FAILED, "최대 재시도 횟수를 초과했습니다.")
+            return
+
+        try:
+            keywords_data = await extract_keywords(job.text)
+
+            async def mark_succeeded(db):
+                await db.execute(
+                    update(KeywordJob)
+                    .where(KeywordJob.jobId == job_id)
+                    .values(state=SUCCEEDED, error=None, leaseUntil=None)
+                )
+
+            # 키워드 저장과 작업 완료 표시를 한 트랜잭션으로 처리 (중복 저장 방지)
+            async with AsyncSessionLocal() as db:
+                await store_keywords(db, keyword_rows(job.videocallId, keywords_data), before_commit=mark_succeeded)
+        except asyncio.CancelledError:
+            # 서버 종료 등으로 중단되면 다른 워커가 바로 이어받을 수 있도록 대기 상태로 되돌린다.
+            await asyncio.shield(self._finish(job_id, QUEUED, None, refund_attempt=True))
+            raise
+        except LLMRejected as e:
+            # Gemini 호출이 일시적으로 차단된 경우 실패로 끝내지 않고 다음 복구 주기에 다시 시도
+            # (작업 자체의 실패가 아니므로 재시도 횟수에 넣지 않음)
+            await self._finish(job_id, QUEUED, str(e), refund_attempt=True)
+        except Exception as e:
+            await self._finish(job_id, FAILED, str(e))
+
+    async def _finish(self, job_id: str, state: str, error: Optional[str], refund_attempt: bool = False):
+        """
+        작업 상태를 바꾸고 점유를 푼다.
+        refund_attempt: _claim에서 늘린 시도 횟수를 되돌린다. (허용량 초과 / 서버 종료처럼 작업 탓이 아닌 중단)
+        """
+        values = {"state": state, "error": error, "leaseUntil": None}
+        if refund_attempt:
+            values["attempts"] = KeywordJob.attempts - 1
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(KeywordJob).where(KeywordJob.jobId == job_id).values(**values))
+            await db.commit()
+
+    # --- 정리 ---
+    async def purge_finished(self, retention_hours: int, batch_size: int = 1000, pause_seconds: float = 0.0,
+                             dry_run: bool = False) -> int:
+        """
+        끝난 지(updatedAt) retention_hours가 지난 성공/실패 작업을 batch_size개씩 나누어 지운다. 지운 행 수를 반환한다.
+        작업 행에는 통화 내용 전체가 들어 있으므로 유지보수 스크립트에서 주기적으로 실행한다. (대기/처리 중인 작업은 지우지 않음)
+        dry_run: 지울 행 수만 센다.
+        updatedAt은 DB의 NOW()로 채우므로 기준 시각도 DB 시각으로 계산한다.
+        """
+        async with AsyncSessionLocal() as db:
+            cutoff = await database_now(db) - timedelta(hours=retention_hours)
+        finished = and_(KeywordJob.state.in_([SUCCEEDED, FAILED]), KeywordJob.updatedAt < cutoff)
+        if dry_run:
+            async with AsyncSessionLocal() as db:
+                return (await db.execute(select(func.count()).select_from(KeywordJob).where(finished))).scalar()
+
+        purged = 0
+        while True:
+            async with AsyncSessionLocal() as db:
+                job_ids = (await db.execute(select(KeywordJob.jobId).where(finished).limit(batch_size))).scalars().all()
+                if not job_ids:
+                    return purged
+                await db.execute(delete(KeywordJob).where(KeywordJob.jobId.in_(job_ids)))
+                await db.commit()
+            purged += len(job_ids)
+            if pause_seconds:
+                await asyncio.sleep(pause_seconds)
+
+    # --- 복구 ---
+    async def _sweeper(self):
+        """DB에 남아 있는 대기 작업과 점유가 만료된 작업을 빈 자리만큼 대기열에 다시 넣는다."""
+        while True:
+            try:
+                await self.recover()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("키워드 추출 작업 복구 실패: %s", e)
+            await asyncio.sleep(self.poll_seconds)
+
+    async def recover(self) -> int:
+        free = self.free_slots()
+        if free <= 0:
+            return 0
+        async with AsyncSessionLocal() as db:
+            stmt = (
+                select(KeywordJob.jobId)
+                .where(self._claimable(_utcnow()))
+                .order_by(KeywordJob.createdAt)
+                .limit(free + len(self._enqueued))
+            )
+            job_ids = (await db.execute(stmt)).scalars().all()
+
+        recovered = 0
+        for job_id in job_ids:
+            if job_id in self._enqueued or self.free_slots() <= 0:
+                continue
+            self._enqueue(job_id)
+            recovered += 1
+        if recovered:
+            logger.info("키워드 추출 작업 %d건을 대기열에 다시 넣었습니다.", recovered)
+        return recovered
+
+
+keyword_job_queue = KeywordJobQueue(
+    workers=settings.KEYWORD_JOB_WORKERS,
+    max_size=settings.KEYWORD_JOB_QUEUE_SIZE,
+    max_attempts=settings.KEYWORD_JOB_MAX_ATTEMPTS,
+    lease_seconds=settings.KEYWORD_JOB_LEASE_SECONDS,
+    poll_seconds=settings.KEYWORD_JOB_POLL_SECONDS,
+)
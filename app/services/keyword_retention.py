@@ -0,0 +1,207 @@
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import bindparam, delete, func, insert, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+# --- 내부 모듈 임포트 ---
+from app.core.config import settings
+from app.database import database_now, replica_router
+from app.database.models import Keyword, KeywordArchive, KeywordVector, MaintenanceCheckpoint
+
+logger = logging.getLogger(__name__)
+
+JOB_NAME = "archive_keywords"
+
+# 크기 보고서에 포함할 테이블
+REPORT_TABLES = ("keywords", "keywords_archive", "keyword_vectors", "llm_cache", "keyword_jobs")
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class RetentionPolicy(NamedTuple):
+    """
+    keywords 보관 정책
+    - max_age_days보다 오래된 키워드는 옮긴다. (0이면 기간 제한 없음)
+    - 통화별로 가중치 순(동점은 keywordId 오름차순) 상위 per_call_cap개만 남긴다. (0이면 제한 없음)
+      /ajenda는 조회한 통화들의 전체 키워드 수로 상위 절반을 자르므로, 행을 줄이면 per_call_cap 값과 관계없이 순위 결과가 바뀔 수 있다.
+    """
+    max_age_days: int
+    per_call_cap: int
+
+    @classmethod
+    def from_settings(cls) -> "RetentionPolicy":
+        return cls(settings.KEYWORD_RETENTION_DAYS, settings.KEYWORD_RETENTION_PER_CALL)
+
+    def cutoff(self, now: datetime) -> Optional[datetime]:
+        return now - timedelta(days=self.max_age_days) if self.max_age_days > 0 else None
+
+    def expired(self, call_rows, cutoff: Optional[datetime]) -> List[tuple]:
+        """한 통화의 키워드(가중치 내림차순, 동점은 keywordId 오름차순) 중 옮길 행과 이유 [(row, "age" | "cap"), ...]"""
+        result = []
+        kept = 0
+        for row in call_rows:
+            if cutoff is not None and row.date is not None and row.date < cutoff:
+                result.append((row, "age"))
+            elif self.per_call_cap and kept >= self.per_call_cap:
+                result.append((row, "cap"))
+            else:
+                kept += 1
+        return result
+
+
+async def _load_checkpoint(db: AsyncSession, now: datetime) -> MaintenanceCheckpoint:
+    """이전 실행이 중단되었으면 그 위치를, 끝까지 처리했으면(또는 처음이면) 새 회차를 시작하는 체크포인트를 반환한다."""
+    checkpoint = await db.get(MaintenanceCheckpoint, JOB_NAME)
+    if checkpoint is None:
+        checkpoint = MaintenanceCheckpoint(jobName=JOB_NAME)
+        db.add(checkpoint)
+    if checkpoint.startedAt is None or checkpoint.finishedAt is not None:
+        checkpoint.lastVideocallId = None
+        checkpoint.processedCalls = 0
+        checkpoint.archivedRows = 0
+        checkpoint.startedAt = now
+        checkpoint.finishedAt = None
+    else:
+        logger.info("중단된 보관 작업을 이어서 처리합니다. (통화 ID %s 다음부터)", checkpoint.lastVideocallId)
+    await db.commit()
+    return checkpoint
+
+
+async def archive_keywords(db: AsyncSession, policy: RetentionPolicy, batch_calls: int = 500,
+                           pause_seconds: float = 0.0, max_batches: Optional[int] = None,
+                           dry_run: bool = False, now: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    보관 정책을 벗어난 keywords 행을 keywords_archive로 옮긴다.
+    통화 ID 순서로 batch_calls개씩 나누어 배치마다 한 트랜잭션으로 처리하므로(짧은 잠금), 실행 중에도 API 요청을 받을 수 있다.
+    처리 위치를 같은 트랜잭션에서 maintenance_checkpoints에 기록하여, 중단되면 다음 실행이 이어서 처리한다.
+    옮긴 키워드의 문장 벡터도 함께 지운다.
+    pause_seconds: 배치 사이 대기 시간 (주 DB 부하 / 복제 지연 완화)
+    max_batches: 이번 실행에서 처리할 최대 배치 수 (유지보수 시간을 나누어 쓸 때, 나머지는 다음 실행에서 이어서)
+    dry_run: 옮길 행만 세고 아무것도 바꾸지 않는다. (체크포인트도 사용하지 않음)
+    now: 보관 기간을 계산할 기준 시각 (기본: DB 서버 시각)
+    """
+    # keywords.date는 DB의 NOW()로 채우므로 보관 기간도 DB 시각 기준으로 자른다.
+    cutoff = policy.cutoff(now or await database_now(db))
+    checkpoint = None if dry_run else await _load_checkpoint(db, _utcnow())
+    last_id = checkpoint.lastVideocallId if checkpoint is not None else None
+    stats = {"batches": 0, "calls": 0, "archived": 0, "age": 0, "cap": 0, "finished": False}
+
+    while max_batches is None or stats["batches"] < max_batches:
+        stmt = select(Keyword.videocallId).distinct().order_by(Keyword.videocallId).limit(batch_calls)
+        if last_id is not None:
+            stmt = stmt.where(Keyword.videocallId > last_id)
+        videocall_ids = (await db.execute(stmt)).scalars().all()
+        if not videocall_ids:
+            stats["finished"] = True
+            if checkpoint is not None:
+                checkpoint.lastVideocallId = None
+                checkpoint.finishedAt = _utcnow()
+                await db.commit()
+            break
+
+        result = await db.execute(
+            select(Keyword.keywordId, Keyword.keyword, Keyword.videocallId, Keyword.date, Keyword.weight)
+            .where(Keyword.videocallId.in_(videocall_ids))
+            .order_by(Keyword.videocallId, Keyword.weight.desc(), Keyword.keywordId)
+        )
+        rows_by_call = defaultdict(list)
+        for row in result.all():
+            rows_by_call[row.videocallId].append(row)
+        expired = [item for call_rows in rows_by_call.values() for item in policy.expired(call_rows, cutoff)]
+        affected_ids = {row.videocallId for row, _ in expired}
+
+        if expired and not dry_run:
+            keyword_ids = [row.keywordId for row, _ in expired]
+            await db.execute(insert(KeywordArchive).values([
+                {"keywordId": row.keywordId, "keyword": row.keyword, "videocallId": row.videocallId,
+                 "date": row.date, "weight": row.weight, "reason": reason}
+                for row, reason in expired
+            ]))
+            await db.execute(delete(Keyword).where(Keyword.keywordId.in_(keyword_ids)))
+            await db.execute(delete(KeywordVector).where(KeywordVector.keywordId.in_(keyword_ids)))
+        if checkpoint is not None:
+            checkpoint.lastVideocallId = videocall_ids[-1]
+            checkpoint.processedCalls += len(videocall_ids)
+            checkpoint.archivedRows += len(expired)
+            await db.commit()
+            # 복제본에 아직 옮기기 전 키워드가 남아 있을 수 있으므로 잠시 주 DB에서 조회하도록
+            replica_router.mark_written(affected_ids)
+        else:
+            await db.rollback()  # dry-run: 배치마다 읽기 트랜잭션을 끝내 잠금/스냅샷을 오래 잡지 않음
+
+        stats["batches"] += 1
+        stats["calls"] += len(videocall_ids)
+        stats["archived"] += len(expired)
+        for _, reason in expired:
+            stats[reason] += 1
+        last_id = videocall_ids[-1]
+        if pause_seconds:
+            await asyncio.sleep(pause_seconds)
+    return stats
+
+
+async def table_size_report(db: AsyncSession, tables: Iterable[str] = REPORT_TABLES) -> List[dict]:
+    """
+    테이블별 행 수와 데이터 / 인덱스 크기(바이트)
+    MySQL은 information_schema.TABLES (InnoDB의 행 수는 추정치), SQLite는 dbstat 가상 테이블을 사용한다.
+    dbstat이 없는 SQLite 빌드에서는 행 수만 센다. (크기는 None)
+    """
+    tables = list(tables)
+    if db.get_bind().dialect.name == "mysql":
+        result = await db.execute(
+            text(
+                "SELECT TABLE_NAME, TABLE_ROWS, DATA_LENGTH, INDEX_LENGTH FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME IN :names"
+            ).bindparams(bindparam("names", expanding=True)),
+            {"names": tables},
+        )
+        found = {row[0]: row for row in result.all()}
+        return [
+            {"table": name, "rows": found[name][1], "data_bytes": found[name][2], "index_bytes": found[name][3]}
+            for name in tables if name in found
+        ]
+
+    existing = set((await db.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'"))).scalars().all())
+    index_owner = dict((await db.execute(
+        text("SELECT name, tbl_name FROM sqlite_master WHERE type = 'index'")
+    )).all())
+    try:
+        sizes = dict((await db.execute(text("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name"))).all())
+    except OperationalError:
+        sizes = None
+
+    report = []
+    for name in tables:
+        if name not in existing:
+            continue
+        rows = (await db.execute(select(func.count()).select_from(text(f'"{name}"')))).scalar()
+        report.append({
+            "table": name,
+            "rows": rows,
+            "data_bytes": sizes.get(name, 0) if sizes is not None else None,
+            "index_bytes": sum(size for index, size in sizes.items() if index_owner.get(index) == name)
+            if sizes is not None else None,
+        })
+    return report
+
+
+async def reclaim_space(engine: AsyncEngine,
+                        tables: Iterable[str] = ("keywords", "keyword_vectors", "llm_cache", "keyword_jobs")):
+    """
+    행을 지운 뒤 빈 공간을 디스크에 돌려준다. (MySQL: OPTIMIZE TABLE, SQLite: VACUUM)
+    테이블(파일)을 다시 만드는 작업이므로 트래픽이 적은 시간에 실행한다.
+    """
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        if engine.dialect.name == "mysql":
+            for name in tables:
+                await conn.exec_driver_sql(f"OPTIMIZE TABLE `{name}`")
+        else:
+            await conn.exec_driver_sql("VACUUM")
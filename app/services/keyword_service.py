@@ -0,0 +1,215 @@
+import asyncio
+import logging
+import re
+from contextlib import nullcontext
+from typing import List, Optional, Tuple
+
+# --- 내부 모듈 임포트 ---
+from app.core.config import settings
+from app.core.llm_output import KEYWORD_OUTPUT, MAX_TOPICS, MIN_TOPICS, generate_structured
+from app.utils.text_normalizer import prepare_stt_text
+from app.utils.text_similarity import jaccard_similarity
+
+logger = logging.getLogger(__name__)
+
+MAX_WEIGHT = 5
+
+# 문장 경계: 문장부호 뒤 공백 또는 줄바꿈
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.?!。…])\s+|\n+")
+
+
+def build_keyword_prompt(text: str) -> str:
+    """통화 내용(STT 결과)에서 주제를 추출하도록 지시하는 프롬프트 생성"""
+    return f"""
+    당신은 대화의 문맥을 완벽하게 이해하고 핵심 요점을 정리하는 AI 분석가입니다.
+    아래 [대화 내용]은 **STT(음성 인식)를 통해 텍스트로 변환된 결과물**입니다.
+    따라서 발음이 비슷하지만 문맥상 어색한 오타(예: '저렴하다' -> '절연하다', '방학' -> '반학')가 포함되어 있을 수 있습니다.
+
+    [규칙]
+    1.  **[중요] STT 오류 보정:** 텍스트를 있는 그대로 해석하지 말고, **전체 대화 흐름과 문맥을 파악하여 오타를 원래 의도된 단어로 내부적으로 교정한 뒤** 주제를 추출하세요.
+        - (예시: "갤럭시가 절연하잖아" -> "갤럭시가 저렴하잖아"로 해석하여 "갤럭시의 저렴한 가격"이라는 주제 추출)
+    
+    2.  **문맥 포함 요약:** 단일 키워드가 아닌, 문맥을 포함한 핵심 주제를 요약된 문장 형태로 추출하세요.
+        - (좋은 예시): "할머니가 된장국을 끓여준다고 약속함"
+        - (나쁜 예시): "된장국"
+
+    3.  대화의 길이에 따라 주제의 개수를 2개에서 5개 사이로 조절하세요.
+    4.  각 주제의 중요도를 대화의 핵심과 얼마나 관련이 깊은지에 따라 1(낮음)부터 5(매우 높음) 사이의 숫자로 평가하세요.
+    5.  결과는 반드시 아래 [출력 형식]과 동일한 JSON 형식으로만 반환해야 합니다.
+
+    [출력 형식]
+    [
+      {{"keyword": "보정된 내용을 바탕으로 추출된 주제 문장 1", "weight": 중요도_숫자}},
+      {{"keyword": "보정된 내용을 바탕으로 추출된 주제 문장 2", "weight": 중요도_숫자}}
+    ]
+
+    [대화 내용]
+    {text}
+    """
+
+
+async def extract_keywords(text: str, bypass: bool = False,
+                           semaphore: Optional[asyncio.Semaphore] = None) -> List[dict]:
+    """
+    Gemini로 통화 내용에서 주제 키워드를 추출한다. (복구 재시도 후에도 잘못된 형식이면 LLMOutputError)
+    STT 잡음을 먼저 정리하고, 정리된 내용이 KEYWORD_CHUNK_THRESHOLD_CHARS보다 길면 나누어 추출한 뒤 합친다.
+    semaphore: 호출한 쪽의 동시 호출 제한 (Gemini 호출마다 하나씩 사용, 청크 호출도 같은 한도 안에서 실행)
+    """
+    text = prepare_stt_text(text, endpoint="keyword")
+    if 0 < settings.KEYWORD_CHUNK_THRESHOLD_CHARS < len(text):
+        return await extract_keywords_chunked(
+            text,
+            chunk_chars=settings.KEYWORD_CHUNK_SIZE_CHARS,
+            overlap_sentences=settings.KEYWORD_CHUNK_OVERLAP_SENTENCES,
+            concurrency=settings.KEYWORD_CHUNK_CONCURRENCY,
+            bypass=bypass,
+            semaphore=semaphore,
+        )
+    async with semaphore or nullcontext():
+        return await extract_keywords_single(text, bypass=bypass)
+
+
+async def extract_keywords_single(text: str, bypass: bool = False) -> List[dict]:
+    """통화 내용 전체를 한 번의 프롬프트로 추출"""
+    return await generate_structured(build_keyword_prompt(text), KEYWORD_OUTPUT, bypass=bypass)
+
+
+# --- 긴 통화 내용: 나누어 추출(map) -> 합치기(reduce) ---
+def split_sentences(text: str) -> List[str]:
+    return [sentence.strip() for sentence in _SENTENCE_BOUNDARY.split(text) if sentence.strip()]
+
+
+def split_transcript(text: str, chunk_chars: int, overlap_sentences: int) -> List[str]:
+    """
+    문장 경계에서 통화 내용을 chunk_chars 이하 길이로 나눈다.
+    주제가 청크 경계에서 끊기지 않도록 이전 청크의 마지막 overlap_sentences개 문장을 다음 청크 앞에 겹쳐 넣는다.
+    겹침 문장도 chunk_chars에 포함하며, 새 문장이 들어갈 자리가 없으면 겹침 문장을 앞에서부터 뺀다.
+    (문장부호 없이 한 문장이 chunk_chars보다 길면 공백 위치에서 자른다)
+    """
+    sentences = []
+    for sentence in split_sentences(text):
+        while len(sentence) > chunk_chars:
+            cut = sentence.rfind(" ", 0, chunk_chars)
+            cut = cut if cut > 0 else chunk_chars
+            sentences.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if sentence:
+            sentences.append(sentence)
+
+    chunks = []
+    current = []
+    length = 0
+    new_sentences = 0  # 현재 청크에서 겹침 문장을 제외하고 새로 추가된 문장 수
+    for sentence in sentences:
+        if current and new_sentences and length + len(sentence) > chunk_chars:
+            chunks.append(" ".join(current))
+            current = current[-overlap_sentences:] if overlap_sentences else []
+            length = sum(len(s) + 1 for s in current)
+            new_sentences = 0
+        while not new_sentences and current and length + len(sentence) > chunk_chars:
+            length -= len(current.pop(0)) + 1
+        current.append(sentence)
+        length += len(sentence) + 1
+        new_sentences += 1
+    if new_sentences:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def merge_topics(chunk_results: List[List[dict]], similarity: float) -> List[dict]:
+    """
+    청크별 추출 결과를 하나로 합친다.
+    - 문자 bigram 유사도가 similarity 이상인 주제는 같은 주제로 보고, 가장 중요도가 높은 문장을 대표로 남긴다.
+    - 중요도는 묶인 주제 중 최댓값을 쓰고, 여러 청크에서 반복 등장한 주제는 1점을 더한다. (최대 5)
+    - 중요도 순으로 최대 MAX_TOPICS개만 남긴다.
+    - 합친 결과가 MIN_TOPICS개보다 적으면 대표로 뽑히지 않은 주제 중 고른 주제 모두와 similarity 미만인 것만 채운다.
+      (중복 주제로 채우지 않으므로 그래도 모자랄 수 있다. 호출하는 쪽에서 처리)
+    """
+    groups = []  # [{"keyword", "weight", "chunks": set, "members": list}]
+    for chunk_index, topics in enumerate(chunk_results):
+        for topic in topics:
+            for group in groups:
+                if jaccard_similarity(group["keyword"], topic["keyword"]) >= similarity:
+                    if topic["weight"] > group["weight"]:
+                        group["keyword"] = topic["keyword"]
+                        group["weight"] = topic["weight"]
+                    group["chunks"].add(chunk_index)
+                    group["members"].append(topic)
+                    break
+            else:
+                groups.append({"keyword": topic["keyword"], "weight": topic["weight"], "chunks": {chunk_index},
+                               "members": [topic]})
+
+    merged = [
+        {"keyword": group["keyword"], "weight": min(MAX_WEIGHT, group["weight"] + (1 if len(group["chunks"]) > 1 else 0))}
+        for group in groups
+    ]
+    # 중요도 내림차순 (동점은 먼저 등장한 주제 우선)
+    merged.sort(key=lambda topic: topic["weight"], reverse=True)
+
+    runners_up = [topic for group in groups for topic in group["members"] if topic["keyword"] != group["keyword"]]
+    # 중요도가 높은 주제부터, 이미 고른 주제와 중복이 아닌 것만
+    for topic in sorted(runners_up, key=lambda topic: topic["weight"], reverse=True):
+        if len(merged) >= MIN_TOPICS:
+            break
+        if all(jaccard_similarity(topic["keyword"], chosen["keyword"]) < similarity for chosen in merged):
+            merged.append({"keyword": topic["keyword"], "weight": topic["weight"]})
+    merged.sort(key=lambda topic: topic["weight"], reverse=True)
+    return merged[:MAX_TOPICS]
+
+
+async def extract_keywords_chunked(text: str, chunk_chars: int, overlap_sentences: int, concurrency: int,
+                                   bypass: bool = False, semaphore: Optional[asyncio.Semaphore] = None) -> List[dict]:
+    """
+    긴 통화 내용을 청크로 나누어 동시에 추출한 뒤 합친다. 일부 청크만 실패하면 성공한 청크로 결과를 만든다.
+    합친 주제가 MIN_TOPICS개보다 적으면(청크마다 같은 주제만 나온 경우) 전체 내용을 한 번에 다시 추출한다.
+    semaphore가 주어지면(일괄 처리 중) concurrency 대신 그 제한을 함께 쓴다.
+    """
+    chunks = split_transcript(text, chunk_chars, overlap_sentences)
+    if len(chunks) <= 1:
+        async with semaphore or nullcontext():
+            return await extract_keywords_single(text, bypass=bypass)
+
+    results = await extract_keywords_batch(chunks, concurrency=concurrency, bypass=bypass, chunked=False,
+                                           semaphore=semaphore)
+    succeeded = [keywords_data for keywords_data, error in results if error is None]
+    if not succeeded:
+        raise results[0][1]
+    merged = merge_topics(succeeded, similarity=settings.KEYWORD_MERGE_SIMILARITY)
+    if len(merged) >= MIN_TOPICS:
+        return merged
+
+    logger.info("청크 추출 결과를 합친 주제가 %d개뿐이라 전체 내용으로 다시 추출", len(merged))
+    async with semaphore or nullcontext():
+        return await extract_keywords_single(text, bypass=bypass)
+
+
+def keyword_rows(call_id: int, keywords_data: List[dict]) -> List[dict]:
+    """추출 결과를 store_keywords에 넘길 행 목록으로 변환"""
+    return [
+        {"keyword": item["keyword"], "weight": item["weight"], "videocallId": call_id}
+        for item in keywords_data
+    ]
+
+
+async def extract_keywords_batch(texts: List[str], concurrency: int, bypass: bool = False, chunked: bool = True,
+                                 semaphore: Optional[asyncio.Semaphore] = None) -> List[Tuple[List[dict], Exception]]:
+    """
+    여러 통화(또는 청크)의 키워드를 Gemini 호출 최대 concurrency개씩 동시에 추출한다.
+    긴 통화를 나눈 청크 호출도 같은 세마포어를 쓰므로 동시 호출 수는 concurrency를 넘지 않는다.
+    (세마포어는 Gemini 호출 단위로 잡으므로, 청크 결과를 기다리는 통화가 자리를 차지하지 않는다)
+    한 건이 실패해도 나머지는 계속 처리하며, 입력 순서대로 (키워드 목록, 예외) 쌍을 반환한다.
+    semaphore: 바깥 일괄 처리의 세마포어 (청크 추출에서 넘겨받음)
+    """
+    semaphore = semaphore or asyncio.Semaphore(concurrency)
+
+    async def extract_one(text: str):
+        try:
+            if chunked:
+                return await extract_keywords(text, bypass=bypass, semaphore=semaphore), None
+            async with semaphore:
+                return await extract_keywords_single(text, bypass=bypass), None
+        except Exception as e:
+            return None, e
+
+    return await asyncio.gather(*(extract_one(text) for text in texts))
@@ -1,6 +1,76 @@
+import os
 import random
 import string
+import threading
+import time
+
+# 숫자 -> 대문자 순서의 36진수 (ASCII 정렬 순서와 같아서 문자열 정렬 = 생성 순서)
+ID_ALPHABET = string.digits + string.ascii_uppercase
+ID_EPOCH = 1735689600  # 2025-01-01 00:00:00 UTC
+
+# 11자리 = 시간(초) 6자리 + 노드 2자리 + 시퀀스 3자리
+TIME_LENGTH = 6        # 36^6초 ≈ 69년
+NODE_LENGTH = 2        # 프로세스(워커)별 노드 번호 1,296개
+SEQUENCE_LENGTH = 3    # 노드당 초당 46,656개
+
+MAX_NODE = len(ID_ALPHABET) ** NODE_LENGTH
+MAX_SEQUENCE = len(ID_ALPHABET) ** SEQUENCE_LENGTH
+
+
+def encode_base36(value: int, length: int) -> str:
+    """정수를 고정 길이 36진수 문자열로 변환"""
+    chars = []
+    for _ in range(length):
+        value, rem = divmod(value, len(ID_ALPHABET))
+        chars.append(ID_ALPHABET[rem])
+    return ''.join(reversed(chars))
+
+
+class KeywordIdGenerator:
+    """
+    시간 순으로 정렬되는 11자리 키워드 ID 생성기.
+    같은 프로세스 안에서는 절대 중복되지 않고, 워커 프로세스마다 노드 번호가 달라
+    DB에 중복 확인 조회를 하지 않아도 된다. (노드 번호가 우연히 겹치는 경우는 INSERT 재시도로 처리)
+    """
+
+    def __init__(self, node: int = None, clock=time.time):
+        self._lock = threading.Lock()
+        self._clock = clock
+        self._node = node if node is not None else random.SystemRandom().randrange(MAX_NODE)
+        self._last_second = -1
+        self._sequence = 0
+
+    def reseed(self):
+        """노드 번호를 새로 뽑는다. (fork 직후 / ID 충돌 발생 시)"""
+        with self._lock:
+            self._node = random.SystemRandom().randrange(MAX_NODE)
+
+    def next_id(self) -> str:
+        with self._lock:
+            # 시계가 뒤로 가더라도 ID가 역순이 되지 않도록 마지막 시각 이상을 유지
+            second = max(int(self._clock()) - ID_EPOCH, self._last_second)
+            if second == self._last_second:
+                self._sequence += 1
+                if self._sequence >= MAX_SEQUENCE:
+                    # 초당 시퀀스를 다 쓰면 다음 초를 미리 당겨 쓴다.
+                    second += 1
+                    self._sequence = 0
+            else:
+                self._sequence = 0
+            self._last_second = second
+            return (
+                encode_base36(second, TIME_LENGTH)
+                + encode_base36(self._node, NODE_LENGTH)
+                + encode_base36(self._sequence, SEQUENCE_LENGTH)
+            )
+
+
+keyword_id_generator = KeywordIdGenerator()
+# fork 방식 멀티 워커에서 자식 프로세스끼리 노드 번호가 같아지지 않도록 재설정
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=keyword_id_generator.reseed)
+
 
 def generate_keyword_id():
-    """랜덤 숫자+문자열 11자리 ID 생성"""
-    return ''.join(random.choices(string.ascii_uppercase + string.digits, k=11))
\ No newline at end of file
+    """시간 순 정렬 + 중복 없는 11자리 ID 생성"""
+    return keyword_id_generator.next_id()
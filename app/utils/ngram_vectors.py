@@ -0,0 +1,67 @@
+import zlib
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from app.utils.text_similarity import char_ngrams
+
+# 해시 버킷 수 (저장된 벡터의 바이트 수). 바꾸면 python -m scripts.rebuild_keyword_vectors로 다시 만들어야 한다.
+VECTOR_DIM = 256
+NGRAM_SIZE = 2
+
+
+def ngram_vector(text: str) -> np.ndarray:
+    """
+    문장의 문자 bigram을 VECTOR_DIM개 버킷에 해시하여 센 벡터 (uint8)
+    프로세스마다 값이 달라지는 hash() 대신 crc32를 사용하여 저장된 벡터와 항상 같은 결과를 낸다.
+    """
+    vector = np.zeros(VECTOR_DIM, dtype=np.uint8)
+    for gram in char_ngrams(text, NGRAM_SIZE):
+        bucket = zlib.crc32(gram.encode("utf-8")) % VECTOR_DIM
+        if vector[bucket] < 255:
+            vector[bucket] += 1
+    return vector
+
+
+def encode_vector(vector: np.ndarray) -> bytes:
+    return vector.astype(np.uint8).tobytes()
+
+
+def decode_vector(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype=np.uint8)
+
+
+def normalize_rows(vectors: Sequence[np.ndarray]) -> np.ndarray:
+    """벡터 목록을 행마다 길이 1로 정규화한 float32 행렬로 만든다. (행렬 곱이 곧 코사인 유사도)"""
+    if not len(vectors):
+        return np.zeros((0, VECTOR_DIM), dtype=np.float32)
+    matrix = np.asarray(vectors, dtype=np.float32).reshape(len(vectors), VECTOR_DIM)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def greedy_dedup(matrix: np.ndarray, threshold: float, limit: Optional[int] = None,
+                 selected: Optional[np.ndarray] = None, block_size: int = 1024) -> List[int]:
+    """
+    정규화된 벡터 행렬을 앞에서부터 차례로 고르면서, 이미 고른 벡터와 코사인 유사도가 threshold 이상인 행은 건너뛴다.
+    고른 행 번호를 반환한다. selected: 앞서 고른 벡터 행렬 (여러 번에 나누어 호출할 때)
+    block_size행씩 나누어, 블록마다 앞서 고른 벡터 전체와의 유사도를 행렬 곱 한 번으로 걸러내고
+    블록 안에서는 한 행을 고를 때마다 남은 행과의 유사도를 행렬-벡터 곱으로 계산한다.
+    (limit개를 다 고르면 뒤쪽 블록은 계산하지 않는다.)
+    """
+    kept = []
+    kept_vectors = [selected] if selected is not None and len(selected) else []
+    for start in range(0, len(matrix), block_size):
+        rows = matrix[start:start + block_size]
+        alive = np.ones(len(rows), dtype=bool)
+        if kept_vectors:
+            alive &= (rows @ np.vstack(kept_vectors).T).max(axis=1) < threshold
+        for index in np.flatnonzero(alive):
+            if not alive[index]:
+                continue
+            if limit is not None and len(kept) >= limit:
+                return kept
+            kept.append(start + int(index))
+            kept_vectors.append(rows[index:index + 1])
+            alive[index + 1:] &= rows[index + 1:] @ rows[index] < threshold
+    return kept
@@ -0,0 +1,29 @@
+import math
+
+
+def rank_keywords(keywords, limit=3):
+    """
+    키워드 우선순위 로직 (순수 Python 구현)
+    1. 가중치(weight) 내림차순 정렬
+    2. 상위 절반 필터링 (소수점 올림)
+    3. 생성일시(date) 최신순 정렬 후 상위 limit개 선택
+    동점은 입력 순서를 유지한다. (sorted는 안정 정렬)
+    """
+    sorted_by_weight = sorted(keywords, key=lambda kw: kw.weight, reverse=True)
+    top_half_keywords = sorted_by_weight[:math.ceil(len(sorted_by_weight) / 2)]
+    sorted_by_date = sorted(top_half_keywords, key=lambda kw: kw.date, reverse=True)
+    return sorted_by_date[:limit]
+
+
+def rank_order(keywords):
+    """
+    rank_keywords의 선택 순서를 전체 키워드로 늘린 것: 상위 절반(최신순) 뒤에 나머지 절반(최신순)을 이어 붙인다.
+    앞에서부터 limit개를 자르면 rank_keywords와 같고, 유사 키워드를 건너뛰어 빈 자리를 뒤쪽 후보로 채울 때 사용한다.
+    """
+    sorted_by_weight = sorted(keywords, key=lambda kw: kw.weight, reverse=True)
+    half = math.ceil(len(sorted_by_weight) / 2)
+    return [
+        kw
+        for group in (sorted_by_weight[:half], sorted_by_weight[half:])
+        for kw in sorted(group, key=lambda kw: kw.date, reverse=True)
+    ]
@@ -0,0 +1,72 @@
+import logging
+import math
+import re
+import unicodedata
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# --- 미리 컴파일한 정규식 (요청마다 다시 컴파일하지 않음) ---
+# 추임새 (한 번의 탐색으로 처리하도록 하나의 패턴으로 합침)
+# 뜻이 없는 감탄사만 지운다. 지시어/의문사("그...", "저기...", "뭐~", "막...")는 문장의 뜻을 바꿀 수 있으므로 유지한다.
+#  - 말줄임/물결이 붙은 추임새: "어...", "음…", "아~"
+#  - 단독으로는 뜻이 없는 추임새: "음", "으음", "흠", "엄"
+#  - 늘어진 추임새: "어어", "아아아"
+_FILLER = re.compile(
+    r"(?<!\S)(?=[어음아으에엄흠])(?:"  # 첫 글자로 후보를 먼저 거름
+    r"(?:어+|음+|아+|으+|에+|엄+|흠+)(?:\.{2,}|…+|~+)"
+    r"|(?:음+|으+음*|흠+|엄+|어{2,}|아{2,})[,.]?"
+    r")(?=\s|$)"
+)
+# 말을 더듬어 바로 반복된 짧은 지시어/기능어만 하나로 합친다: "그 그 사람" -> "그 사람", "제가 제가" -> "제가"
+# 그 밖의 어절은 반복 자체가 뜻을 가질 수 있으므로 유지한다. ("다음 다음 다음 주", "정말 정말", "사랑해 사랑해")
+_STUTTER_WORDS = "그|저|이|그게|저게|이게|그거|저거|이거|그래서|그러니까|이제|제가|내가"
+_REPEATED_WORD = re.compile(rf"(?<!\S)({_STUTTER_WORDS})(?:\s+\1)+(?!\S)")
+# 공백 정리 (이미 정상인 한 칸 공백은 건드리지 않음)
+_IRREGULAR_SPACES = re.compile(r"[ \t\u00a0\u3000]{2,}|[\t\u00a0\u3000]")  # 연속 공백 / 탭 / NBSP / 전각 공백
+_SPACE_BEFORE_PUNCT = re.compile(r" +([,.!?])")
+_SPACES_AROUND_NEWLINE = re.compile(r" *\n *")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def normalize_stt_text(text: str) -> str:
+    """
+    STT 결과에서 의미 없는 잡음을 제거한다.
+    1. 유니코드 정규화(NFC) - 자모가 분리된 한글 결합
+    2. 추임새 제거 ("어...", "음", "어어" 등 감탄사만)
+    3. 말을 더듬어 반복된 지시어/기능어 하나로 합치기 (뜻이 있는 어절의 반복은 유지)
+    4. 공백 정리 (연속 공백, 문장부호 앞 공백, 3줄 이상 빈 줄). 단락 구분 줄바꿈은 유지한다.
+    """
+    text = unicodedata.normalize("NFC", text)
+    text = _FILLER.sub("", text)
+    text = _IRREGULAR_SPACES.sub(" ", text)
+    text = _REPEATED_WORD.sub(r"\1", text)
+    text = _SPACE_BEFORE_PUNCT.sub(r"\1", text)
+    text = _SPACES_AROUND_NEWLINE.sub("\n", text)
+    text = _BLANK_LINES.sub("\n\n", text)
+    return text.strip()
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 추정치 (UTF-8 4바이트당 약 1토큰. 실제 토크나이저 호출 없이 절감량 비교용)"""
+    return math.ceil(len(text.encode("utf-8")) / 4)
+
+
+def prepare_stt_text(text: str, endpoint: str) -> str:
+    """
+    프롬프트를 만들기 전에 STT 텍스트를 정규화하고 글자/토큰 절감량을 기록한다.
+    STT_NORMALIZE_ENABLED=false면 원본을 그대로 반환한다.
+    """
+    if not settings.STT_NORMALIZE_ENABLED:
+        return text
+
+    normalized = normalize_stt_text(text)
+    if len(normalized) < len(text):
+        before_tokens, after_tokens = estimate_tokens(text), estimate_tokens(normalized)
+        logger.info(
+            "STT 정규화(%s): %d -> %d자 (-%.1f%%), 추정 토큰 %d -> %d",
+            endpoint, len(text), len(normalized), 100 * (1 - len(normalized) / len(text)),
+            before_tokens, after_tokens,
+        )
+    return normalized
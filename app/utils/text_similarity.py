@@ -0,0 +1,19 @@
+import re
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def char_ngrams(text: str, n: int = 2) -> set:
+    """공백을 제거한 문자 n-gram 집합 (한국어는 띄어쓰기가 흔들려도 비교할 수 있도록 공백 무시)"""
+    compact = _WHITESPACE.sub("", text)
+    if len(compact) < n:
+        return {compact} if compact else set()
+    return {compact[i:i + n] for i in range(len(compact) - n + 1)}
+
+
+def jaccard_similarity(a: str, b: str, n: int = 2) -> float:
+    """두 문장의 문자 n-gram 자카드 유사도 (0 ~ 1)"""
+    grams_a, grams_b = char_ngrams(a, n), char_ngrams(b, n)
+    if not grams_a or not grams_b:
+        return 1.0 if grams_a == grams_b else 0.0
+    return len(grams_a & grams_b) / len(grams_a | grams_b)
@@ -0,0 +1,38 @@
+import zlib
+from typing import List
+
+# 키워드 개수별 문장 틀 (Gemini 프롬프트의 규칙과 같이 권유형 평서문으로 끝남)
+# 키워드는 "할머니가 된장국을 끓여준다고 약속함"처럼 명사형으로 끝나는 문장이므로,
+# 조사를 직접 붙이지 않고 따옴표로 감싼 뒤 '이야기'에 조사를 붙인다.
+_TEMPLATES = {
+    1: [
+        "지난 통화에서 나눈 '{0}' 이야기는 그 뒤로 어떻게 되었는지 물어보세요.",
+        "'{0}' 이야기를 이어서 나눠 보세요.",
+    ],
+    2: [
+        "'{0}' 이야기와 '{1}' 이야기는 어떻게 되었는지 물어보세요.",
+        "지난 통화에서 나눈 '{0}' 이야기에 이어, '{1}' 이야기도 나눠 보세요.",
+    ],
+    3: [
+        "'{0}' 이야기, '{1}' 이야기, 그리고 '{2}' 이야기에 대해 이야기해 보세요.",
+        "지난 통화의 '{0}' 이야기와 '{1}' 이야기는 어떻게 되었는지, '{2}' 이야기도 함께 물어보세요.",
+    ],
+}
+_DEFAULT_TOPIC = "오늘 하루는 어떻게 보내셨는지 이야기해 보세요."
+
+
+def _clean(sentence: str) -> str:
+    return sentence.strip().rstrip(".!?。…~ ").replace("'", "")
+
+
+def compose_topic_sentence(keywords: List[str]) -> str:
+    """
+    선택된 키워드 문장(최대 3개)을 연결어 문장 틀에 넣어 추천 주제 문장을 만든다. (Gemini 없이 로컬에서)
+    같은 키워드 목록에는 항상 같은 문장 틀을 사용한다.
+    """
+    cleaned = [_clean(keyword) for keyword in keywords if _clean(keyword)][:3]
+    if not cleaned:
+        return _DEFAULT_TOPIC
+    templates = _TEMPLATES[len(cleaned)]
+    template = templates[zlib.crc32("\n".join(cleaned).encode("utf-8")) % len(templates)]
+    return template.format(*cleaned)
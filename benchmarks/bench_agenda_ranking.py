@@ -0,0 +1,111 @@
+"""
+/ajenda 키워드 우선순위 로직 비교
+- python : 전체 키워드 조회 후 Python 정렬 (rank_keywords)
+- sql    : DB 윈도우 함수 (select_top_keywords)
+
+1) 랜덤 데이터로 두 구현과 중복 제거 경로의 순서가 같은지 검증 (가중치/날짜 동점 포함)
+2) 통화 이력 길이별 소요 시간 측정
+
+실행: python -m benchmarks.bench_agenda_ranking [--trials 200] [--calls 200]
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.common import configure_offline_env
+
+configure_offline_env()
+
+from sqlalchemy import delete, insert, select  # noqa: E402
+
+from app.database import Base, AsyncSessionLocal, async_engine  # noqa: E402
+from app.database.crud import get_ranked_keywords, select_top_keywords  # noqa: E402
+from app.database.models import Keyword  # noqa: E402
+from app.utils.id_utils import generate_keyword_id  # noqa: E402
+from app.utils.ranking import rank_keywords  # noqa: E402
+
+BASE_DATE = datetime(2025, 1, 1)
+
+
+def random_rows(rng: random.Random, call_ids, date_spread_days: int):
+    rows = []
+    for call_id in call_ids:
+        # 재시도/일괄 재처리로 프롬프트 상한(5개)보다 많이 저장된 통화도 포함
+        for _ in range(rng.randint(2, 12)):
+            rows.append({
+                "keywordId": generate_keyword_id(),
+                "keyword": f"주제 {rng.random():.6f}",
+                "videocallId": call_id,
+                "weight": rng.randint(1, 5),
+                # 날짜 범위를 좁게 잡아 동점이 자주 생기도록 함
+                "date": BASE_DATE + timedelta(days=rng.randint(0, date_spread_days)),
+            })
+    return rows
+
+
+async def python_ranking(db, call_ids, limit=3):
+    result = await db.execute(
+        select(Keyword).where(Keyword.videocallId.in_(call_ids)).order_by(Keyword.keywordId)
+    )
+    return rank_keywords(result.scalars().all(), limit=limit)
+
+
+async def never_dedup_ranking(db, call_ids, limit=3):
+    # 유사도가 1을 넘을 수 없으므로 아무것도 건너뛰지 않음: 중복 제거 경로(rank_order + 창 단위 벡터 비교)의 순서 검증용
+    return await get_ranked_keywords(db, call_ids, limit, dedup_threshold=1.01)
+
+
+async def check_parity(trials: int, seed: int):
+    rng = random.Random(seed)
+    async with AsyncSessionLocal() as db:
+        for trial in range(trials):
+            await db.execute(delete(Keyword))
+            call_ids = list(range(rng.randint(1, 30)))
+            await db.execute(insert(Keyword), random_rows(rng, call_ids, rng.choice([0, 3, 30])))
+            await db.commit()
+
+            query_ids = rng.sample(call_ids, rng.randint(1, len(call_ids)))
+            limit = rng.randint(1, 5)
+            expected = [kw.keywordId for kw in await python_ranking(db, query_ids, limit)]
+            for name, fn in (("sql", select_top_keywords), ("dedup", never_dedup_ranking)):
+                actual = [row.keywordId for row in await fn(db, query_ids, limit)]
+                if expected != actual:
+                    raise AssertionError(f"trial {trial}: python={expected} {name}={actual}")
+    print(f"parity: {trials} random trials OK")
+
+
+async def measure(calls: int, repeat: int, seed: int):
+    rng = random.Random(seed)
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Keyword))
+        call_ids = list(range(calls))
+        await db.execute(insert(Keyword), random_rows(rng, call_ids, 365))
+        await db.commit()
+
+        for name, fn in (("python", python_ranking), ("sql", select_top_keywords)):
+            started = time.perf_counter()
+            for _ in range(repeat):
+                await fn(db, call_ids, 3)
+            elapsed = (time.perf_counter() - started) / repeat
+            print(f"{name:>7}: {calls} calls, {elapsed * 1000:.2f} ms/query")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trials", type=int, default=200)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await check_parity(args.trials, args.seed)
+    await measure(args.calls, args.repeat, args.seed)
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,171 @@
+"""
+API 엔드포인트 부하 테스트 (처리량 / p50 / p95 / p99)
+
+앱을 SQLite + fake LLM 백엔드(지연 시간/지터 설정 가능)로 같은 프로세스에서 띄우고(lifespan 포함),
+httpx ASGITransport로 엔드포인트마다 동시 요청을 보낸다. 네트워크/uvicorn 비용은 포함되지 않는다.
+
+- keyword: 매 요청 새로운 통화 ID로 추출 + 저장 (INSERT 경로)
+- ajenda : 시드 데이터의 통화 ID 중 --ids-per-request개를 골라 주제 추천 (순위 조회 경로)
+- letter : 편지 교정
+
+기본적으로 X-Cache-Bypass 헤더를 보내 매 요청이 LLM(fake)을 호출하도록 한다. (--cache로 캐시 사용)
+변경 전후 p99를 비교하려면 같은 --seed / --rows / 지연 옵션으로 실행한다.
+
+실행: python -m benchmarks.bench_endpoints [--endpoints keyword ajenda letter] [--requests 500] [--concurrency 20]
+                                            [--latency-ms 800] [--jitter-ms 400] [--rows 100000] [--db 경로] [--json]
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import time
+
+from benchmarks.common import configure_offline_env, make_transcript
+
+
+def percentile(sorted_values, p: float) -> float:
+    """nearest-rank 백분위수"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+
+class EndpointLoad:
+    """엔드포인트 하나에 대한 요청 생성기"""
+
+    def __init__(self, name: str, method: str, path: str, make_body):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.make_body = make_body
+
+
+def build_loads(rng: random.Random, call_count: int, ids_per_request: int, text_chars: int):
+    next_call_id = [10 ** 9]  # 시드 데이터(0부터)와 겹치지 않는 통화 ID
+
+    def keyword_body():
+        next_call_id[0] += 1
+        return {"call_id": next_call_id[0], "text": make_transcript(text_chars, rng)}
+
+    def ajenda_body():
+        return {"videocall_ids": rng.sample(range(call_count), min(ids_per_request, call_count))}
+
+    def letter_body():
+        return {"text": make_transcript(text_chars, rng)}
+
+    return {
+        "keyword": EndpointLoad("keyword", "POST", "/api/keyword", keyword_body),
+        "ajenda": EndpointLoad("ajenda", "POST", "/api/ajenda", ajenda_body),
+        "letter": EndpointLoad("letter", "POST", "/api/letter", letter_body),
+    }
+
+
+async def run_load(client, load: EndpointLoad, requests: int, concurrency: int, headers: dict) -> dict:
+    latencies = []
+    statuses = {}
+    remaining = [requests]
+
+    async def worker():
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            body = load.make_body()
+            started = time.perf_counter()
+            try:
+                response = await client.request(load.method, load.path, json=body, headers=headers)
+                status = response.status_code
+            except Exception as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    errors = sum(count for status, count in statuses.items() if not (isinstance(status, int) and status < 400))
+    return {
+        "endpoint": load.name,
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "errors": errors,
+        "statuses": {str(status): count for status, count in statuses.items()},
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoints", nargs="+", default=["keyword", "ajenda", "letter"])
+    parser.add_argument("--requests", type=int, default=500, help="엔드포인트별 요청 수")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=20, help="측정 전에 보낼 요청 수")
+    parser.add_argument("--latency-ms", type=int, default=800, help="fake LLM 응답 지연 시간")
+    parser.add_argument("--jitter-ms", type=int, default=400, help="fake LLM 지연 시간에 더할 임의 지터 최댓값")
+    parser.add_argument("--per-kchar-ms", type=int, default=0, help="fake LLM 프롬프트 1,000자당 추가 지연 시간")
+    parser.add_argument("--db", default=None, help="SQLite 파일 경로 (기본: 임시 파일)")
+    parser.add_argument("--rows", type=int, default=10000, help="시드할 keywords 행 수 (0이면 --db의 기존 데이터 사용)")
+    parser.add_argument("--ids-per-request", type=int, default=10, help="/ajenda 요청당 통화 ID 수")
+    parser.add_argument("--text-chars", type=int, default=800, help="keyword/letter 요청 본문 길이")
+    parser.add_argument("--cache", action="store_true", help="LLM 응답 캐시 사용 (기본: 요청마다 우회)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 한 줄씩 출력")
+    args = parser.parse_args()
+
+    configure_offline_env(args.db)
+    os.environ.update({
+        "LLM_BACKEND": "fake",
+        "FAKE_LLM_LATENCY_MS": str(args.latency_ms),
+        "FAKE_LLM_JITTER_MS": str(args.jitter_ms),
+        "FAKE_LLM_LATENCY_PER_KCHAR_MS": str(args.per_kchar_ms),
+    })
+    import httpx
+    from sqlalchemy import func, select
+
+    from app.database import AsyncSessionLocal, Base, async_engine
+    from app.database.models import Keyword
+    from app.main import app
+    from benchmarks.seed_keywords import seed_keywords
+
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    if args.rows:
+        call_count = await seed_keywords(args.rows, args.seed)
+    else:
+        async with AsyncSessionLocal() as db:
+            call_count = (await db.execute(select(func.max(Keyword.videocallId)))).scalar() or 0
+            call_count += 1
+
+    rng = random.Random(args.seed)
+    loads = build_loads(rng, call_count, args.ids_per_request, args.text_chars)
+    headers = {} if args.cache else {"X-Cache-Bypass": "true"}
+
+    results = []
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None) as client:
+            for name in args.endpoints:
+                load = loads[name]
+                if args.warmup:
+                    await run_load(client, load, args.warmup, min(args.concurrency, args.warmup), headers)
+                results.append(await run_load(client, load, args.requests, args.concurrency, headers))
+    await async_engine.dispose()
+
+    if args.json:
+        for result in results:
+            print(json.dumps(result, ensure_ascii=False))
+        return
+    print(f"fake LLM: {args.latency_ms}ms + jitter {args.jitter_ms}ms, keywords: {call_count:,} calls, concurrency {args.concurrency}")
+    print(f"{'endpoint':>8} {'reqs':>6} {'errors':>6} {'req/s':>8} {'p50(ms)':>8} {'p95(ms)':>8} {'p99(ms)':>8} {'max(ms)':>8}")
+    for r in results:
+        print(f"{r['endpoint']:>8} {r['requests']:>6} {r['errors']:>6} {r['throughput_rps']:>8.1f} "
+              f"{r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['max_ms']:>8.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
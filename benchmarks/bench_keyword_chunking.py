@@ -0,0 +1,59 @@
+"""
+긴 통화 내용 키워드 추출: 한 번에 추출(single) vs 나누어 추출 후 합치기(chunked) 지연 시간 비교
+
+fake LLM 백엔드의 지연 시간을 "기본 지연 + 프롬프트 1,000자당 지연"으로 설정하여
+입력이 길수록 느려지는 모델을 흉내 낸다. (실제 Gemini 수치에 맞게 옵션으로 조정)
+
+실행: python -m benchmarks.bench_keyword_chunking [--lengths 2000 8000 30000] [--base-ms 800] [--per-kchar-ms 150]
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+
+from benchmarks.common import configure_offline_env, make_transcript
+
+async def timed(fn, *args, **kwargs):
+    started = time.perf_counter()
+    result = await fn(*args, **kwargs)
+    return time.perf_counter() - started, result
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lengths", type=int, nargs="+", default=[2000, 8000, 30000, 60000])
+    parser.add_argument("--base-ms", type=int, default=800, help="fake LLM 기본 지연 시간")
+    parser.add_argument("--per-kchar-ms", type=int, default=150, help="fake LLM 프롬프트 1,000자당 지연 시간")
+    parser.add_argument("--chunk-chars", type=int, default=3000)
+    parser.add_argument("--overlap", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    configure_offline_env()
+    os.environ.update({
+        "LLM_BACKEND": "fake",
+        "FAKE_LLM_LATENCY_MS": str(args.base_ms),
+        "FAKE_LLM_LATENCY_PER_KCHAR_MS": str(args.per_kchar_ms),
+        "LLM_CACHE_ENABLED": "false",
+    })
+    from app.services.keyword_service import extract_keywords_chunked, extract_keywords_single, split_transcript
+
+    rng = random.Random(args.seed)
+    await extract_keywords_single("준비 운동")  # 첫 호출 초기화 비용 제외
+    print(f"{'chars':>7} {'chunks':>6} {'single(s)':>10} {'chunked(s)':>11} {'speedup':>8} {'topics':>7}")
+    for length in args.lengths:
+        text = make_transcript(length, rng)
+        chunks = split_transcript(text, args.chunk_chars, args.overlap)
+        single_time, _ = await timed(extract_keywords_single, text)
+        chunked_time, topics = await timed(
+            extract_keywords_chunked, text,
+            chunk_chars=args.chunk_chars, overlap_sentences=args.overlap, concurrency=args.concurrency,
+        )
+        print(f"{len(text):>7} {len(chunks):>6} {single_time:>10.2f} {chunked_time:>11.2f} "
+              f"{single_time / chunked_time:>7.2f}x {len(topics):>7}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,188 @@
+"""
+/ajenda 유사 키워드 중복 제거 벤치마크 (가족당 키워드 수만 개 규모)
+
+0) 기준값 확인: 표현만 다른 같은 주제 쌍과 비슷하지만 별개인 주제 쌍의 유사도를 출력한다.
+   KEYWORD_DEDUP_THRESHOLD를 켰을 때 별개인 주제 쌍이 하나라도 중복으로 걸러지면 실패한다.
+1) 벡터 계산: 키워드 문장 -> 문자 bigram 해시 벡터 (저장 시 비용)
+2) 중복 제거 커널: NumPy 행렬-벡터 곱(greedy_dedup) vs 같은 벡터에 대한 순수 Python 코사인 반복
+   - 두 구현이 같은 키워드를 고르는지 검증
+   - limit=3 (/ajenda가 실제로 쓰는 경우)과 limit 없음(전체 중복 제거, 최악의 경우) 시간 측정
+3) get_ranked_keywords 전체 경로: SQLite에 가족 하나의 통화를 넣고 중복 제거 켬/끔 조회 시간 비교
+
+키워드는 시드 데이터와 같은 "주어 + 사건" 문장에 조사 생략/어미 변경 등 표현을 바꾼 변형을 섞어 만든다.
+
+--threshold는 2), 3)의 시간 측정에만 쓰는 값이다. (서비스 기본값은 KEYWORD_DEDUP_THRESHOLD=0, 중복 제거 끔)
+
+실행: python -m benchmarks.bench_keyword_dedup [--sizes 10000 30000 50000] [--threshold 0.55] [--python-max 30000]
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import timedelta
+
+from benchmarks.common import configure_offline_env
+
+configure_offline_env()
+
+from sqlalchemy import delete, insert  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.database import AsyncSessionLocal, Base, async_engine  # noqa: E402
+from app.database.crud import get_ranked_keywords  # noqa: E402
+from app.database.models import Keyword, KeywordVector  # noqa: E402
+from app.utils.ngram_vectors import encode_vector, greedy_dedup, ngram_vector, normalize_rows  # noqa: E402
+from benchmarks.seed_keywords import BASE_DATE, EVENTS, SUBJECTS, seed_keyword_id  # noqa: E402
+
+# 같은 내용을 조금 다르게 적은 표현 (STT/Gemini가 통화마다 다르게 요약하는 경우)
+REWRITES = [
+    ("을 ", " "), ("를 ", " "), ("에 ", " "), ("이 ", "이 또 "),
+    ("다고 ", "신다고 "), ("기로 함", "기로 했음"), ("고 함", "고 하셨음"), ("함", "하심"), ("음", "었음"),
+]
+
+# 표현만 다른 같은 주제 (중복 제거 대상)
+NEAR_DUPLICATE_PAIRS = [
+    ("할머니가 된장국을 끓여준다고 약속함", "할머니가 된장국 끓여주신다고 약속하심"),
+]
+# 문장은 비슷하지만 별개인 주제 (중복 제거로 사라지면 안 됨)
+DISTINCT_PAIRS = [
+    ("동생이 김장 날짜를 정하기로 함", "삼촌이 김장 날짜를 정하기로 함"),
+    ("손주가 무릎이 아파 병원에 다녀옴", "할머니가 무릎이 아파 병원에 다녀옴"),
+    ("할머니가 무릎이 아파 병원에 다녀옴", "할머니가 허리가 아파 병원에 다녀옴"),
+    ("동생이 축구 경기를 보러 간다고 함", "동생이 야구 경기를 보러 간다고 함"),
+]
+
+
+def pair_similarity(a: str, b: str) -> float:
+    matrix = normalize_rows([ngram_vector(a), ngram_vector(b)])
+    return float(matrix[0] @ matrix[1])
+
+
+def check_threshold(threshold: float):
+    """기준값 threshold에서 별개인 주제 쌍이 모두 남는지 확인한다. (0이면 중복 제거를 하지 않으므로 항상 통과)"""
+    print(f"KEYWORD_DEDUP_THRESHOLD={threshold}")
+    for label, pairs in (("near-duplicate", NEAR_DUPLICATE_PAIRS), ("distinct", DISTINCT_PAIRS)):
+        for a, b in pairs:
+            similarity = pair_similarity(a, b)
+            dropped = 0 < threshold <= similarity
+            print(f"  {label:>14} {similarity:.3f} {'dropped' if dropped else 'kept':>7}: {a} / {b}")
+            if label == "distinct" and dropped:
+                raise AssertionError(f"별개인 주제가 중복으로 걸러집니다 (유사도 {similarity:.3f} >= {threshold}): {a} / {b}")
+
+
+def paraphrase(rng: random.Random, sentence: str) -> str:
+    for old, new in rng.sample(REWRITES, rng.randint(0, 2)):
+        sentence = sentence.replace(old, new, 1)
+    return sentence
+
+
+def family_keywords(rng: random.Random, size: int):
+    """가족 하나의 키워드 size개: (문장, 가중치, 통화 번호). 통화마다 2~5개."""
+    keywords = []
+    call = 0
+    while len(keywords) < size:
+        for _ in range(min(rng.randint(2, 5), size - len(keywords))):
+            base = f"{rng.choice(SUBJECTS)} {rng.choice(EVENTS)}"
+            keywords.append((paraphrase(rng, base), rng.randint(1, 5), call))
+        call += 1
+    return keywords
+
+
+def python_dedup(vectors, threshold: float, limit=None):
+    """greedy_dedup과 같은 규칙을 순수 Python으로 (정규화된 벡터 목록, 고른 벡터와 하나씩 비교)"""
+    kept = []
+    for index, vector in enumerate(vectors):
+        if limit is not None and len(kept) >= limit:
+            break
+        if all(sum(a * b for a, b in zip(vector, vectors[other])) < threshold for other in kept):
+            kept.append(index)
+    return kept
+
+
+def timed(fn, repeat: int = 1):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - started) / repeat
+
+
+def bench_kernel(size: int, threshold: float, python_max: int, seed: int):
+    rng = random.Random(seed)
+    sentences = [sentence for sentence, _, _ in family_keywords(rng, size)]
+
+    raw, vector_seconds = timed(lambda: [ngram_vector(sentence) for sentence in sentences])
+    matrix = normalize_rows(raw)
+    print(f"[{size:,} keywords] vectorize {vector_seconds * 1000:.0f} ms ({size / vector_seconds:,.0f} keywords/s)")
+
+    for limit in (3, None):
+        label = f"limit={limit}" if limit else "limit=all"
+        kept, numpy_seconds = timed(lambda: greedy_dedup(matrix, threshold, limit), repeat=5 if limit else 1)
+        line = f"  {label:>9}: numpy {numpy_seconds * 1000:8.2f} ms, kept {len(kept):,}"
+        if size <= python_max or limit:
+            rows = matrix.tolist()
+            expected, python_seconds = timed(lambda: python_dedup(rows, threshold, limit))
+            if expected != kept:
+                raise AssertionError(f"{size} {label}: python={expected[:10]} numpy={kept[:10]}")
+            line += f" | python {python_seconds * 1000:10.2f} ms (same result, x{python_seconds / max(numpy_seconds, 1e-9):,.1f})"
+        print(line)
+
+
+async def bench_ranking(size: int, threshold: float, repeat: int, seed: int):
+    rng = random.Random(seed)
+    keywords = family_keywords(rng, size)
+    rows = [
+        {
+            "keywordId": seed_keyword_id(index),
+            "keyword": sentence,
+            "videocallId": call,
+            "weight": weight,
+            "date": BASE_DATE + timedelta(days=call // 10, seconds=index),
+        }
+        for index, (sentence, weight, call) in enumerate(keywords)
+    ]
+    call_ids = sorted({row["videocallId"] for row in rows})
+
+    async with AsyncSessionLocal() as db:
+        for model in (Keyword, KeywordVector):
+            await db.execute(delete(model))
+        for start in range(0, len(rows), 10000):
+            batch = rows[start:start + 10000]
+            await db.execute(insert(Keyword), batch)
+            await db.execute(insert(KeywordVector), [
+                {"keywordId": row["keywordId"], "videocallId": row["videocallId"],
+                 "vector": encode_vector(ngram_vector(row["keyword"]))}
+                for row in batch
+            ])
+        await db.commit()
+
+        for name, dedup_threshold in (("dedup off", 0), ("dedup on", threshold)):
+            await get_ranked_keywords(db, call_ids, 3, dedup_threshold=dedup_threshold)  # 워밍업
+            started = time.perf_counter()
+            for _ in range(repeat):
+                result = await get_ranked_keywords(db, call_ids, 3, dedup_threshold=dedup_threshold)
+            elapsed = (time.perf_counter() - started) / repeat
+            print(f"  get_ranked_keywords {name:>9}: {len(call_ids):,} calls, {elapsed * 1000:7.2f} ms/query "
+                  f"-> {[kw.keyword for kw in result]}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 30000, 50000], help="가족당 키워드 수")
+    parser.add_argument("--threshold", type=float, default=0.55, help="시간 측정용 중복 제거 기준값")
+    parser.add_argument("--python-max", type=int, default=30000,
+                        help="이 크기까지만 limit=all 순수 Python 비교를 실행 (느림)")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    check_threshold(settings.KEYWORD_DEDUP_THRESHOLD)
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    for size in args.sizes:
+        bench_kernel(size, args.threshold, args.python_max, args.seed)
+        await bench_ranking(size, args.threshold, args.repeat, args.seed)
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
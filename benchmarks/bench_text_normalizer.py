@@ -0,0 +1,85 @@
+"""
+STT 텍스트 정규화(normalize_stt_text) 마이크로 벤치마크
+
+실제 통화/편지 STT와 비슷한 문장(추임새, 반복 어절, 불규칙한 공백 포함)으로
+길이별 처리 시간과 글자/추정 토큰 절감률을 측정한다.
+
+실행: python -m benchmarks.bench_text_normalizer [--sizes 500 5000 50000] [--repeat 200]
+"""
+import argparse
+import random
+import time
+
+from benchmarks.common import configure_offline_env
+
+configure_offline_env()
+
+from app.utils.text_normalizer import estimate_tokens, normalize_stt_text  # noqa: E402
+
+STT_SENTENCES = [
+    "어... 오늘 아침에 음 시장에 다녀왔는데   사람이 정말 정말 많더라.",
+    "할머니가 그 그 다음 주에 된장국 끓여준다고 하셨어",
+    "음 손주가 이번에 방학을 해서 어어 같이 놀러 가기로 했어요 .",
+    "아... 요즘 무릎이 좀 아파서  병원에 다녀왔어",
+    "저기... 갤럭시 새로 나온 거 가격이 생각보다 저렴하더라고",
+    "그래서 뭐... 동생이랑 싸웠는데 아직 화해를 못 했어",
+    "흠 주말에 교회에서 바자회를 한다고 해서\n\n\n도와주기로 했어",
+    "날씨가 추워져서 김장을 언제 할지 이야기했어요",
+    "손주야 사랑해 사랑해 다음 다음 다음 주에 보자",
+]
+
+# 정규화 결과 확인 (감탄사 추임새와 말더듬 반복만 정리하고, 지시어/의문사와 일부러 반복한 강조는 유지)
+EXPECTED = [
+    ("할머니가 그 그 다음 주에 된장국 끓여준다고 하셨어", "할머니가 그 다음 주에 된장국 끓여준다고 하셨어"),
+    ("제가 제가 제가 전화할게요", "제가 전화할게요"),
+    ("다음 다음 다음 주에 보자", "다음 다음 다음 주에 보자"),
+    ("아주 아주 아주 맛있었어", "아주 아주 아주 맛있었어"),
+    ("손주야 사랑해 사랑해", "손주야 사랑해 사랑해"),
+    ("사람이 정말 정말 많더라.", "사람이 정말 정말 많더라."),
+    ("그게 그 그림이야", "그게 그 그림이야"),
+    ("어... 오늘 음 시장에 갔어", "오늘 시장에 갔어"),
+    # 말줄임/물결이 붙어도 지시어/의문사는 유지
+    ("뭐~ 먹을래", "뭐~ 먹을래"),
+    ("그... 사람이 또 왔어", "그... 사람이 또 왔어"),
+    ("막... 뛰어갔어", "막... 뛰어갔어"),
+    ("저기... 가방 좀 줄래", "저기... 가방 좀 줄래"),
+]
+
+
+def make_transcript(size: int, rng: random.Random) -> str:
+    parts = []
+    total = 0
+    while total < size:
+        sentence = rng.choice(STT_SENTENCES)
+        parts.append(sentence)
+        total += len(sentence) + 1
+    return " ".join(parts)[:size]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 2000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    for text, expected in EXPECTED:
+        if normalize_stt_text(text) != expected:
+            raise AssertionError(f"{text!r} -> {normalize_stt_text(text)!r}, expected {expected!r}")
+
+    rng = random.Random(args.seed)
+    print(f"{'chars':>7} {'us/call':>10} {'MB/s':>7} {'chars saved':>12} {'tokens saved':>13}")
+    for size in args.sizes:
+        text = make_transcript(size, rng)
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            normalized = normalize_stt_text(text)
+        elapsed = (time.perf_counter() - started) / args.repeat
+
+        before_tokens, after_tokens = estimate_tokens(text), estimate_tokens(normalized)
+        print(f"{len(text):>7} {elapsed * 1e6:>10.1f} {len(text.encode('utf-8')) / elapsed / 1e6:>7.1f} "
+              f"{100 * (1 - len(normalized) / len(text)):>11.1f}% {100 * (1 - after_tokens / before_tokens):>12.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Gemini 호출 허용량 제어(AdmissionController) 확인 - 가짜 시계
+
+실제 시간을 기다리지 않도록 clock / sleep에 가짜 시계를 주입한다.
+가짜 시계는 모든 작업이 sleep에서 멈추면 가장 먼저 깨어날 시각으로 시간을 옮긴다.
+1) 레인 순서: 버킷이 빈 상태에서 배치 요청이 먼저 기다려도 나중에 온 대화형 요청이 먼저 통과한다.
+2) 대화형 몫: 배치 요청은 버킷의 interactive_reserve 비율을 남기고 멈추고, 남은 몫은 대화형 요청이 쓴다.
+3) 거절: 예상 대기 시간이 남은 시간을 넘으면 기다리지 않고 바로 거절(deadline), 대기열이 가득 차면 queue_full.
+4) 워커별 한도: 전체 한도가 워커 수보다 작아도 제한이 꺼지지 않는다.
+
+실행: python -m benchmarks.check_admission
+"""
+import asyncio
+import heapq
+import itertools
+
+from benchmarks.common import configure_offline_env
+
+configure_offline_env()
+
+from app.core.admission import BATCH, INTERACTIVE, AdmissionController, AdmissionRejected  # noqa: E402
+from app.core.llm_client import per_worker_limit  # noqa: E402
+
+# lane_for로 레인이 정해지는 endpoint 이름
+ENDPOINTS = {INTERACTIVE: "letter", BATCH: "keyword"}
+
+
+class FakeClock:
+    """sleep을 호출한 작업을 깨어날 시각 순서로 보관하고, 모두 멈추면 시간을 그 시각으로 옮긴다."""
+
+    def __init__(self):
+        self.now = 0.0
+        self._sleepers = []
+        self._order = itertools.count()
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float):
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._sleepers, (self.now + seconds, next(self._order), future))
+        await future
+
+    async def run(self, *coros):
+        tasks = [asyncio.create_task(coro) for coro in coros]
+        while True:
+            for _ in range(20):
+                await asyncio.sleep(0)  # 깨운 작업이 다음 sleep / 종료까지 진행하도록
+            if all(task.done() for task in tasks):
+                break
+            if not self._sleepers:
+                raise AssertionError("작업이 가짜 시계 밖에서 멈춤")
+            wake_at, _, future = heapq.heappop(self._sleepers)
+            self.now = max(self.now, wake_at)
+            future.set_result(None)
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def controller(clock: FakeClock, rpm: float, burst_seconds: float = 1.0, reserve: float = 0.0,
+               max_queue: int = 100) -> AdmissionController:
+    return AdmissionController(rpm=rpm, tpm=0, burst_seconds=burst_seconds, interactive_reserve=reserve,
+                               max_queue=max_queue, clock=clock, sleep=clock.sleep)
+
+
+async def check_lane_order():
+    clock = FakeClock()
+    admission = controller(clock, rpm=60)  # 초당 1회, 버킷 크기 1
+    admission.throttle()
+    order = []
+
+    async def call(lane: str, delay: float):
+        await clock.sleep(delay)
+        await admission.acquire(ENDPOINTS[lane], tokens=1, timeout=10)
+        order.append((lane, clock.now))
+
+    await clock.run(call(BATCH, 0), call(BATCH, 0.1), call(INTERACTIVE, 0.2))
+    if [lane for lane, _ in order] != [INTERACTIVE, BATCH, BATCH] or [at for _, at in order] != [1.0, 2.0, 3.0]:
+        raise AssertionError(f"lane order: {order}")
+    print(f"lane order: {', '.join(f'{lane}@{at:.0f}s' for lane, at in order)}")
+
+
+async def admit_until_rejected(admission: AdmissionController, lane: str) -> int:
+    admitted = 0
+    while True:
+        try:
+            await admission.acquire(ENDPOINTS[lane], tokens=1, timeout=0)
+        except AdmissionRejected:
+            return admitted
+        admitted += 1
+
+
+async def check_reserve():
+    clock = FakeClock()
+    admission = controller(clock, rpm=600, burst_seconds=10, reserve=0.2)  # 버킷 크기 100, 대화형 몫 20
+    batch = await admit_until_rejected(admission, BATCH)
+    interactive = await admit_until_rejected(admission, INTERACTIVE)
+    if (batch, interactive) != (80, 20):
+        raise AssertionError(f"reserve: batch={batch} interactive={interactive}")
+    print(f"reserve: batch {batch}, then interactive {interactive} (bucket 100, reserve 0.2)")
+
+
+async def check_shedding():
+    clock = FakeClock()
+    admission = controller(clock, rpm=60, burst_seconds=2, max_queue=1)  # 초당 1회, 버킷 크기 2
+    admission.throttle()
+
+    async def call(lane: str, timeout: float, delay: float = 0):
+        await clock.sleep(delay)
+        try:
+            await admission.acquire(ENDPOINTS[lane], tokens=1, timeout=timeout)
+            return ("admitted", clock.now)
+        except AdmissionRejected as e:
+            return (e.reason, clock.now, e.retry_after)
+
+    # 통과까지 1초 남았는데 남은 시간이 0.5초 -> 기다리지 않고 바로 거절
+    results = await clock.run(call(BATCH, timeout=0.5))
+    if results != [("deadline", 0.0, 1)]:
+        raise AssertionError(f"deadline: {results}")
+
+    # 대화형 요청이 대기 중: 같은 레인의 두 번째 요청은 대기열이 가득 차 거절,
+    # 뒤에 온 배치 요청은 대화형 요청 다음(2초 뒤)이라 남은 시간 1.5초 안에 통과할 수 없어 바로 거절
+    results = await clock.run(call(INTERACTIVE, 10), call(INTERACTIVE, 10, delay=0.1), call(BATCH, 1.5, delay=0.2))
+    expected = [("admitted", 1.0), ("queue_full", 0.1, 2), ("deadline", 0.2, 2)]
+    if results != expected:
+        raise AssertionError(f"shedding: {results} != {expected}")
+    print(f"shedding: {results}")
+
+
+def check_per_worker_limit():
+    share = per_worker_limit(2, 4)
+    clock = FakeClock()
+    if share != 0.5 or not controller(clock, rpm=share).enabled or per_worker_limit(0, 4) != 0:
+        raise AssertionError(f"per worker limit: {share}")
+    print(f"per worker limit: 2 rpm / 4 workers -> {share} rpm")
+
+
+async def main():
+    await check_lane_order()
+    await check_reserve()
+    await check_shedding()
+    check_per_worker_limit()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,176 @@
+"""
+읽기 복제본 라우팅 확인 (로컬 SQLite 파일 두 개: 주 DB / 복제본)
+
+복제는 sqlite3 backup으로 주 DB 파일을 복제본 파일에 복사하는 것으로 흉내 낸다.
+1) 라우팅 검증
+   - 방금 저장한 통화            -> 주 DB (recent_write)
+   - sticky 시간이 지났지만 아직 복제 전 -> 복제본에 없는 통화가 있어 주 DB에서 조회 (replica_missing)
+     (다른 워커에서 저장한 경우와 같음. 복제된 통화와 함께 조회해도 일부만 복제된 결과를 쓰지 않음)
+   - 복제 후                       -> 복제본 (replica)
+   - 복제본 조회 오류              -> 주 DB (replica_error), 이후 retry 시간 동안 주 DB만 (replica_down)
+   - 엔진별 커넥션 풀 지표(gamo_db_pool_connections)에 async / read가 모두 나오는지
+2) 쓰기 부하 중 읽기 지연 비교: 키워드 저장을 계속하는 동안 get_ranked_keywords p50/p99 (주 DB만 vs 복제본)
+   한 프로세스(이벤트 루프 하나)에서 SQLite로 측정하므로 참고용이며, 실제 효과는 MySQL 복제본에서 확인한다.
+
+실행: python -m benchmarks.check_read_replica [--calls 2000] [--writers 4] [--readers 8] [--seconds 5]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from benchmarks.common import configure_offline_env
+
+STICKY_SECONDS = 0.5
+RETRY_SECONDS = 0.5
+
+workdir = tempfile.mkdtemp(prefix="gamo_replica_")
+PRIMARY_PATH = configure_offline_env(os.path.join(workdir, "primary.db"))
+REPLICA_PATH = os.path.join(workdir, "replica.db")
+os.environ.update({
+    "READ_DB_URL": f"sqlite+aiosqlite:///{REPLICA_PATH}",
+    "READ_DB_STICKY_SECONDS": str(STICKY_SECONDS),
+    "READ_DB_RETRY_SECONDS": str(RETRY_SECONDS),
+    "METRICS_ENABLED": "true",
+})
+
+from sqlalchemy import text  # noqa: E402
+
+from app.core.metrics import db_read_routes, registry  # noqa: E402
+from app.database import (AsyncSessionLocal, ReadSession, async_engine, create_schema,  # noqa: E402
+                          read_async_engine, replica_router)
+from app.database.crud import get_ranked_keywords, store_keywords  # noqa: E402
+from app.database.database import ReplicaRouter  # noqa: E402
+from app.routers import metrics_api  # noqa: E402,F401  (엔진별 커넥션 풀 지표 등록)
+from benchmarks.bench_endpoints import percentile  # noqa: E402
+from benchmarks.seed_keywords import seed_keywords  # noqa: E402
+
+
+def replicate():
+    """주 DB 파일 내용을 복제본 파일로 복사 (복제 완료 시점 흉내)"""
+    source, target = sqlite3.connect(PRIMARY_PATH), sqlite3.connect(REPLICA_PATH)
+    with target:
+        source.backup(target)
+    source.close()
+    target.close()
+
+
+def route_count(target: str, reason: str) -> float:
+    return db_read_routes._values.get((target, reason), 0)
+
+
+async def expect_route(call_ids, target: str, reason: str):
+    before = route_count(target, reason)
+    read_db = ReadSession(replica_router)
+    try:
+        keywords = await read_db.run(get_ranked_keywords, call_ids, limit=3)
+    finally:
+        await read_db.close()
+    if route_count(target, reason) != before + 1 or not keywords:
+        raise AssertionError(f"{call_ids}: expected {target}/{reason}, got {dict(db_read_routes._values)} {keywords}")
+    print(f"  {str(call_ids):>12} -> {target:<7} ({reason})")
+
+
+async def check_routing(call_count: int):
+    new_call = call_count + 1
+    async with AsyncSessionLocal() as db:
+        await store_keywords(db, [
+            {"keyword": "손주가 방학에 놀러 오기로 함", "weight": 5, "videocallId": new_call},
+            {"keyword": "할머니가 김장 날짜를 정함", "weight": 3, "videocallId": new_call},
+        ])
+
+    print("routing:")
+    await expect_route([new_call], "primary", "recent_write")
+    await asyncio.sleep(STICKY_SECONDS + 0.1)
+    await expect_route([new_call], "primary", "replica_missing")
+    await expect_route([0, 1, new_call], "primary", "replica_missing")
+    replicate()
+    await expect_route([new_call], "replica", "replica")
+    await expect_route([0, 1, 2], "replica", "replica")
+
+    # 복제본 장애 흉내: 복제본에서 조회 테이블을 지움
+    async with read_async_engine.begin() as conn:
+        await conn.execute(text("DROP TABLE keywords"))
+    await expect_route([0, 1, 2], "primary", "replica_error")
+    await expect_route([0, 1, 2], "primary", "replica_down")
+    replicate()
+    await asyncio.sleep(RETRY_SECONDS + 0.1)
+    await expect_route([0, 1, 2], "replica", "replica")
+
+    for metric in ("gamo_db_pool_connections", "gamo_db_pool_checkout_wait_seconds_count"):
+        pools = [line for line in registry.render().splitlines() if line.startswith(metric)]
+        engines = {line.split('engine="')[1].split('"')[0] for line in pools}
+        if not {"async", "read"} <= engines:
+            raise AssertionError(f"{metric} missing engines: {pools}")
+    print(f"pool metrics: {', '.join(sorted(engines))}")
+
+
+async def read_under_write_load(router: ReplicaRouter, call_count: int, writers: int, readers: int,
+                                seconds: float, seed: int) -> dict:
+    rng = random.Random(seed)
+    stop_at = time.perf_counter() + seconds
+    latencies = []
+    writes = [0]
+    next_call = [call_count + 100]
+
+    async def writer():
+        async with AsyncSessionLocal() as db:
+            while time.perf_counter() < stop_at:
+                next_call[0] += 1
+                await store_keywords(db, [
+                    {"keyword": f"새 키워드 {next_call[0]} {i}", "weight": rng.randint(1, 5), "videocallId": next_call[0]}
+                    for i in range(4)
+                ])
+                writes[0] += 1
+
+    async def reader():
+        while time.perf_counter() < stop_at:
+            call_ids = rng.sample(range(call_count), 10)
+            started = time.perf_counter()
+            read_db = ReadSession(router)
+            try:
+                await read_db.run(get_ranked_keywords, call_ids, limit=3)
+            finally:
+                await read_db.close()
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(writer() for _ in range(writers)), *(reader() for _ in range(readers)))
+    latencies.sort()
+    return {
+        "reads": len(latencies),
+        "writes": writes[0],
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=2000, help="시드할 통화 수 (통화당 키워드 2~5개)")
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    await create_schema()
+    call_count = await seed_keywords(args.calls * 3, args.seed)
+    replicate()
+    await check_routing(call_count)
+
+    print(f"reads during write load ({args.writers} writers / {args.readers} readers, {args.seconds:.0f}s):")
+    primary_only = ReplicaRouter(None, AsyncSessionLocal, STICKY_SECONDS, RETRY_SECONDS)
+    for name, router in (("primary only", primary_only), ("replica", replica_router)):
+        result = await read_under_write_load(router, call_count, args.writers, args.readers, args.seconds, args.seed)
+        print(f"  {name:>12}: {result['reads']:>6} reads, {result['writes']:>5} writes, "
+              f"p50 {result['p50_ms']:7.1f} ms, p99 {result['p99_ms']:7.1f} ms")
+
+    await async_engine.dispose()
+    await read_async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,47 @@
+"""벤치마크 공통 설정: MySQL / Gemini 없이 로컬 SQLite로 앱 모듈을 불러오기 위한 환경 변수"""
+import os
+import random
+import tempfile
+
+
+def configure_offline_env(db_path: str = None) -> str:
+    """
+    앱 모듈을 import 하기 전에 호출한다.
+    DB_URL을 임시 SQLite 파일로 지정하고, 필수 설정값이 없으면 더미 값을 채운다.
+    """
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(prefix="gamo_bench_"), "bench.db")
+    os.environ["DB_URL"] = f"sqlite+aiosqlite:///{db_path}"
+    for key, value in {
+        "GEMINI_API_KEY": "offline",
+        "DB_USER": "bench",
+        "DB_PASSWORD": "bench",
+        "DB_HOST": "localhost",
+        "DB_PORT": "3306",
+        "DB_NAME": "bench",
+    }.items():
+        os.environ.setdefault(key, value)
+    return db_path
+
+
+# 통화 내용(STT 결과) 예시 문장
+SENTENCES = [
+    "어 오늘 아침에 시장에 다녀왔는데 사람이 정말 많더라.",
+    "할머니가 다음 주에 된장국 끓여준다고 하셨어.",
+    "손주가 이번에 방학을 해서 같이 놀러 가기로 했어요.",
+    "음 요즘 무릎이 좀 아파서 병원에 다녀왔어.",
+    "갤럭시 새로 나온 거 가격이 생각보다 저렴하더라고.",
+    "동생이랑 싸웠는데 아직 화해를 못 했어.",
+    "주말에 교회에서 바자회를 한다고 해서 도와주기로 했어.",
+    "날씨가 추워져서 김장을 언제 할지 이야기했어요.",
+]
+
+
+def make_transcript(length: int, rng: random.Random) -> str:
+    parts = []
+    total = 0
+    while total < length:
+        sentence = rng.choice(SENTENCES)
+        parts.append(sentence)
+        total += len(sentence) + 1
+    return " ".join(parts)
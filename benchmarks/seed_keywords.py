@@ -0,0 +1,126 @@
+"""
+keywords 테이블 시드 데이터 생성 (10k ~ 10M 행)
+
+같은 --seed면 항상 같은 데이터를 만든다. (keywordId도 순번으로 결정되며, 앱이 만드는 ID와 겹치지 않음)
+통화마다 키워드 2~5개, 가중치 1~5, 날짜는 --days 범위에 고르게 분포한다.
+앱과 같이 KEYWORD_DEDUP_THRESHOLD가 0보다 크면 문장 벡터(keyword_vectors)도 함께 만들어
+/ajenda 순위 경로를 바로 측정할 수 있게 한다.
+
+실행: python -m benchmarks.seed_keywords --db /tmp/gamo_bench.db --rows 1000000 [--seed 42]
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.common import configure_offline_env
+
+BASE_DATE = datetime(2025, 1, 1)
+ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+SUBJECTS = ["할머니가", "손주가", "동생이", "아버지가", "어머니가", "친구가", "이웃이", "삼촌이"]
+EVENTS = [
+    "시장에 다녀왔다고 이야기함", "된장국을 끓여준다고 약속함", "방학에 놀러 가기로 함",
+    "무릎이 아파 병원에 다녀옴", "새 휴대폰 가격이 저렴하다고 함", "싸운 뒤 아직 화해하지 못함",
+    "교회 바자회를 돕기로 함", "김장 날짜를 정하기로 함", "축구 경기를 보러 간다고 함",
+    "생일 선물을 고민하고 있음", "날씨가 추워 감기에 걸림", "여행 사진을 보내주기로 함",
+]
+
+
+def seed_keyword_id(index: int) -> str:
+    """
+    시드 데이터용 keywordId (11자리)
+    앞 6자리를 0으로 두어 앱의 시간 기반 ID(2025-01-01 이후 경과 초)와 겹치지 않게 하고, 뒤 5자리에 순번을 담는다.
+    """
+    digits = []
+    for _ in range(5):
+        index, remainder = divmod(index, 36)
+        digits.append(ALPHABET[remainder])
+    if index:
+        raise ValueError("시드 keywordId 범위(36^5)를 넘었습니다.")
+    return "000000" + "".join(reversed(digits))
+
+
+def generate_rows(rows: int, seed: int, days: int):
+    """(videocallId, 행 dict) 순서로 rows개의 키워드 행을 만든다. 통화 ID는 0부터 차례로 증가."""
+    rng = random.Random(seed)
+    index = 0
+    call_id = 0
+    while index < rows:
+        call_date = BASE_DATE + timedelta(days=rng.randint(0, days), seconds=rng.randint(0, 86399))
+        for _ in range(min(rng.randint(2, 5), rows - index)):
+            yield {
+                "keywordId": seed_keyword_id(index),
+                "keyword": f"{rng.choice(SUBJECTS)} {rng.choice(EVENTS)}",
+                "videocallId": call_id,
+                "weight": rng.randint(1, 5),
+                "date": call_date,
+            }
+            index += 1
+        call_id += 1
+
+
+async def seed_keywords(rows: int, seed: int = 42, days: int = 365, batch_size: int = 10000) -> int:
+    """keywords 테이블을 비우고 시드 데이터를 넣는다. 만든 통화 수를 반환."""
+    from sqlalchemy import delete, insert, text
+
+    from app.core.config import settings
+    from app.database import Base, async_engine
+    from app.database.models import Keyword, KeywordVector
+    from app.utils.ngram_vectors import encode_vector, ngram_vector
+
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(delete(Keyword))
+        await conn.execute(delete(KeywordVector))
+
+    sqlite = async_engine.url.get_backend_name() == "sqlite"
+    started = time.perf_counter()
+    batch = []
+    last_call_id = -1
+
+    async def flush():
+        async with async_engine.begin() as conn:
+            if sqlite:
+                # 시드 데이터는 다시 만들 수 있으므로 디스크 동기화를 생략하여 적재 속도를 높인다.
+                await conn.execute(text("PRAGMA synchronous=OFF"))
+            await conn.execute(insert(Keyword), batch)
+            if settings.KEYWORD_DEDUP_THRESHOLD > 0:
+                await conn.execute(insert(KeywordVector), [
+                    {"keywordId": row["keywordId"], "videocallId": row["videocallId"],
+                     "vector": encode_vector(ngram_vector(row["keyword"]))}
+                    for row in batch
+                ])
+
+    for row in generate_rows(rows, seed, days):
+        batch.append(row)
+        last_call_id = row["videocallId"]
+        if len(batch) >= batch_size:
+            await flush()
+            batch = []
+    if batch:
+        await flush()
+    elapsed = time.perf_counter() - started
+    print(f"keywords: {rows:,} rows / {last_call_id + 1:,} calls in {elapsed:.1f}s ({rows / max(elapsed, 1e-9):,.0f} rows/s)")
+    return last_call_id + 1
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", required=True, help="SQLite 파일 경로 (없으면 새로 만듦)")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--days", type=int, default=365, help="키워드 날짜 분포 범위(일)")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    configure_offline_env(args.db)
+    from app.database import async_engine
+
+    await seed_keywords(args.rows, args.seed, args.days, args.batch_size)
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+"""
+keywords 보관 정책 적용 (오래된 / 통화별 보관 개수를 넘는 키워드를 keywords_archive로 옮김)
+
+통화 ID 순서로 --batch-calls개씩 나누어 배치마다 커밋하므로 서비스 중에도 실행할 수 있다.
+중단되면(Ctrl+C, 배포 등) 다시 실행할 때 maintenance_checkpoints에 기록된 위치부터 이어서 처리한다.
+같은 실행에서 만료된 Gemini 응답 캐시(llm_cache) 행도 지운다. (--skip-cache-purge로 건너뜀)
+끝난 지 KEYWORD_JOB_RETENTION_HOURS가 지난 비동기 키워드 작업(keyword_jobs, 통화 내용 포함)도 지운다. (--skip-job-purge로 건너뜀)
+실행 전후로 테이블 / 인덱스 크기를 출력한다. (MySQL은 OPTIMIZE TABLE 전까지 파일 크기가 줄지 않으므로 --reclaim 참고)
+한 번에 하나만 실행한다.
+--per-call로 통화별 키워드 수를 줄이면 /ajenda의 상위 절반 기준이 달라져 순위 결과가 바뀔 수 있다. (기본값 0: 사용 안 함)
+
+실행: python -m scripts.archive_keywords [--days 730] [--per-call N] [--batch-calls 500] [--pause 0.1]
+                                         [--max-batches N] [--dry-run] [--reclaim] [--skip-cache-purge]
+                                         [--job-retention-hours 24] [--skip-job-purge]
+"""
+import argparse
+import asyncio
+
+from app.core.config import settings
+from app.core.llm_cache import llm_cache
+from app.database import AsyncSessionLocal, async_engine
+from app.database.models import KeywordArchive, MaintenanceCheckpoint
+from app.services.keyword_jobs import keyword_job_queue
+from app.services.keyword_retention import RetentionPolicy, archive_keywords, reclaim_space, table_size_report
+
+
+def print_report(title: str, report):
+    print(title)
+    print(f"  {'table':<20} {'rows':>12} {'data(MB)':>10} {'index(MB)':>10}")
+    for row in report:
+        data = f"{row['data_bytes'] / 1024 ** 2:10.2f}" if row["data_bytes"] is not None else f"{'-':>10}"
+        index = f"{row['index_bytes'] / 1024 ** 2:10.2f}" if row["index_bytes"] is not None else f"{'-':>10}"
+        print(f"  {row['table']:<20} {row['rows']:>12,} {data} {index}")
+
+
+async def main(args):
+    async with async_engine.begin() as conn:
+        for table in (KeywordArchive.__table__, MaintenanceCheckpoint.__table__):
+            await conn.run_sync(table.create, checkfirst=True)
+
+    policy = RetentionPolicy(args.days, args.per_call)
+    if policy.per_call_cap:
+        # /ajenda는 조회한 통화들의 전체 키워드 수로 상위 절반을 자르므로, 하위 키워드를 옮겨도 선택 범위가 달라진다.
+        print(f"주의: --per-call({policy.per_call_cap})로 키워드를 옮기면 상위 절반 기준이 달라져 "
+              "/ajenda 순위 결과가 바뀔 수 있습니다.")
+
+    async with AsyncSessionLocal() as db:
+        print_report("변경 전:", await table_size_report(db))
+        stats = await archive_keywords(
+            db, policy,
+            batch_calls=args.batch_calls,
+            pause_seconds=args.pause,
+            max_batches=args.max_batches,
+            dry_run=args.dry_run,
+        )
+    label = "옮길 대상 (dry-run)" if args.dry_run else "옮김"
+    state = "완료" if stats["finished"] else "일부 처리 (다시 실행하면 이어서 처리)"
+    print(f"{label}: 통화 {stats['calls']:,}개 확인, 키워드 {stats['archived']:,}개 "
+          f"(기간 초과 {stats['age']:,} / 개수 초과 {stats['cap']:,}), 배치 {stats['batches']}개 - {state}")
+
+    if not args.skip_cache_purge:
+        purged = await llm_cache.purge_expired(pause_seconds=args.pause, dry_run=args.dry_run)
+        print(f"만료된 LLM 캐시 {'(dry-run)' if args.dry_run else '삭제'}: {purged:,}개")
+
+    if not args.skip_job_purge:
+        purged = await keyword_job_queue.purge_finished(
+            args.job_retention_hours, pause_seconds=args.pause, dry_run=args.dry_run,
+        )
+        print(f"끝난 키워드 작업 {'(dry-run)' if args.dry_run else '삭제'}: {purged:,}개")
+
+    if args.reclaim and not args.dry_run:
+        await reclaim_space(async_engine)
+    async with AsyncSessionLocal() as db:
+        print_report("변경 후:", await table_size_report(db))
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=settings.KEYWORD_RETENTION_DAYS, help="보관 기간(일), 0이면 제한 없음")
+    parser.add_argument("--per-call", type=int, default=settings.KEYWORD_RETENTION_PER_CALL,
+                        help="통화별로 남길 키워드 수, 0이면 제한 없음")
+    parser.add_argument("--batch-calls", type=int, default=settings.KEYWORD_ARCHIVE_BATCH_CALLS, help="한 트랜잭션에서 처리할 통화 수")
+    parser.add_argument("--pause", type=float, default=0.0, help="배치 사이 대기 시간(초)")
+    parser.add_argument("--max-batches", type=int, default=None, help="이번 실행에서 처리할 최대 배치 수")
+    parser.add_argument("--dry-run", action="store_true", help="옮길 행만 세고 아무것도 바꾸지 않음")
+    parser.add_argument("--skip-cache-purge", action="store_true", help="만료된 LLM 캐시(llm_cache) 삭제를 건너뜀")
+    parser.add_argument("--job-retention-hours", type=int, default=settings.KEYWORD_JOB_RETENTION_HOURS,
+                        help="끝난 키워드 작업을 남겨둘 시간")
+    parser.add_argument("--skip-job-purge", action="store_true", help="끝난 키워드 작업(keyword_jobs) 삭제를 건너뜀")
+    parser.add_argument("--reclaim", action="store_true", help="옮긴 뒤 빈 공간 반환 (MySQL: OPTIMIZE TABLE, SQLite: VACUUM)")
+    asyncio.run(main(parser.parse_args()))
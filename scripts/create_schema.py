@@ -0,0 +1,24 @@
+"""
+DB 테이블 생성
+
+앱은 시작할 때 테이블을 만들지 않는다. (워커마다 DDL을 실행하지 않도록)
+배포 시 서버를 띄우기 전에 한 번 실행한다. 이미 있는 테이블은 건너뛰고, 기존 테이블에 빠진 인덱스만 만든다.
+(큰 테이블에 인덱스를 새로 만드는 경우 시간이 걸릴 수 있다.)
+
+실행: python -m scripts.create_schema
+"""
+import asyncio
+
+from app.database import async_engine, create_schema
+
+
+async def main():
+    created = await create_schema()
+    await async_engine.dispose()
+    print("테이블 생성 완료")
+    for name in created:
+        print(f"인덱스 생성: {name}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,39 @@
+"""
+keyword_vectors 테이블 백필
+
+keywords 테이블을 keywordId 순서로 나누어 읽고, 문장 벡터가 없는 키워드의 벡터를 만든다.
+배치마다 커밋하므로 중간에 중단되어도 다시 실행하면 된다.
+KEYWORD_DEDUP_THRESHOLD가 0(기본값)인 동안은 키워드 저장 시 벡터를 만들지 않으므로, 중복 제거를 켜기 전에 실행한다.
+(실행하지 않아도 /ajenda가 없는 벡터를 문장으로 계산하지만, 조회가 느려진다)
+--rebuild: 벡터 차원(VECTOR_DIM) 등 벡터 계산 방식을 바꾼 뒤 기존 벡터를 모두 지우고 다시 만든다.
+
+실행: python -m scripts.rebuild_keyword_vectors [--batch-size 1000] [--rebuild]
+"""
+import argparse
+import asyncio
+
+from sqlalchemy import delete
+
+from app.database import AsyncSessionLocal, async_engine
+from app.database.crud import backfill_keyword_vectors
+from app.database.models import KeywordVector
+
+
+async def main(batch_size: int, rebuild: bool):
+    async with async_engine.begin() as conn:
+        await conn.run_sync(KeywordVector.__table__.create, checkfirst=True)
+        if rebuild:
+            await conn.execute(delete(KeywordVector))
+
+    async with AsyncSessionLocal() as db:
+        created = await backfill_keyword_vectors(db, batch_size=batch_size)
+    await async_engine.dispose()
+    print(f"키워드 벡터 생성 완료: {created}개")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=1000, help="한 번에 처리할 키워드 수")
+    parser.add_argument("--rebuild", action="store_true", help="기존 벡터를 지우고 전부 다시 만듦")
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size, args.rebuild))